@@ -0,0 +1,101 @@
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sroloc.color.ansi import BasicColor
+from sroloc.printing.asciicast import (
+    AsciicastRecorder, final_screen, play
+)
+from sroloc.printing.color_segment import ColorSegment
+
+WRITE_COUNT = 200_000
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 0.001
+        return self.now
+
+
+class _NullStream(io.TextIOBase):
+    def __init__(self) -> None:
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        self.size += len(text)
+        return len(text)
+
+
+def _measure(name: str, function, count: int) -> None:  # type: ignore
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    print(f'  {name:<32} {elapsed:8.3f} s  {count / elapsed / 1e6:6.2f} M/s')
+
+
+def _peak_memory(name: str, function) -> None:  # type: ignore
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f'  {name:<32} {peak / 2 ** 20:8.2f} MiB peak')
+
+
+def _record(path: str, window: float) -> None:
+    levels = ['info', 'warning', 'error']
+    colors = ['green', 'yellow', 'red']
+
+    with open(path, 'w') as file, \
+            AsciicastRecorder(file, window=window, clock=_Clock()) as recorder:
+        # One write per segment, like ColorSegments printed one by one
+        for i in range(WRITE_COUNT):
+            level = i % 3
+            recorder.write(format(ColorSegment(levels[level]), colors[level]))
+            recorder.write(format(ColorSegment(' request '), colors[level]))
+            recorder.write(f'{i}\n')
+
+
+def main() -> None:
+    ColorSegment.set_color_scheme(BasicColor)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'session.cast')
+
+        print(f'{WRITE_COUNT * 3:,} writes, 1 ms apart')
+        for window in (0.0, 0.01, 0.1):
+            _measure(f'record, {window * 1000:g} ms window',
+                     lambda: _record(path, window), WRITE_COUNT * 3)
+            size = os.path.getsize(path)
+            print(f'  {"":<32} {size / 2 ** 20:8.2f} MiB recorded')
+
+        outputs = {}
+
+        def replay(collapse: bool) -> None:
+            output = outputs[collapse] = _NullStream()
+
+            with open(path) as file:
+                play(file, output, speed=float('inf'), collapse=collapse)
+
+        def final() -> None:
+            with open(path) as file:
+                final_screen(file)
+
+        print('Playback of the 100 ms window recording')
+        _measure('play', lambda: replay(False), WRITE_COUNT)
+        _measure('play, collapsing SGR', lambda: replay(True), WRITE_COUNT)
+        print(f'  {"written, raw / collapsed":<32} '
+              f'{outputs[False].size / 2 ** 20:8.2f} MiB  '
+              f'{outputs[True].size / 2 ** 20:6.2f} MiB')
+        _measure('final screen only', final, WRITE_COUNT)
+        _peak_memory('final screen only', final)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import random
+import time
+import tracemalloc
+
+from sroloc.color.true import TrueColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.diff import DiffRenderer, unified_diff_streams
+
+LINE_COUNT = 1_000_000
+
+
+def _measure(name: str, function, count: int) -> None:  # type: ignore
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    print(f'  {name:<32} {elapsed:8.3f} s  {count / elapsed / 1e6:6.2f} M/s')
+
+
+def _peak_memory(name: str, function) -> None:  # type: ignore
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f'  {name:<32} {peak / 2 ** 20:8.2f} MiB peak')
+
+
+def _lines(seed: int, changes: bool,  # type: ignore
+           count: int = LINE_COUNT):
+    # Generated on the fly, so the input itself takes no memory
+    rng = random.Random(seed)
+
+    for i in range(count):
+        value = i * 7 % 1000
+        if changes and rng.random() < 0.01:
+            value += 1
+
+        yield f'setting_{i} = {value}  # comment {i % 97}\n'
+
+
+def _consume(iterator) -> None:  # type: ignore
+    for _ in iterator:
+        pass
+
+
+def _patch() -> str:
+    return ''.join(unified_diff_streams(
+        _lines(0, False), _lines(0, True), 'old.conf', 'new.conf'
+    ))
+
+
+def main() -> None:
+    ColorSegment.set_color_scheme(TrueColor)
+    print(f'{LINE_COUNT:,} lines, 1% of them changed')
+
+    _measure('unified_diff_streams',
+             lambda: _consume(unified_diff_streams(
+                 _lines(0, False), _lines(0, True)
+             )), LINE_COUNT)
+    _measure('render_files',
+             lambda: _consume(DiffRenderer().render_files(
+                 _lines(0, False), _lines(0, True)
+             )), LINE_COUNT)
+
+    patch = _patch()
+    patch_lines = patch.count('\n')
+    chunks = [patch[i:i + 65536] for i in range(0, len(patch), 65536)]
+
+    def render_patch() -> None:
+        renderer = DiffRenderer()
+        for chunk in chunks:
+            renderer.feed(chunk)
+        renderer.close()
+
+    _measure(f'render patch ({patch_lines:,} lines)', render_patch,
+             patch_lines)
+
+    # Memory stays the same no matter how long the files are
+    for count in (LINE_COUNT // 100, LINE_COUNT // 10):
+        _peak_memory(f'render_files ({count:,} lines)',
+                     lambda: _consume(DiffRenderer().render_files(
+                         _lines(0, False, count), _lines(0, True, count)
+                     )))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import time
+
+from sroloc.color.ansi import BasicColor, ExtendedColor, nearest_ansi_color
+from sroloc.printing.dither import dither, dither_palette
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+GRIDS = ((200, 60), (1000, 300))
+
+
+def _measure(name: str, function, count: int) -> None:  # type: ignore
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    print(f'  {name:<32} {elapsed:8.3f} s  {count / elapsed / 1e6:6.2f} M/s')
+
+
+def _image(width: int, height: int):  # type: ignore
+    return [
+        [(x * 255 // (width - 1), y * 255 // (height - 1),
+          (x + y) * 255 // (width + height - 2))
+         for x in range(width)]
+        for y in range(height)
+    ]
+
+
+def _naive(image, scheme):  # type: ignore
+    # One nearest color search per cell, like the rewriter does
+    bits = scheme._BITS_PER_COLOR
+    return [[nearest_ansi_color(rgb, bits) for rgb in row] for row in image]
+
+
+def main() -> None:
+    for scheme in (BasicColor, ExtendedColor):
+        # Palettes are built once per scheme, the first call pays for it
+        dither_palette(scheme)
+
+    for width, height in GRIDS:
+        image = _image(width, height)
+        cells = width * height
+
+        print(f'{width}x{height} grid')
+
+        for scheme in (BasicColor, ExtendedColor):
+            name = scheme.__name__.replace('Color', '')
+
+            _measure(f'nearest_ansi_color, {name}',
+                     lambda: _naive(image, scheme), cells)
+
+            for method in ('none', 'bayer', 'floyd_steinberg'):
+                _measure(f'{method}, {name} (list)',
+                         lambda: dither(image, scheme, method), cells)
+
+            if numpy is not None:
+                array = numpy.array(image, dtype=numpy.uint8)
+                dither_palette(scheme).lut_array()
+
+                for method in ('none', 'bayer', 'floyd_steinberg'):
+                    _measure(f'{method}, {name} (numpy)',
+                             lambda: dither(array, scheme, method), cells)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import random
+import time
+
+from sroloc.color.true import TrueColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.heatmap import Heatmap
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+VALUE_COUNT = 1_000_000
+
+
+def _measure(name: str, function, count: int) -> None:  # type: ignore
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    print(f'  {name:<32} {elapsed:8.3f} s  {count / elapsed / 1e6:6.2f} M/s')
+
+
+def _naive(values, heatmap):  # type: ignore
+    # One ColorSegment per value, like before the heatmap existed
+    edges = heatmap.edges(values)
+    specs = [
+        f'#{int(255 * i / len(edges)):02x}0000'
+        for i in range(len(edges) + 1)
+    ]
+
+    return [
+        format(ColorSegment(f'{v:.1f}'), specs[sum(e <= v for e in edges)])
+        for v in values
+    ]
+
+
+def main() -> None:
+    ColorSegment.set_color_scheme(TrueColor)
+
+    rng = random.Random(0)
+    values = [rng.lognormvariate(3, 1) for _ in range(VALUE_COUNT)]
+    heatmap = Heatmap('viridis', levels=64, vmin=0, vmax=200)
+
+    print(f'{VALUE_COUNT:,} values, 64 levels')
+    _measure('bucketize (list)', lambda: heatmap.bucketize(values),
+             VALUE_COUNT)
+    _measure('colorize, .1f (list)',
+             lambda: heatmap.colorize(values, format_spec='.1f'), VALUE_COUNT)
+
+    texts = [format(v, '.1f') for v in values]
+    _measure('colorize, preformatted (list)',
+             lambda: heatmap.colorize(values, texts), VALUE_COUNT)
+    _measure('spans, preformatted (list)',
+             lambda: heatmap.spans(values, texts), VALUE_COUNT)
+
+    if numpy is not None:
+        array = numpy.array(values)
+        _measure('bucketize (numpy)', lambda: heatmap.bucketize(array),
+                 VALUE_COUNT)
+        _measure('colorize, preformatted (numpy)',
+                 lambda: heatmap.colorize(array, texts), VALUE_COUNT)
+
+    sample = values[:VALUE_COUNT // 20]
+    _measure('ColorSegment per value (5%)', lambda: _naive(sample, heatmap),
+             len(sample))
+
+
+if __name__ == '__main__':
+    main()
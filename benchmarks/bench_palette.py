@@ -0,0 +1,61 @@
+import random
+import time
+
+from sroloc.color.palette import extract_palette, extract_theme
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+WIDTH, HEIGHT = 4000, 2500
+
+
+def _measure(name: str, function, count: int) -> None:  # type: ignore
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    print(f'  {name:<32} {elapsed:8.3f} s  {count / elapsed / 1e6:6.2f} M/s')
+
+
+def _image(channels: int) -> bytes:
+    # A few hundred noisy rows repeated, like a screenshot of a terminal
+    rng = random.Random(0)
+    base = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(12)]
+    rows = []
+
+    for _ in range(100):
+        row = bytearray()
+        for x in range(WIDTH):
+            color = base[(x // 50 + len(rows)) % len(base)]
+            row.extend(min(c + rng.randrange(8), 255) for c in color)
+            if channels == 4:
+                row.append(255)
+        rows.append(bytes(row))
+
+    return b''.join(rows[y % len(rows)] for y in range(HEIGHT))
+
+
+def main() -> None:
+    count = WIDTH * HEIGHT
+    print(f'{WIDTH}x{HEIGHT} pixels')
+
+    for channels in (3, 4):
+        image = _image(channels)
+        _measure(f'extract_palette ({channels} channels)',
+                 lambda: extract_palette(image, channels=channels), count)
+
+    image = _image(3)
+    _measure('extract_theme', lambda: extract_theme(image), count)
+    _measure('extract_palette, 1M samples',
+             lambda: extract_palette(image, max_samples=1_000_000), count)
+
+    if numpy is not None:
+        array = numpy.frombuffer(image, numpy.uint8).reshape(HEIGHT, WIDTH, 3)
+        _measure('extract_palette (numpy)', lambda: extract_palette(array),
+                 count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import random
+import timeit
+
+from sroloc.printing.screen import Screen
+
+WIDTH, HEIGHT = 200, 60
+CHANGED_CELLS = WIDTH * HEIGHT // 100
+FRAMES = 200
+
+
+def _prepare_screen() -> Screen:
+    screen = Screen(WIDTH, HEIGHT)
+
+    for y in range(HEIGHT):
+        screen.write(0, y, '.' * WIDTH, 'green')
+
+    screen.flush()
+    return screen
+
+
+def main() -> None:
+    rng = random.Random(0)
+    screen = _prepare_screen()
+    update_bytes = 0
+
+    def sparse_frame() -> None:
+        nonlocal update_bytes
+
+        for _ in range(CHANGED_CELLS):
+            x, y = rng.randrange(WIDTH), rng.randrange(HEIGHT)
+            style = rng.choice(['red', 'b blue'])
+            screen.write(x, y, rng.choice('#@%'), style)
+
+        update_bytes += len(screen.flush().encode())
+
+    repaint_bytes = len(screen.repaint().encode())
+
+    sparse_time = timeit.timeit(sparse_frame, number=FRAMES) / FRAMES
+    repaint_time = timeit.timeit(screen.repaint, number=FRAMES) / FRAMES
+
+    print(f'{WIDTH}x{HEIGHT} screen, {CHANGED_CELLS} changed cells per frame')
+    print(f'  sparse flush: {update_bytes / FRAMES:10.0f} B  '
+          f'{sparse_time * 1e3:8.3f} ms')
+    print(f'  full repaint: {repaint_bytes:10.0f} B  '
+          f'{repaint_time * 1e3:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
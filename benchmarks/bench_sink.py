@@ -0,0 +1,102 @@
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, List, TextIO
+
+from sroloc.color.ansi import BasicColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.sink import LineSink
+
+LINE_COUNT = 100_000
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def _run_threads(thread_count: int,
+                 work: Callable[[int, List[float]], None]) -> None:
+    latencies: List[float] = []
+    threads = [
+        threading.Thread(target=work,
+                         args=(LINE_COUNT // thread_count, latencies))
+        for _ in range(thread_count)
+    ]
+
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+
+    # How long a single print can stall the thread calling it
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    worst = latencies[-1] * 1e3
+
+    print(f'{elapsed:8.3f} s  {LINE_COUNT / elapsed / 1e6:6.2f} M/s  '
+          f'p99 {p99:7.1f} us  max {worst:6.1f} ms')
+
+
+def _compare(stream: TextIO) -> None:
+    level = format(ColorSegment('INFO'), 'green')
+    lock = threading.Lock()
+
+    def locked_print(count: int, latencies: List[float]) -> None:
+        clock = time.perf_counter
+        times = []
+
+        for i in range(count):
+            start = clock()
+            with lock:
+                print(level, 'request', i, file=stream)
+            times.append(clock() - start)
+
+        latencies.extend(times)
+
+    def sink_print(count: int, latencies: List[float]) -> None:
+        clock = time.perf_counter
+        times = []
+
+        for i in range(count):
+            start = clock()
+            print(level, 'request', i, file=sink)
+            times.append(clock() - start)
+
+        latencies.extend(times)
+
+    for thread_count in THREAD_COUNTS:
+        print(f'  {f"print with a lock, {thread_count} threads":<32} ',
+              end='')
+        _run_threads(thread_count, locked_print)
+
+        sink = LineSink(stream)
+
+        with sink:
+            print(f'  {f"LineSink, {thread_count} threads":<32} ', end='')
+            _run_threads(thread_count, sink_print)
+
+
+def main() -> None:
+    ColorSegment.set_color_scheme(BasicColor)
+
+    # Line buffered like stdout of a terminal, one write call per line
+    print(f'{LINE_COUNT:,} lines to /dev/null')
+    with open(os.devnull, 'w', buffering=1) as stream:
+        _compare(stream)
+
+    print(f'{LINE_COUNT:,} lines to a pipe')
+    reader = subprocess.Popen(['cat'], stdin=subprocess.PIPE,
+                              stdout=subprocess.DEVNULL, text=True,
+                              bufsize=1)
+    try:
+        _compare(reader.stdin)  # type: ignore
+    finally:
+        reader.stdin.close()  # type: ignore
+        reader.wait()
+
+
+if __name__ == '__main__':
+    main()
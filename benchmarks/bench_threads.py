@@ -0,0 +1,86 @@
+import os
+import sys
+import threading
+import time
+from typing import Callable, List
+
+from sroloc.color.true import TrueColor
+from sroloc.printing.color_segment import ColorSegment
+
+# Formatted by every thread, so the total work grows with the threads
+SEGMENTS_PER_THREAD = 200_000
+
+SPECS = ['b #00c853', '#ffd600', 'b #d50000/#000000', 'i #2962ff']
+
+
+def _thread_counts() -> List[int]:
+    cores = os.cpu_count() or 1
+    counts = [1]
+
+    while counts[-1] < 2 * cores:
+        counts.append(counts[-1] * 2)
+
+    return counts
+
+
+def _work(count: int) -> None:
+    segments = [ColorSegment(f'request {i}') for i in range(64)]
+
+    for i in range(count):
+        format(segments[i & 63], SPECS[i & 3])
+
+
+def _run(thread_count: int, work: Callable[[int], None]) -> float:
+    barrier = threading.Barrier(thread_count + 1)
+
+    def run() -> None:
+        barrier.wait()
+        work(SEGMENTS_PER_THREAD)
+
+    threads = [threading.Thread(target=run) for _ in range(thread_count)]
+
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.join()
+
+    return time.perf_counter() - start
+
+
+def _scaling() -> None:
+    cores = os.cpu_count() or 1
+    single = None
+
+    for thread_count in _thread_counts():
+        elapsed = _run(thread_count, _work)
+        rate = thread_count * SEGMENTS_PER_THREAD / elapsed
+
+        if single is None:
+            single = rate
+
+        ideal = min(thread_count, cores)
+        print(f'  {f"{thread_count} threads":<32} {elapsed:8.3f} s  '
+              f'{rate / 1e6:6.2f} M/s  {rate / single:5.2f}x '
+              f'(ideal {ideal}x)')
+
+
+def main() -> None:
+    ColorSegment.set_color_scheme(TrueColor, SPECS)
+
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'{os.cpu_count()} cores, GIL '
+          f'{"enabled" if is_gil_enabled else "disabled"}, '
+          f'{SEGMENTS_PER_THREAD:,} segments per thread')
+
+    if is_gil_enabled:
+        print('  (threads can only scale on a free-threaded build)')
+
+    _scaling()
+
+
+if __name__ == '__main__':
+    main()
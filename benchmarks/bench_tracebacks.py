@@ -0,0 +1,73 @@
+import time
+import traceback
+
+from sroloc.color.true import TrueColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.tracebacks import TracebackRenderer
+
+TRACEBACK_COUNT = 20_000
+
+
+def _measure(name: str, function, count: int) -> None:  # type: ignore
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    print(f'  {name:<32} {elapsed:8.3f} s  {count / elapsed / 1e3:6.1f} k/s')
+
+
+def _handler(depth: int) -> None:
+    if depth:
+        _handler(depth - 1)
+    else:
+        raise ConnectionError('upstream closed the connection')
+
+
+def _naive(exception: BaseException) -> str:
+    # One ColorSegment per frame field, like before the renderer existed
+    output = [f'{ColorSegment("Traceback (most recent call last):"):b}\n']
+
+    for frame in traceback.extract_tb(exception.__traceback__):
+        output.append(
+            f'  File "{ColorSegment(frame.filename):cyan}", '
+            f'line {ColorSegment(str(frame.lineno)):yellow}, '
+            f'in {ColorSegment(frame.name):purple}\n'
+            f'    {(frame.line or "").strip()}\n'
+        )
+
+    for line in traceback.format_exception_only(type(exception), exception):
+        output.append(f'{ColorSegment(line.rstrip()):b red}\n')
+
+    return ''.join(output)
+
+
+def main() -> None:
+    TrueColor.add_hex_colors_to_bank({
+        'red': '#ff5555', 'cyan': '#8be9fd', 'yellow': '#f1fa8c',
+        'purple': '#bd93f9',
+    })
+    ColorSegment.set_color_scheme(TrueColor)
+
+    try:
+        _handler(20)
+    except ConnectionError as e:
+        exception = e
+
+    renderer = TracebackRenderer()
+
+    print(f'{TRACEBACK_COUNT:,} tracebacks, 22 frames each')
+    _measure('ColorSegment per field',
+             lambda: [_naive(exception) for _ in range(TRACEBACK_COUNT)],
+             TRACEBACK_COUNT)
+    _measure('TracebackRenderer',
+             lambda: [renderer.render_exception(exception)
+                      for _ in range(TRACEBACK_COUNT)],
+             TRACEBACK_COUNT)
+    _measure('traceback.format_exception (plain)',
+             lambda: [traceback.format_exception(exception)
+                      for _ in range(TRACEBACK_COUNT)],
+             TRACEBACK_COUNT)
+
+
+if __name__ == '__main__':
+    main()
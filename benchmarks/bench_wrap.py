@@ -0,0 +1,51 @@
+import random
+import textwrap
+import time
+
+from sroloc.printing.sgr import strip_escape_sequences
+from sroloc.printing.wrap import truncate, wrap
+
+TARGET_SIZE = 1024 * 1024
+WIDTH = 80
+STYLES = ['\x1b[31m', '\x1b[1;34m', '\x1b[4m', '\x1b[38;2;10;200;30m']
+
+
+def _styled_paragraph(size: int) -> str:
+    rng = random.Random(0)
+    words = []
+    length = 0
+
+    while length < size:
+        word_length = rng.randint(1, 9)
+        word = ''.join(rng.choice('abcdefghij') for _ in range(word_length))
+        if rng.random() < 0.2:
+            word = f'{rng.choice(STYLES)}{word}\x1b[0m'
+
+        words.append(word)
+        length += len(word) + 1
+
+    return ' '.join(words)
+
+
+def _measure(name: str, function, size: int) -> None:  # type: ignore
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    print(f'  {name:<28} {elapsed:8.3f} s  {size / elapsed / 1e6:6.2f} MB/s')
+
+
+def main() -> None:
+    paragraph = _styled_paragraph(TARGET_SIZE)
+    plain = strip_escape_sequences(paragraph)
+
+    print(f'{len(paragraph) / 1e6:.2f} MB styled paragraph, width {WIDTH}')
+    _measure('sroloc wrap', lambda: wrap(paragraph, WIDTH), len(paragraph))
+    _measure('textwrap.wrap (plain text)',
+             lambda: textwrap.wrap(plain, WIDTH), len(plain))
+    _measure('sroloc truncate', lambda: truncate(paragraph, len(plain) - 1),
+             len(paragraph))
+
+
+if __name__ == '__main__':
+    main()
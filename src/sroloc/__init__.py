@@ -1 +1,3 @@
 from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.style import Style
+from sroloc.printing.accessors import style
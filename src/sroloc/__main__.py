@@ -0,0 +1,144 @@
+import argparse
+import sys
+from typing import Dict, List, Optional, Type
+
+from sroloc.color.ansi import BasicColor, ExtendedColor
+from sroloc.color.bank import ColorBank
+from sroloc.color.true import TrueColor
+from sroloc.printing.asciicast import (
+    AsciicastError, play, render_final_screen
+)
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.diff import DiffRenderer
+from sroloc.printing.json_colorizer import JsonColorizer, JsonColorizeError
+
+_COLOR_SCHEMES: Dict[str, Type[ColorBank]] = {  # type: ignore
+    'basic': BasicColor,
+    'extended': ExtendedColor,
+    'true': TrueColor,
+}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m sroloc')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    json_parser = commands.add_parser(
+        'json', help='pretty-print and colorize JSON or JSON lines'
+    )
+    json_parser.add_argument('files', nargs='*', metavar='FILE')
+    json_parser.add_argument('--indent', type=int, default=2)
+    json_parser.add_argument('--scheme', choices=sorted(_COLOR_SCHEMES),
+                             default='basic')
+
+    diff_parser = commands.add_parser(
+        'diff', help='colorize a unified diff, or compare two files'
+    )
+    diff_parser.add_argument('files', nargs='*', metavar='FILE')
+    diff_parser.add_argument('-U', '--unified', type=int, default=3,
+                             metavar='LINES')
+    diff_parser.add_argument('--scheme', choices=sorted(_COLOR_SCHEMES),
+                             default='basic')
+
+    play_parser = commands.add_parser(
+        'play', help='replay an asciicast recording'
+    )
+    play_parser.add_argument('file', metavar='FILE')
+    play_parser.add_argument('--speed', type=float, default=1.0)
+    play_parser.add_argument('--max-idle', type=float, metavar='SECONDS')
+    play_parser.add_argument('--final', action='store_true',
+                             help='only print the final screen')
+
+    return parser
+
+
+def _colorize_json(args: argparse.Namespace) -> int:
+    ColorSegment.set_color_scheme(_COLOR_SCHEMES[args.scheme])
+
+    write = sys.stdout.write
+
+    for path in args.files or ['-']:
+        colorizer = JsonColorizer(args.indent)
+
+        try:
+            if path == '-':
+                for output in colorizer.colorize_stream(sys.stdin.buffer):
+                    write(output)
+            else:
+                with open(path, 'rb') as file:
+                    for output in colorizer.colorize_stream(file):
+                        write(output)
+        except JsonColorizeError as error:
+            sys.stdout.flush()
+            print(f'{path}: {error}', file=sys.stderr)
+            return 1
+
+    return 0
+
+
+def _colorize_diff(args: argparse.Namespace) -> int:
+    ColorSegment.set_color_scheme(_COLOR_SCHEMES[args.scheme])
+
+    write = sys.stdout.write
+    renderer = DiffRenderer()
+
+    if len(args.files) > 2:
+        print('diff: expected at most two files', file=sys.stderr)
+        return 2
+
+    if len(args.files) == 2:
+        old, new = args.files
+
+        with open(old, errors='replace') as a, \
+                open(new, errors='replace') as b:
+            for output in renderer.render_files(a, b, old, new,
+                                                args.unified):
+                write(output)
+
+        return 0
+
+    path = args.files[0] if args.files else '-'
+
+    if path == '-':
+        for output in renderer.render_stream(sys.stdin.buffer):
+            write(output)
+    else:
+        with open(path, 'rb') as file:
+            for output in renderer.render_stream(file):
+                write(output)
+
+    return 0
+
+
+def _play(args: argparse.Namespace) -> int:
+    try:
+        with open(args.file, errors='replace') as file:
+            if args.final:
+                print(render_final_screen(file))
+            else:
+                play(file, sys.stdout, args.speed, args.max_idle)
+    except AsciicastError as error:
+        sys.stdout.flush()
+        print(f'{args.file}: {error}', file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+
+    if args.command == 'json':
+        return _colorize_json(args)
+
+    if args.command == 'diff':
+        return _colorize_diff(args)
+
+    if args.command == 'play':
+        return _play(args)
+
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,7 @@
-from sroloc.color.ansi import BasicColor, ExtendedColor
+from sroloc.color.alpha import composite_colors
+from sroloc.color.ansi import (
+    BasicColor, ExtendedColor, ansi_color_to_rgb, nearest_ansi_color
+)
 from sroloc.color.bank import ColorBank
 from sroloc.color.true import TrueColor
 from sroloc.color.utils import RgbColor
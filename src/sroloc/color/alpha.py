@@ -0,0 +1,51 @@
+from typing import Any, Iterable, List, Optional
+
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor, _composite
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def _composite_array(pixels: Any, background: RgbColor) -> Any:
+    if pixels.shape[-1] != 4:
+        raise ValueError(
+            f'Expected RGBA pixels in the last axis, got shape {pixels.shape}'
+        )
+
+    pixels = pixels.astype(numpy.uint32)
+    alpha = pixels[..., 3:]
+    bg = numpy.array(tuple(background), dtype=numpy.uint32)
+
+    blended = (pixels[..., :3] * alpha + bg * (255 - alpha) + 127) // 255
+
+    return blended.astype(numpy.uint8)
+
+
+def _composite_sequence(colors: Iterable[RgbColor],
+                        background: RgbColor) -> List[RgbColor]:
+    bg = (background.r, background.g, background.b)
+    blended: List[RgbColor] = []
+
+    for color in colors:
+        if color.a == 255:
+            blended.append(color)
+        else:
+            r, g, b = _composite((color.r, color.g, color.b, color.a), bg)
+            blended.append(RgbColor(r, g, b))
+
+    return blended
+
+
+def composite_colors(colors: Any,
+                     background: Optional[RgbColor] = None) -> Any:
+    if background is None:
+        background = TrueColor._TERMINAL_BACKGROUND
+
+    # (..., 4) shaped arrays of RGBA values are blended all at once
+    if numpy is not None and isinstance(colors, numpy.ndarray):
+        return _composite_array(colors, background)
+
+    return _composite_sequence(colors, background)
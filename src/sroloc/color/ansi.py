@@ -1,8 +1,8 @@
 from abc import ABC
-from typing import ClassVar, Optional, Dict
+from typing import ClassVar, Optional, Dict, Tuple, Union
 
 from sroloc.color.bank import ColorBank
-from sroloc.color.utils import InvalidAnsiColorValueError
+from sroloc.color.utils import InvalidAnsiColorValueError, RgbColor
 
 _ANSI_BASIC_COLORS = {
     'black': 0,
@@ -274,17 +274,87 @@ _ANSI_EXTENDED_COLORS = {
     'grey_93': 255
 }
 
+# Default xterm values of the 16 system colors
+_ANSI_SYSTEM_COLORS_RGB = [
+    (0x00, 0x00, 0x00), (0xcd, 0x00, 0x00), (0x00, 0xcd, 0x00),
+    (0xcd, 0xcd, 0x00), (0x00, 0x00, 0xee), (0xcd, 0x00, 0xcd),
+    (0x00, 0xcd, 0xcd), (0xe5, 0xe5, 0xe5), (0x7f, 0x7f, 0x7f),
+    (0xff, 0x00, 0x00), (0x00, 0xff, 0x00), (0xff, 0xff, 0x00),
+    (0x5c, 0x5c, 0xff), (0xff, 0x00, 0xff), (0x00, 0xff, 0xff),
+    (0xff, 0xff, 0xff),
+]
+
+_ANSI_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+
+def ansi_color_to_rgb(color: int) -> RgbColor:
+    if not 0 <= color < 256:
+        raise InvalidAnsiColorValueError(color, 8)
+
+    if color < 16:
+        return RgbColor(*_ANSI_SYSTEM_COLORS_RGB[color])
+
+    if color < 232:
+        color -= 16
+        return RgbColor(
+            _ANSI_CUBE_LEVELS[color // 36],
+            _ANSI_CUBE_LEVELS[color // 6 % 6],
+            _ANSI_CUBE_LEVELS[color % 6]
+        )
+
+    gray = 8 + (color - 232) * 10
+    return RgbColor(gray, gray, gray)
+
+
+def _distance(a: Tuple[int, int, int], b: Tuple[int, int, int]) -> int:
+    return sum((x - y) ** 2 for x, y in zip(a, b))
+
+
+def _cube_index(value: int) -> int:
+    if value < 48:
+        return 0
+
+    if value < 115:
+        return 1
+
+    return (value - 35) // 40
+
+
+def nearest_ansi_color(color: Union[RgbColor, Tuple[int, int, int]],
+                       bits_per_color: int = 8) -> int:
+    r, g, b = color
+    rgb = (r, g, b)
+
+    if bits_per_color == 3:
+        return min(
+            range(8), key=lambda i: _distance(rgb, _ANSI_SYSTEM_COLORS_RGB[i])
+        )
+
+    if bits_per_color != 8:
+        raise ValueError(f'Invalid number of bits per color: {bits_per_color}')
+
+    r, g, b = map(_cube_index, rgb)
+    cube = (
+        _ANSI_CUBE_LEVELS[r], _ANSI_CUBE_LEVELS[g], _ANSI_CUBE_LEVELS[b]
+    )
+
+    gray_index = min(max((sum(rgb) // 3 - 3) // 10, 0), 23)
+    gray_level = 8 + gray_index * 10
+
+    if _distance(rgb, (gray_level,) * 3) < _distance(rgb, cube):
+        return 232 + gray_index
+
+    return 16 + 36 * r + 6 * g + b
+
 
 class ANSIColor(ColorBank[int], ABC):
     _BITS_PER_COLOR: ClassVar[int]  # Should be only 3 or 8
 
     @classmethod
-    def add_color_to_bank(cls, name: str, color: int) -> None:
+    def _validate_color(cls, color: int) -> None:
         if color < 0 or color >= (2 ** cls._BITS_PER_COLOR):
             raise InvalidAnsiColorValueError(color, cls._BITS_PER_COLOR)
 
-        super().add_color_to_bank(name, color)
-
 
 class BasicColor(ANSIColor):
     _BANK: Dict[str, int] = _ANSI_BASIC_COLORS
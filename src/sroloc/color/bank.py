@@ -1,14 +1,71 @@
-from abc import ABC, abstractmethod
-from typing import Dict, TypeVar, Generic, Optional
+from abc import ABC, ABCMeta, abstractmethod
+from types import MappingProxyType
+from typing import (
+    Dict, TypeVar, Generic, Optional, Mapping, Tuple, Any, List
+)
 
 from sroloc.color.utils import UnknownColorError
 
 ColorType = TypeVar('ColorType')
 
+# Bumped on every change of a bank layer, flattened caches compare against
+# it. Creating a scheme changes no layer of the existing ones.
+_bank_version = 0
 
-class ColorBank(Generic[ColorType], ABC):
+
+def get_bank_version() -> int:
+    return _bank_version
+
+
+def _bump_bank_version() -> None:
+    global _bank_version
+    _bank_version += 1
+
+
+def _read_only_layer(colors: Mapping[str, Any]) -> Mapping[str, Any]:
+    return MappingProxyType(dict(colors))
+
+
+class ColorBankMeta(ABCMeta):
+    def __setattr__(cls, name: str, value: Any) -> None:
+        # Layers can't be changed in place, so no change goes unnoticed
+        if name == '_BANK':
+            value = _read_only_layer(value)
+
+        super().__setattr__(name, value)
+
+        if name in ('_BANK', '_DEFAULT_COLOR', '_TERMINAL_BACKGROUND'):
+            _bump_bank_version()
+
+
+class ColorBank(Generic[ColorType], ABC, metaclass=ColorBankMeta):
     _DEFAULT_COLOR: Optional[ColorType] = None
-    _BANK: Dict[str, ColorType]
+    _BANK: Mapping[str, ColorType]
+    _FLAT_BANK: Tuple[int, Dict[str, ColorType]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        # Every class owns one layer of colors overlaid on its parents',
+        # so adding colors to a subclass never leaks into its base class
+        layer = _read_only_layer(cls.__dict__.get('_BANK', {}))
+        type.__setattr__(cls, '_BANK', layer)
+
+    @classmethod
+    def _flat_bank(cls) -> Dict[str, ColorType]:
+        cached = cls.__dict__.get('_FLAT_BANK')
+        if cached is not None and cached[0] == _bank_version:
+            return cached[1]  # type: ignore
+
+        version = _bank_version
+        flat: Dict[str, ColorType] = {}
+
+        for klass in reversed(cls.__mro__):
+            flat.update(klass.__dict__.get('_BANK', {}))
+
+        type.__setattr__(cls, '_FLAT_BANK', (version, flat))
+
+        return flat
 
     @classmethod
     def set_default_color(cls, color: ColorType) -> None:
@@ -18,14 +75,32 @@ class ColorBank(Generic[ColorType], ABC):
     def set_default_color_from_bank(cls, color_name: str) -> None:
         cls._DEFAULT_COLOR = cls.get_color(color_name)
 
+    @classmethod
+    def _validate_color(cls, color: ColorType) -> None:
+        pass
+
     @classmethod
     def add_color_to_bank(cls, name: str, color: ColorType) -> None:
-        cls._BANK[name] = color
+        cls.add_colors_to_bank({name: color})
+
+    @classmethod
+    def add_colors_to_bank(cls, colors: Mapping[str, ColorType]) -> None:
+        for color in colors.values():
+            cls._validate_color(color)
+
+        layer = cls._BANK
+        changes = {
+            name: color for name, color in colors.items()
+            if name not in layer or layer[name] != color
+        }
+
+        if changes:
+            cls._BANK = {**layer, **changes}
 
     @classmethod
     def get_color(cls, name: str) -> ColorType:
         try:
-            return cls._BANK[name]  # type: ignore
+            return cls._flat_bank()[name]
         except KeyError:
             if cls._DEFAULT_COLOR is not None:
                 return cls._DEFAULT_COLOR  # type: ignore
@@ -34,7 +109,20 @@ class ColorBank(Generic[ColorType], ABC):
 
     @classmethod
     def has_color(cls, name: str) -> bool:
-        return name in cls._BANK
+        return name in cls._flat_bank()
+
+    @classmethod
+    def color_codes(cls, fg_color: Optional[str],
+                    bg_color: Optional[str]) -> List[str]:
+        codes = []
+
+        if fg_color:
+            codes.append(cls.fg_color_code(fg_color))
+
+        if bg_color:
+            codes.append(cls.bg_color_code(bg_color))
+
+        return codes
 
     @classmethod
     @abstractmethod
@@ -0,0 +1,162 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Type
+
+from sroloc.color.ansi import ansi_color_to_rgb
+from sroloc.color.bank import ColorBank, get_bank_version
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+
+# WCAG minimum contrast ratios for normal text
+AA_CONTRAST = 4.5
+AAA_CONTRAST = 7.0
+
+# Theme colors first, plain black and white for banks without them
+_AUTO_CANDIDATES = (('black', '#000000'), ('white', '#ffffff'))
+
+# Linearized sRGB channel values, so luminance is just a weighted sum
+_LINEAR: Tuple[float, ...] = tuple(
+    c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+    for c in (i / 255 for i in range(256))
+)
+
+# Bank version, luminance of every bank color and chosen auto foregrounds
+_ContrastCache = Tuple[int, Dict[str, float], Dict[Tuple[str, ...], str]]
+
+
+class ContrastPair(NamedTuple):
+    fg_color: str
+    bg_color: str
+    ratio: float
+
+
+def relative_luminance(color: RgbColor) -> float:
+    return (0.2126 * _LINEAR[color.r] + 0.7152 * _LINEAR[color.g]
+            + 0.0722 * _LINEAR[color.b])
+
+
+def _ratio(a: float, b: float) -> float:
+    if a < b:
+        a, b = b, a
+
+    return (a + 0.05) / (b + 0.05)
+
+
+def contrast_ratio(a: RgbColor, b: RgbColor) -> float:
+    return _ratio(relative_luminance(a), relative_luminance(b))
+
+
+def resolve_rgb(scheme: Type[ColorBank],  # type: ignore
+                name: str) -> RgbColor:
+    if issubclass(scheme, TrueColor):
+        return scheme.get_opaque_color(name)
+
+    color = scheme.get_color(name)
+
+    if isinstance(color, RgbColor):
+        return color
+
+    return ansi_color_to_rgb(color)
+
+
+def _cache(scheme: Type[ColorBank]) -> _ContrastCache:  # type: ignore
+    version = get_bank_version()
+    cache: Optional[_ContrastCache] = scheme.__dict__.get('_CONTRAST_CACHE')
+
+    if cache is None or cache[0] != version:
+        luminances = {
+            name: relative_luminance(resolve_rgb(scheme, name))
+            for name in scheme._flat_bank()
+        }
+        cache = (version, luminances, {})
+        type.__setattr__(scheme, '_CONTRAST_CACHE', cache)
+
+    return cache
+
+
+def luminance_table(
+        scheme: Type[ColorBank]  # type: ignore
+) -> Dict[str, float]:
+    return _cache(scheme)[1]
+
+
+def _luminance(scheme: Type[ColorBank],  # type: ignore
+               luminances: Dict[str, float], name: str) -> float:
+    try:
+        return luminances[name]
+    except KeyError:
+        # Hex colors of a TrueColor scheme aren't part of its bank
+        return relative_luminance(resolve_rgb(scheme, name))
+
+
+def _auto_candidates(
+        scheme: Type[ColorBank]  # type: ignore
+) -> Tuple[str, ...]:
+    candidates = []
+
+    for name, fallback in _AUTO_CANDIDATES:
+        if scheme.has_color(name):
+            candidates.append(name)
+        elif scheme.has_color(fallback):
+            candidates.append(fallback)
+
+    return tuple(candidates)
+
+
+def auto_foreground(scheme: Type[ColorBank],  # type: ignore
+                    bg_color: str,
+                    candidates: Optional[Iterable[str]] = None) -> str:
+    if candidates is None:
+        candidates = _auto_candidates(scheme)
+    else:
+        candidates = tuple(candidates)
+
+    if not candidates:
+        raise ValueError(
+            f'No foreground candidates in {scheme.__name__!r}'
+        )
+
+    _, luminances, choices = _cache(scheme)
+    key = (bg_color,) + candidates
+
+    try:
+        return choices[key]
+    except KeyError:
+        pass
+
+    background = _luminance(scheme, luminances, bg_color)
+    choice = max(
+        candidates,
+        key=lambda name: _ratio(
+            _luminance(scheme, luminances, name), background
+        )
+    )
+    choices[key] = choice
+
+    return choice
+
+
+def audit_contrast(scheme: Type[ColorBank],  # type: ignore
+                   minimum: Optional[float] = AA_CONTRAST,
+                   fg_colors: Optional[Iterable[str]] = None,
+                   bg_colors: Optional[Iterable[str]] = None
+                   ) -> List[ContrastPair]:
+    luminances = luminance_table(scheme)
+
+    fg_names = list(luminances) if fg_colors is None else list(fg_colors)
+    bg_names = list(luminances) if bg_colors is None else list(bg_colors)
+
+    fg_values = [_luminance(scheme, luminances, n) for n in fg_names]
+    bg_values = [_luminance(scheme, luminances, n) for n in bg_names]
+
+    pairs = [
+        ContrastPair(fg, bg, _ratio(fg_value, bg_value))
+        for bg, bg_value in zip(bg_names, bg_values)
+        for fg, fg_value in zip(fg_names, fg_values)
+        if fg != bg
+    ]
+
+    if minimum is not None:
+        pairs = [pair for pair in pairs if pair.ratio < minimum]
+
+    pairs.sort(key=lambda pair: pair.ratio)
+
+    return pairs
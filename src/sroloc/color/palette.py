@@ -0,0 +1,247 @@
+import colorsys
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Dict, List, Sequence, Tuple, Type, Union
+
+from sroloc.color.ansi import ansi_color_to_rgb, _ANSI_BASIC_COLORS
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Colors are counted with 5 bits per channel, so histograms stay small
+_BITS = 5
+_SHIFT = 8 - _BITS
+_LEVELS = 1 << _BITS
+
+_HUES = {
+    'red': 0,
+    'yellow': 60,
+    'green': 120,
+    'cyan': 180,
+    'blue': 240,
+    'purple': 300,
+}
+
+_MIN_SATURATION = 0.15
+_MAX_HUE_DISTANCE = 45
+
+Entry = Tuple[int, int, int, int]  # Quantized r, g, b and pixel count
+Pixels = Union[bytes, bytearray, memoryview, Sequence[Any], Any]
+
+
+def _pack(r: int, g: int, b: int) -> int:
+    return (r >> _SHIFT) << (2 * _BITS) | (g >> _SHIFT) << _BITS | b >> _SHIFT
+
+
+def _unpack(key: int, count: int) -> Entry:
+    mask = _LEVELS - 1
+    return key >> (2 * _BITS), (key >> _BITS) & mask, key & mask, count
+
+
+def _numpy_histogram(pixels: Any) -> List[Entry]:
+    pixels = pixels.reshape(-1, pixels.shape[-1])
+
+    # Mostly transparent pixels don't contribute to the palette
+    if pixels.shape[1] == 4:
+        pixels = pixels[pixels[:, 3] >= 128]
+
+    quantized = pixels[:, :3].astype(numpy.uint32) >> _SHIFT
+    keys = (
+        quantized[:, 0] << (2 * _BITS) | quantized[:, 1] << _BITS
+        | quantized[:, 2]
+    )
+
+    counts = numpy.bincount(keys, minlength=_LEVELS ** 3)
+    present = numpy.flatnonzero(counts)
+
+    return [
+        _unpack(key, count)
+        for key, count in zip(present.tolist(), counts[present].tolist())
+    ]
+
+
+def _buffer_histogram(data: Union[bytes, bytearray, memoryview],
+                      channels: int, max_samples: int) -> List[Entry]:
+    data = bytes(data)
+    pixel_count = len(data) // channels
+    step = channels * max(1, pixel_count // max_samples)
+
+    # Strided slices subsample in C, only the samples are looped over
+    r, g, b = data[0::step], data[1::step], data[2::step]
+    samples = zip(r, g, b)
+
+    if channels == 4:
+        alpha = data[3::step]
+        samples = (
+            rgb for rgb, a in zip(samples, alpha) if a >= 128
+        )  # type: ignore
+
+    counts = Counter(_pack(*rgb) for rgb in samples)
+
+    return [_unpack(key, count) for key, count in counts.items()]
+
+
+def _sequence_histogram(colors: Sequence[Any],
+                        max_samples: int) -> List[Entry]:
+    step = max(1, len(colors) // max_samples)
+    counts = Counter(
+        _pack(*tuple(color)[:3]) for color in colors[::step]
+        if getattr(color, 'a', 255) >= 128
+    )
+
+    return [_unpack(key, count) for key, count in counts.items()]
+
+
+def _histogram(pixels: Pixels, channels: int,
+               max_samples: int) -> List[Entry]:
+    if channels not in (3, 4):
+        raise ValueError(f'Invalid number of channels: {channels}')
+
+    if numpy is not None:
+        if isinstance(pixels, (bytes, bytearray, memoryview)):
+            usable = len(pixels) - len(pixels) % channels
+            pixels = numpy.frombuffer(
+                pixels, dtype=numpy.uint8, count=usable
+            ).reshape(-1, channels)
+
+        if isinstance(pixels, numpy.ndarray):
+            return _numpy_histogram(pixels)
+
+    if isinstance(pixels, (bytes, bytearray, memoryview)):
+        return _buffer_histogram(pixels, channels, max_samples)
+
+    return _sequence_histogram(pixels, max_samples)
+
+
+def _box_split(box: List[Entry]) -> Tuple[int, int]:
+    # Pixel count times the widest channel range, 0 if it can't be split
+    if len(box) < 2:
+        return 0, 0
+
+    ranges = []
+    for channel in range(3):
+        values = list(map(itemgetter(channel), box))
+        ranges.append(max(values) - min(values))
+
+    channel = max(range(3), key=ranges.__getitem__)
+
+    return ranges[channel] * sum(map(itemgetter(3), box)), channel
+
+
+def _median_cut(entries: List[Entry], count: int) -> List[List[Entry]]:
+    boxes = [(_box_split(entries), entries)]
+
+    while len(boxes) < count:
+        index = max(range(len(boxes)), key=lambda i: boxes[i][0][0])
+        (priority, channel), box = boxes[index]
+
+        if not priority:
+            break
+
+        box.sort(key=itemgetter(channel))
+
+        # Splitting at the mean rather than the median keeps small accent
+        # clusters apart from a dominant background
+        total = sum(map(itemgetter(3), box))
+        mean = sum(e[channel] * e[3] for e in box) / total
+
+        split = 1
+        while split < len(box) - 1 and box[split][channel] <= mean:
+            split += 1
+
+        low, high = box[:split], box[split:]
+        boxes[index:index + 1] = [(_box_split(low), low),
+                                  (_box_split(high), high)]
+
+    return [box for _, box in boxes]
+
+
+def _box_color(box: List[Entry]) -> Tuple[RgbColor, int]:
+    total = sum(map(itemgetter(3), box))
+    center = 1 << (_SHIFT - 1)
+
+    channels = [
+        round(sum((e[i] << _SHIFT) * e[3] for e in box) / total) + center
+        for i in range(3)
+    ]
+
+    return RgbColor(*(min(c, 255) for c in channels)), total
+
+
+def extract_palette(pixels: Pixels, colors: int = 16, channels: int = 3,
+                    max_samples: int = 250_000) -> List[Tuple[RgbColor, int]]:
+    if colors < 1:
+        raise ValueError(f'Invalid number of colors: {colors}')
+
+    entries = _histogram(pixels, channels, max_samples)
+
+    if not entries:
+        return []
+
+    palette = [_box_color(box) for box in _median_cut(entries, colors)]
+    palette.sort(key=itemgetter(1), reverse=True)
+
+    return palette
+
+
+def _hsv(color: RgbColor) -> Tuple[float, float, float]:
+    return colorsys.rgb_to_hsv(*(c / 255 for c in color))
+
+
+def _hue_distance(a: float, b: float) -> float:
+    distance = abs(a - b) % 360
+    return min(distance, 360 - distance)
+
+
+def assign_color_names(
+        palette: Sequence[RgbColor]
+) -> Dict[str, RgbColor]:
+    if not palette:
+        raise ValueError('Cannot name colors of an empty palette')
+
+    hsv = [_hsv(color) for color in palette]
+    names: Dict[str, RgbColor] = {}
+
+    indices = range(len(palette))
+
+    names['black'] = palette[min(indices, key=lambda i: hsv[i][2])]
+    names['white'] = palette[
+        max(indices, key=lambda i: hsv[i][2] * (1 - hsv[i][1]))
+    ]
+
+    for name, hue in _HUES.items():
+        candidates = [
+            (_hue_distance(h * 360, hue) / 180 + (1 - s) / 2 + (1 - v) / 4, i)
+            for i, (h, s, v) in enumerate(hsv)
+            if s >= _MIN_SATURATION
+            and _hue_distance(h * 360, hue) <= _MAX_HUE_DISTANCE
+        ]
+
+        if candidates:
+            names[name] = palette[min(candidates)[1]]
+        else:
+            # Images without a hue keep the usual terminal color for it
+            names[name] = ansi_color_to_rgb(_ANSI_BASIC_COLORS[name])
+
+    return {name: names[name] for name in _ANSI_BASIC_COLORS}
+
+
+def extract_theme(pixels: Pixels, name: str = 'ExtractedTheme',
+                  colors: int = 16, channels: int = 3,
+                  base: Type[TrueColor] = TrueColor,
+                  max_samples: int = 250_000) -> Type[TrueColor]:
+    palette = [
+        color for color, _ in
+        extract_palette(pixels, colors, channels, max_samples)
+    ]
+
+    bank = assign_color_names(palette)
+    bank.update(
+        (f'palette_{i}', color) for i, color in enumerate(palette)
+    )
+
+    return type(name, (base,), {'_BANK': bank})  # type: ignore
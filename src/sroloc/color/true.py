@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Mapping, List
 
 from sroloc.color.bank import ColorBank
 from sroloc.color.utils import RgbColor, UnknownColorError, is_hex_color
@@ -7,16 +7,33 @@ from sroloc.color.utils import RgbColor, UnknownColorError, is_hex_color
 class TrueColor(ColorBank[RgbColor]):
     _DEFAULT_COLOR: Optional[RgbColor] = RgbColor(255, 255, 255)
     _BANK: Dict[str, RgbColor] = dict()
+    _TERMINAL_BACKGROUND: RgbColor = RgbColor(0, 0, 0)
+
+    @classmethod
+    def set_terminal_background(cls, color: RgbColor) -> None:
+        if not color.is_opaque:
+            raise ValueError(
+                f'Terminal background must be opaque, not: {color!r}'
+            )
+
+        cls._TERMINAL_BACKGROUND = color
 
     @classmethod
     def add_hex_color_to_bank(cls, name: str, color: str) -> None:
         rgb_color = RgbColor.from_hex(color)
         cls.add_color_to_bank(name, rgb_color)
 
+    @classmethod
+    def add_hex_colors_to_bank(cls, colors: Mapping[str, str]) -> None:
+        cls.add_colors_to_bank({
+            name: RgbColor.from_hex(color)
+            for name, color in colors.items()
+        })
+
     @classmethod
     def get_color(cls, name: str) -> RgbColor:
         try:
-            return cls._BANK[name]
+            return cls._flat_bank()[name]
         except KeyError:
             try:
                 return RgbColor.from_hex(name)
@@ -30,12 +47,32 @@ class TrueColor(ColorBank[RgbColor]):
     def has_color(cls, name: str) -> bool:
         return is_hex_color(name) or super().has_color(name)
 
+    @classmethod
+    def get_opaque_color(cls, name: str,
+                         background: Optional[RgbColor] = None) -> RgbColor:
+        if background is None:
+            background = cls._TERMINAL_BACKGROUND
+
+        return cls.get_color(name).composite(background)
+
+    @classmethod
+    def color_codes(cls, fg_color: Optional[str],
+                    bg_color: Optional[str]) -> List[str]:
+        if not fg_color or not bg_color:
+            return super().color_codes(fg_color, bg_color)
+
+        # Translucent foreground is blended with the background it's on
+        bg = cls.get_opaque_color(bg_color)
+        r, g, b = cls.get_opaque_color(fg_color, bg)
+
+        return [f'38;2;{r};{g};{b}', f'48;2;{bg.r};{bg.g};{bg.b}']
+
     @classmethod
     def fg_color_code(cls, color: str) -> str:
-        r, g, b = cls.get_color(color)
+        r, g, b = cls.get_opaque_color(color)
         return f'38;2;{r};{g};{b}'
 
     @classmethod
     def bg_color_code(cls, color: str) -> str:
-        r, g, b = cls.get_color(color)
+        r, g, b = cls.get_opaque_color(color)
         return f'48;2;{r};{g};{b}'
@@ -1,5 +1,6 @@
 import re
-from typing import Generator
+from functools import lru_cache
+from typing import Generator, Tuple
 
 
 class UnknownColorError(ValueError):
@@ -33,9 +34,20 @@ def is_hex_color(hex_color: str) -> bool:
     return _HEX_COLOR_REGEX.fullmatch(hex_color.strip()) is not None
 
 
+@lru_cache(maxsize=4096)
+def _composite(color: Tuple[int, int, int, int],
+               background: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    *rgb, a = color
+
+    return tuple(  # type: ignore
+        (x * a + y * (255 - a) + 127) // 255
+        for x, y in zip(rgb, background)
+    )
+
+
 class RgbColor:
-    def __init__(self, r: int, g: int, b: int, /) -> None:
-        self.r, self.g, self.b = r, g, b
+    def __init__(self, r: int, g: int, b: int, a: int = 255, /) -> None:
+        self.r, self.g, self.b, self.a = r, g, b, a
 
         if not self._validate():
             raise ValueError(f'Invalid RGB color: {self!r}')
@@ -43,9 +55,25 @@ class RgbColor:
     def _validate(self) -> bool:
         return all(
             255 >= x >= 0
-            for x in self
+            for x in (self.r, self.g, self.b, self.a)
+        )
+
+    @property
+    def is_opaque(self) -> bool:
+        return self.a == 255
+
+    def composite(self, background: 'RgbColor') -> 'RgbColor':
+        if self.a == 255:
+            return self
+
+        # Translucent backgrounds are treated as opaque
+        r, g, b = _composite(
+            (self.r, self.g, self.b, self.a),
+            (background.r, background.g, background.b)
         )
 
+        return RgbColor(r, g, b)
+
     @staticmethod
     def from_hex(hex_color: str) -> 'RgbColor':
         hex_color = hex_color.strip()
@@ -56,8 +84,9 @@ class RgbColor:
         # Remove prefix
         hex_color = hex_color[1:]
 
-        # Remove alpha
+        alpha = 255
         if len(hex_color) == 8:
+            alpha = int(hex_color[6:], 16)
             hex_color = hex_color[:6]
 
         # Convert shorthand form to full form
@@ -70,17 +99,21 @@ class RgbColor:
         g = (color_value >> 8) & 0xff
         b = color_value & 0xff
 
-        return RgbColor(r, g, b)
+        return RgbColor(r, g, b, alpha)
 
     def as_hex(self) -> str:
         hex_value = ''.join(f'{i:02x}' for i in self)
+
+        if self.a != 255:
+            hex_value += f'{self.a:02x}'
+
         return '#' + hex_value
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, RgbColor):
             raise NotImplementedError()
 
-        return tuple(self) == tuple(other)
+        return tuple(self) == tuple(other) and self.a == other.a
 
     def __iter__(self) -> Generator[int, None, None]:
         yield self.r
@@ -92,6 +125,10 @@ class RgbColor:
 
     def __repr__(self) -> str:
         r, g, b = self
+
+        if self.a != 255:
+            return f'({r=}, {g=}, {b=}, a={self.a})'
+
         return f'({r=}, {g=}, {b=})'
 
     def __format__(self, format_spec: str) -> str:
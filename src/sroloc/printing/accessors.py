@@ -0,0 +1,119 @@
+from typing import Tuple, List, Any, Type, Optional
+
+from sroloc.color.bank import ColorBank, get_bank_version
+from sroloc.printing.color_segment import ColorSegment, get_format_version
+from sroloc.printing.sgr import RESET_SEQUENCE
+
+BACKGROUND_SEPARATOR = 'on_'
+
+
+def _attribute_to_token(name: str) -> Optional[str]:
+    if name in ColorSegment.MODIFIER_KEYWORDS:
+        return name
+
+    if name.startswith(BACKGROUND_SEPARATOR):
+        fg_color = ColorSegment.COLOR_PLACEHOLDER
+        bg_color: Optional[str] = name[len(BACKGROUND_SEPARATOR):]
+    elif f'_{BACKGROUND_SEPARATOR}' in name:
+        fg_color, bg_color = name.split(f'_{BACKGROUND_SEPARATOR}', 1)
+    else:
+        fg_color, bg_color = name, None
+
+    if bg_color is None:
+        token = fg_color
+    else:
+        token = f'{fg_color}{ColorSegment.COLOR_SPLITTER}{bg_color}'
+
+    return token if ColorSegment._validate_token(token) else None
+
+
+def is_style_attribute(name: str) -> bool:
+    return not name.startswith('_') and _attribute_to_token(name) is not None
+
+
+class StyleAccessor:
+    def __init__(self, names: Tuple[str, ...] = ()) -> None:
+        self._names = names
+        self._scheme: Optional[Type[ColorBank]] = None  # type: ignore
+        self._format_version = -1
+        self._bank_version = -1
+        self._spec = ''
+        self._prefix = ''
+
+    @property
+    def spec(self) -> str:
+        self._refresh()
+        return self._spec
+
+    @property
+    def prefix(self) -> str:
+        self._refresh()
+        return self._prefix
+
+    def _refresh(self) -> None:
+        scheme = ColorSegment._COLOR_SCHEME
+        format_version = get_format_version()
+        bank_version = get_bank_version()
+
+        if (scheme is self._scheme
+                and format_version == self._format_version
+                and bank_version == self._bank_version):
+            return
+
+        # Names are translated again, the scheme or the grammar may no longer
+        # know them
+        tokens = []
+
+        for name in self._names:
+            token = _attribute_to_token(name)
+            if token is None:
+                raise AttributeError(
+                    f'{name!r} is neither a modifier nor a known color'
+                )
+
+            tokens.append(token)
+
+        self._spec = ' '.join(tokens)
+        self._prefix = ColorSegment.compile_spec(self._spec)
+        self._scheme = scheme
+        self._format_version = format_version
+        self._bank_version = bank_version
+
+    def __getattr__(self, name: str) -> 'StyleAccessor':
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        if _attribute_to_token(name) is None:
+            raise AttributeError(
+                f'{name!r} is neither a modifier nor a known color'
+            )
+
+        accessor = StyleAccessor(self._names + (name,))
+
+        # Later lookups of the same attribute skip __getattr__ entirely
+        object.__setattr__(self, name, accessor)
+
+        return accessor
+
+    def __call__(self, text: Any) -> str:
+        if (self._scheme is not ColorSegment._COLOR_SCHEME
+                or self._format_version != get_format_version()
+                or self._bank_version != get_bank_version()):
+            self._refresh()
+
+        if not self._prefix:
+            return str(text)
+
+        return f'{self._prefix}{text}{RESET_SEQUENCE}'
+
+    def __dir__(self) -> List[str]:
+        names = set(ColorSegment.MODIFIER_KEYWORDS)
+        names.update(ColorSegment._COLOR_SCHEME._flat_bank())
+
+        return sorted(names) + ['prefix', 'spec']
+
+    def __repr__(self) -> str:
+        return f'StyleAccessor({".".join(self._names)!r})'
+
+
+style = StyleAccessor()
@@ -0,0 +1,234 @@
+import json
+import threading
+import time
+from typing import (
+    Any, Callable, Dict, IO, Iterator, List, NamedTuple, Optional, TextIO
+)
+
+from sroloc.printing.emulator import TerminalEmulator
+from sroloc.printing.sgr import EscapeStreamBuffer, SgrCollapser
+
+ASCIICAST_VERSION = 2
+
+
+class AsciicastError(ValueError):
+    pass
+
+
+class AsciicastEvent(NamedTuple):
+    time: float
+    code: str
+    data: str
+
+
+class AsciicastRecorder:
+    def __init__(self, destination: IO[str], stream: Optional[TextIO] = None,
+                 width: int = 80, height: int = 24, window: float = 0.01,
+                 title: Optional[str] = None,
+                 env: Optional[Dict[str, str]] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if window < 0:
+            raise ValueError(f'Invalid coalescing window: {window}')
+
+        self.destination = destination
+        self.stream = stream
+        self.window = window
+        self.events = 0
+
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buffer = EscapeStreamBuffer()
+        self._pending: List[str] = []
+        self._pending_time = 0.0
+        self._closed = False
+
+        header: Dict[str, Any] = {
+            'version': ASCIICAST_VERSION,
+            'width': width,
+            'height': height,
+            'timestamp': int(time.time()),
+        }
+
+        if title is not None:
+            header['title'] = title
+
+        if env is not None:
+            header['env'] = env
+
+        destination.write(json.dumps(header) + '\n')
+        destination.flush()
+
+        self._start = clock()
+
+    def _emit(self) -> None:
+        # Escape sequences cut off by a burst boundary go to the next event
+        data = self._buffer.feed(''.join(self._pending))
+        self._pending.clear()
+
+        if data:
+            event = [round(self._pending_time, 6), 'o', data]
+            self.destination.write(json.dumps(event) + '\n')
+            self.events += 1
+
+    def write(self, text: str) -> int:
+        if self.stream is not None:
+            self.stream.write(text)
+
+        if not text:
+            return 0
+
+        with self._lock:
+            if self._closed:
+                raise ValueError('Write to a closed recorder')
+
+            now = self._clock() - self._start
+
+            # Writes close to the first one of a burst end up in one event
+            if self._pending and now - self._pending_time > self.window:
+                self._emit()
+
+            if not self._pending:
+                self._pending_time = now
+
+            self._pending.append(text)
+
+        return len(text)
+
+    def flush(self) -> None:
+        if self.stream is not None:
+            self.stream.flush()
+
+        with self._lock:
+            self.destination.flush()
+
+    def isatty(self) -> bool:
+        return self.stream is not None and self.stream.isatty()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._emit()
+
+            rest = self._buffer.flush()
+            if rest:
+                event = [round(self._pending_time, 6), 'o', rest]
+                self.destination.write(json.dumps(event) + '\n')
+                self.events += 1
+
+            self.destination.flush()
+
+    def __enter__(self) -> 'AsciicastRecorder':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class AsciicastReader:
+    def __init__(self, source: IO[str]) -> None:
+        self.source = source
+
+        line = source.readline()
+
+        try:
+            header = json.loads(line)
+        except ValueError:
+            header = None
+
+        if not isinstance(header, dict):
+            raise AsciicastError('Invalid asciicast header')
+
+        if header.get('version') != ASCIICAST_VERSION:
+            raise AsciicastError(
+                f'Unsupported asciicast version: {header.get("version")!r}'
+            )
+
+        self.header: Dict[str, Any] = header
+        self.width: int = header.get('width', 80)
+        self.height: int = header.get('height', 24)
+
+    def __iter__(self) -> Iterator[AsciicastEvent]:
+        # One line at a time, recordings are never loaded as a whole
+        for number, line in enumerate(self.source, 2):
+            if not line.strip():
+                continue
+
+            try:
+                timestamp, code, data = json.loads(line)
+                yield AsciicastEvent(float(timestamp), code, data)
+            except (TypeError, ValueError):
+                raise AsciicastError(
+                    f'Invalid asciicast event on line {number}'
+                ) from None
+
+
+def play(source: IO[str], output: TextIO, speed: float = 1.0,
+         max_idle: Optional[float] = None, collapse: bool = True,
+         sleep: Callable[[float], Any] = time.sleep,
+         clock: Callable[[], float] = time.monotonic) -> None:
+    if speed <= 0:
+        raise ValueError(f'Invalid playback speed: {speed}')
+
+    reader = AsciicastReader(source)
+
+    if max_idle is None:
+        max_idle = reader.header.get('idle_time_limit')
+
+    collapser = SgrCollapser() if collapse else None
+
+    start = clock()
+    elapsed = 0.0
+    previous = 0.0
+
+    for event in reader:
+        if event.code != 'o':
+            continue
+
+        gap = max(event.time - previous, 0.0)
+        previous = event.time
+
+        if max_idle is not None:
+            gap = min(gap, max_idle)
+
+        # Delays are measured from the start, so they don't add up
+        elapsed += gap
+        delay = start + elapsed / speed - clock()
+
+        if delay > 0:
+            sleep(delay)
+
+        data = event.data if collapser is None else collapser.feed(event.data)
+
+        if data:
+            output.write(data)
+            output.flush()
+
+    if collapser is not None:
+        output.write(collapser.flush())
+        output.flush()
+
+
+def final_screen(source: IO[str], width: Optional[int] = None,
+                 height: Optional[int] = None) -> TerminalEmulator:
+    reader = AsciicastReader(source)
+    emulator = TerminalEmulator(width or reader.width,
+                                height or reader.height)
+
+    for event in reader:
+        if event.code == 'o':
+            emulator.feed(event.data)
+
+    return emulator
+
+
+def render_final_screen(source: IO[str], width: Optional[int] = None,
+                        height: Optional[int] = None) -> str:
+    lines = final_screen(source, width, height).styled_lines()
+
+    while lines and not lines[-1]:
+        lines.pop()
+
+    return '\n'.join(lines)
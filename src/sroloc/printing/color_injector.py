@@ -13,26 +13,25 @@ class ColorInjector:
     color_mod: Optional[ColorModifier] = None
     text_mods: Set[TextModifier] = field(default_factory=set)
 
-    def apply(self, text: str) -> str:
+    def sgr_parameters(self) -> str:
         elements: List[str] = []
 
         if self.color_mod:
             elements.append(str(self.color_mod.value))
 
-        if self.fg_color:
-            color_code = self.color_scheme.fg_color_code(self.fg_color)
-            elements.append(color_code)
-
-        if self.bg_color:
-            color_code = self.color_scheme.bg_color_code(self.bg_color)
-            elements.append(color_code)
+        elements.extend(
+            self.color_scheme.color_codes(self.fg_color, self.bg_color)
+        )
 
-        for mod in self.text_mods:
+        for mod in sorted(self.text_mods):
             elements.append(str(mod.value))
 
-        if not elements:
-            return text
+        return ';'.join(elements)
 
-        color_sequence = ';'.join(elements)
+    def apply(self, text: str) -> str:
+        color_sequence = self.sgr_parameters()
+
+        if not color_sequence:
+            return text
 
         return f'\x1b[{color_sequence}m{text}\x1b[0m'
@@ -1,12 +1,32 @@
-from typing import Type, Dict, Union, ClassVar
+import threading
+from typing import (
+    Type, Dict, Union, ClassVar, Tuple, Any, Iterable, Mapping, Optional
+)
 
-from sroloc.color.ansi import BasicColor
-from sroloc.color.bank import ColorBank
+from sroloc.color.ansi import BasicColor, ansi_color_to_rgb
+from sroloc.color.bank import ColorBank, get_bank_version
+from sroloc.color.contrast import auto_foreground
 from sroloc.printing.color_injector import ColorInjector
 from sroloc.printing.modifiers import ColorModifier, TextModifier
 
 ModifierType = Union[ColorModifier, TextModifier]
 
+# Assigning any of these changes how specs compile
+_FORMAT_ATTRIBUTES = frozenset((
+    '_COLOR_SCHEME', 'COLOR_SPLITTER', 'COLOR_PLACEHOLDER', 'AUTO_COLOR',
+    'MODIFIER_KEYWORDS',
+))
+
+# Bumped on every change of them, per-thread prefixes compare against it
+_format_version = 0
+
+# Only taken to publish new spec tables, never to read them
+_publish_lock = threading.Lock()
+
+
+def get_format_version() -> int:
+    return _format_version
+
 
 def _get_default_modifier_keywords() -> Dict[str, ModifierType]:
     modifiers = {
@@ -29,43 +49,112 @@ def _get_default_modifier_keywords() -> Dict[str, ModifierType]:
     return modifier_keywords  # type: ignore
 
 
-class ColorSegment:
+class _ThreadPrefixes(threading.local):
+    def __init__(self) -> None:
+        self.scheme: Type[ColorBank] = BasicColor  # type: ignore
+        self.format_version = -1
+        self.bank_version = -1
+        self.prefixes: Dict[str, str] = {}
+
+
+class ColorSegmentMeta(type):
+    def __setattr__(cls, name: str, value: Any) -> None:
+        global _format_version
+
+        super().__setattr__(name, value)
+
+        if name in _FORMAT_ATTRIBUTES:
+            _format_version += 1
+
+    def __getattr__(cls, name: str) -> Any:
+        # Attribute-style shortcuts like ColorSegment.bold.red('text'), any
+        # other name is missing as usual
+        from sroloc.printing.accessors import is_style_attribute, style
+
+        if not is_style_attribute(name):
+            raise AttributeError(
+                f'type object {cls.__name__!r} has no attribute {name!r}'
+            )
+
+        return getattr(style, name)
+
+
+class ColorSegment(metaclass=ColorSegmentMeta):
     _COLOR_SCHEME: ClassVar[Type[ColorBank]] = BasicColor  # type: ignore
     COLOR_SPLITTER: ClassVar[str] = '/'
     COLOR_PLACEHOLDER: ClassVar[str] = '_'
+    AUTO_COLOR: ClassVar[str] = 'auto'
     MODIFIER_KEYWORDS: ClassVar[Dict[str, ModifierType]] = \
         _get_default_modifier_keywords()
+    SPEC_TABLE_MAX_SIZE: ClassVar[int] = 4096
+    SPEC_TABLES_KEPT: ClassVar[int] = 4
+    _SPEC_TABLES: ClassVar[Tuple[Tuple[Tuple[Any, ...], Dict[str, str]], ...]]
+    _THREAD_PREFIXES: ClassVar[_ThreadPrefixes]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._THREAD_PREFIXES = _ThreadPrefixes()
 
     def __init__(self, text: str) -> None:
         self.text = text
 
     @classmethod
-    def set_color_scheme(cls, scheme: Type[ColorBank]) -> None:  # type: ignore
+    def set_color_scheme(cls, scheme: Type[ColorBank],  # type: ignore
+                         specs: Iterable[str] = ()) -> None:
         if not issubclass(scheme, ColorBank):
             raise TypeError(
                 'Color scheme must be a subclass of ColorBank, '
                 f'not: {scheme.__name__!r}'
             )
 
+        # Specs are compiled before the swap, so the new scheme starts warm,
+        # and published at once
+        bank_version = get_bank_version()
+        table = cls._spec_table(scheme, bank_version)
+        prefixes: Dict[str, str] = {}
+
+        for spec in specs:
+            if spec in table or spec in prefixes:
+                continue
+
+            try:
+                prefixes[spec] = cls._build_prefix(spec, scheme)
+            except ValueError:
+                pass
+
+        cls._publish_prefixes(scheme, prefixes, bank_version)
+
         cls._COLOR_SCHEME = scheme
 
-    def _is_token_split(self, token: str) -> bool:
+    @classmethod
+    def _is_token_split(cls, token: str) -> bool:
         return (
-                token.count(self.COLOR_SPLITTER) == 1
-                and token[0] != self.COLOR_SPLITTER
-                and token[-1] != self.COLOR_SPLITTER
+                token.count(cls.COLOR_SPLITTER) == 1
+                and token[0] != cls.COLOR_SPLITTER
+                and token[-1] != cls.COLOR_SPLITTER
         )
 
-    def _validate_token(self, token: str) -> bool:
-        if self._is_token_split(token):
-            a, b = token.split(self.COLOR_SPLITTER)
-            return self._validate_token(a) and self._validate_token(b)
+    @classmethod
+    def _validate_token(
+            cls, token: str,
+            scheme: Optional[Type[ColorBank]] = None  # type: ignore
+    ) -> bool:
+        if scheme is None:
+            scheme = cls._COLOR_SCHEME
+
+        if cls._is_token_split(token):
+            a, b = token.split(cls.COLOR_SPLITTER)
+            return (cls._validate_token(a, scheme)
+                    and cls._validate_token(b, scheme)
+                    and b != cls.AUTO_COLOR)
 
-        return (token in self.MODIFIER_KEYWORDS
-                or self._COLOR_SCHEME.has_color(token)
-                or token == self.COLOR_PLACEHOLDER)
+        return (token in cls.MODIFIER_KEYWORDS
+                or scheme.has_color(token)
+                or token == cls.COLOR_PLACEHOLDER
+                or token == cls.AUTO_COLOR)
 
-    def _handle_modifier_token(self, modifier: ModifierType,
+    @classmethod
+    def _handle_modifier_token(cls, modifier: ModifierType,
                                injector: ColorInjector) -> None:
         if isinstance(modifier, ColorModifier):
             injector.color_mod = modifier
@@ -74,39 +163,237 @@ class ColorSegment:
         else:
             raise NotImplementedError()
 
-    def _handle_color_token(self, color: str, injector: ColorInjector) -> None:
-        if self.COLOR_SPLITTER in color:
-            fg_color, bg_color = color.split(self.COLOR_SPLITTER)
+    @classmethod
+    def _handle_color_token(cls, color: str, injector: ColorInjector) -> None:
+        if cls.COLOR_SPLITTER in color:
+            fg_color, bg_color = color.split(cls.COLOR_SPLITTER)
         else:
             fg_color = color
-            bg_color = self.COLOR_PLACEHOLDER
+            bg_color = cls.COLOR_PLACEHOLDER
 
-        if fg_color != self.COLOR_PLACEHOLDER:
+        if fg_color != cls.COLOR_PLACEHOLDER:
             injector.fg_color = fg_color
 
-        if bg_color != self.COLOR_PLACEHOLDER:
+        if bg_color != cls.COLOR_PLACEHOLDER:
             injector.bg_color = bg_color
 
-    def _handle_token(self, token: str, injector: ColorInjector) -> None:
-        if modifier := self.MODIFIER_KEYWORDS.get(token):
-            self._handle_modifier_token(modifier, injector)
+    @classmethod
+    def _handle_token(cls, token: str, injector: ColorInjector) -> None:
+        if modifier := cls.MODIFIER_KEYWORDS.get(token):
+            cls._handle_modifier_token(modifier, injector)
         else:
-            self._handle_color_token(token, injector)
+            cls._handle_color_token(token, injector)
+
+    @classmethod
+    def build_injector(
+            cls, format_spec: str,
+            scheme: Optional[Type[ColorBank]] = None  # type: ignore
+    ) -> ColorInjector:
+        if scheme is None:
+            scheme = cls._COLOR_SCHEME
 
-    def __format__(self, format_spec: str) -> str:
         tokens = format_spec.strip().split()
 
-        injector = ColorInjector(self._COLOR_SCHEME)
+        injector = ColorInjector(scheme)
 
         for token in tokens:
-            if not self._validate_token(token):
+            if not cls._validate_token(token, scheme):
                 raise ValueError(
                     f'Invalid format specifier or unknown color: {token!r}'
                 )
 
-            self._handle_token(token, injector)
+            cls._handle_token(token, injector)
+
+        if injector.fg_color == cls.AUTO_COLOR:
+            # Resolved once here, compiled specs keep the chosen color
+            injector.fg_color = (
+                auto_foreground(scheme, injector.bg_color)
+                if injector.bg_color else None
+            )
+
+        return injector
+
+    @classmethod
+    def _spec_table_key(cls, scheme: Type[ColorBank],  # type: ignore
+                        bank_version: int) -> Tuple[Any, ...]:
+        return (scheme, bank_version, cls.COLOR_SPLITTER,
+                cls.COLOR_PLACEHOLDER, cls.AUTO_COLOR, cls.MODIFIER_KEYWORDS)
+
+    @classmethod
+    def _find_spec_table(
+            cls, key: Tuple[Any, ...]
+    ) -> Optional[Dict[str, str]]:
+        for table_key, table in cls.__dict__.get('_SPEC_TABLES', ()):
+            if table_key == key:
+                return table  # type: ignore
+
+        return None
+
+    @classmethod
+    def _spec_table(
+            cls, scheme: Optional[Type[ColorBank]] = None,  # type: ignore
+            bank_version: Optional[int] = None
+    ) -> Dict[str, str]:
+        if scheme is None:
+            scheme = cls._COLOR_SCHEME
+
+        if bank_version is None:
+            bank_version = get_bank_version()
+
+        # Compiled escape prefixes are only valid for the scheme, banks and
+        # grammar they were compiled with, so each of those gets own table
+        key = cls._spec_table_key(scheme, bank_version)
+        table = cls._find_spec_table(key)
+
+        if table is None:
+            table = cls._publish_prefixes(scheme, {}, bank_version)
 
-        return injector.apply(self.text)
+        return table
+
+    @classmethod
+    def _publish_prefixes(cls, scheme: Type[ColorBank],  # type: ignore
+                          prefixes: Mapping[str, str],
+                          bank_version: Optional[int] = None
+                          ) -> Dict[str, str]:
+        if bank_version is None:
+            bank_version = get_bank_version()
+
+        key = cls._spec_table_key(scheme, bank_version)
+
+        with _publish_lock:
+            tables = cls.__dict__.get('_SPEC_TABLES', ())
+            table = cls._find_spec_table(key)
+
+            # Tables are only ever added to, and storing a single key is
+            # atomic, so readers in any thread need no lock
+            if (table is not None
+                    and len(table) + len(prefixes) <= cls.SPEC_TABLE_MAX_SIZE):
+                table.update(prefixes)
+                return table
+
+            table = dict(prefixes)
+
+            kept = tuple(
+                (table_key, old) for table_key, old in tables
+                if table_key != key
+            )[:cls.SPEC_TABLES_KEPT - 1]
+            cls._SPEC_TABLES = ((key, table),) + kept
+
+        return table
+
+    @classmethod
+    def _build_prefix(cls, format_spec: str,
+                      scheme: Type[ColorBank]) -> str:  # type: ignore
+        parameters = cls.build_injector(format_spec, scheme).sgr_parameters()
+        return f'\x1b[{parameters}m' if parameters else ''
+
+    @classmethod
+    def _compile_spec(cls, format_spec: str,
+                      scheme: Type[ColorBank],  # type: ignore
+                      table: Dict[str, str],
+                      bank_version: Optional[int] = None) -> str:
+        try:
+            return table[format_spec]
+        except KeyError:
+            pass
+
+        prefix = cls._build_prefix(format_spec, scheme)
+        cls._publish_prefixes(scheme, {format_spec: prefix}, bank_version)
+
+        return prefix
+
+    @classmethod
+    def compile_spec(cls, format_spec: str) -> str:
+        # The scheme is read once, a concurrent swap can't mix two schemes
+        scheme = cls._COLOR_SCHEME
+        bank_version = get_bank_version()
+        table = cls._spec_table(scheme, bank_version)
+
+        return cls._compile_spec(format_spec, scheme, table, bank_version)
+
+    @classmethod
+    def _thread_prefix(cls, local: _ThreadPrefixes, format_spec: str) -> str:
+        scheme = local.scheme
+        table = cls._spec_table(scheme, local.bank_version)
+        prefix = cls._compile_spec(format_spec, scheme, table,
+                                   local.bank_version)
+
+        if len(local.prefixes) >= cls.SPEC_TABLE_MAX_SIZE:
+            local.prefixes = {}
+
+        local.prefixes[format_spec] = prefix
+
+        return prefix
+
+    def __format__(self, format_spec: str) -> str:
+        # Only this thread's own prefixes are read here, shared state is
+        # checked through two version numbers
+        local = self._THREAD_PREFIXES
+        format_version = _format_version
+        bank_version = get_bank_version()
+
+        if (local.format_version != format_version
+                or local.bank_version != bank_version):
+            # One snapshot for all of them, prefixes are compiled and cached
+            # with it only, even if the scheme changes meanwhile
+            local.prefixes = {}
+            local.scheme = self._COLOR_SCHEME
+            local.format_version = format_version
+            local.bank_version = bank_version
+
+        prefix = local.prefixes.get(format_spec)
+
+        if prefix is None:
+            prefix = self._thread_prefix(local, format_spec)
+
+        return f'{prefix}{self.text}\x1b[0m' if prefix else self.text
 
     def __str__(self) -> str:
         return self.text
+
+
+ColorSegment._THREAD_PREFIXES = _ThreadPrefixes()
+
+
+def _fallback_spec(spec: str) -> str:
+    scheme = ColorSegment._COLOR_SCHEME
+    splitter = ColorSegment.COLOR_SPLITTER
+    tokens = []
+
+    # Basic colors the scheme lacks are replaced with their usual RGB values
+    for token in spec.split():
+        tokens.append(splitter.join(
+            color if scheme.has_color(color) or not BasicColor.has_color(color)
+            else ansi_color_to_rgb(BasicColor.get_color(color)).as_hex()
+            for color in token.split(splitter)
+        ))
+
+    return ' '.join(tokens)
+
+
+def compile_styles(defaults: Mapping[str, str],
+                   styles: Optional[Mapping[str, str]] = None
+                   ) -> Dict[str, str]:
+    prefixes: Dict[str, str] = {}
+
+    for kind, default_spec in defaults.items():
+        spec = default_spec
+        if styles is not None:
+            spec = styles.get(kind, default_spec)
+
+        try:
+            prefixes[kind] = ColorSegment.compile_spec(spec)
+        except ValueError:
+            if spec != default_spec:
+                raise
+
+            # Default styles degrade to plain text on schemes that can't
+            # show their colors at all
+            try:
+                prefixes[kind] = ColorSegment.compile_spec(
+                    _fallback_spec(spec)
+                )
+            except ValueError:
+                prefixes[kind] = ''
+
+    return prefixes
@@ -0,0 +1,442 @@
+import codecs
+import re
+from collections import deque
+from difflib import SequenceMatcher
+from itertools import islice
+from typing import (
+    IO, Any, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple,
+    Union
+)
+
+from sroloc.printing.color_segment import compile_styles
+from sroloc.printing.sgr import RESET_SEQUENCE
+
+DEFAULT_DIFF_STYLES: Dict[str, str] = {
+    'header': 'b',
+    'hunk': 'cyan',
+    'context': '',
+    'removed': 'red',
+    'added': 'green',
+    'removed_word': 'rv red',
+    'added_word': 'rv green',
+}
+
+_HEADER_PREFIXES = (
+    'diff ', 'index ', '--- ', '+++ ', 'new file', 'deleted file',
+    'old mode', 'new mode', 'similarity', 'rename ', 'Binary files',
+)
+
+_HUNK_HEADER_REGEX = re.compile(
+    r'@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@'
+)
+_WORD_REGEX = re.compile(r'\w+|\s+|[^\w\s]')
+
+_NO_NEWLINE = '\\ No newline at end of file\n'
+
+Segments = List[Tuple[bool, str]]  # Changed flag and text
+Op = Tuple[str, List[str], List[str]]  # Like difflib opcodes, with lines
+
+
+class DiffRenderer:
+    # Words are highlighted only in lines this similar, otherwise it's noise
+    MIN_SIMILARITY: float = 0.5
+
+    def __init__(self, styles: Optional[Mapping[str, str]] = None,
+                 max_cost: int = 1_000_000,
+                 max_block_lines: int = 1000) -> None:
+        self._prefixes = compile_styles(DEFAULT_DIFF_STYLES, styles)
+        self.max_cost = max_cost
+        self.max_block_lines = max_block_lines
+
+        self._pending = ''
+        self._old_remaining = 0
+        self._new_remaining = 0
+        self._removed: List[str] = []
+        self._added: List[str] = []
+        self._cost = 0
+
+    def _emit(self, output: List[str], kind: str, text: str) -> None:
+        prefix = self._prefixes[kind]
+
+        if prefix and text:
+            output.append(f'{prefix}{text}{RESET_SEQUENCE}\n')
+        else:
+            output.append(f'{text}\n')
+
+    def _emit_segments(self, output: List[str], kind: str, sign: str,
+                       segments: Segments) -> None:
+        prefixes = (self._prefixes[kind], self._prefixes[f'{kind}_word'])
+        runs: List[Tuple[bool, List[str]]] = [(False, [sign])]
+
+        for changed, text in segments:
+            if runs[-1][0] == changed:
+                runs[-1][1].append(text)
+            else:
+                runs.append((changed, [text]))
+
+        for changed, parts in runs:
+            prefix = prefixes[changed]
+            text = ''.join(parts)
+            output.append(
+                f'{prefix}{text}{RESET_SEQUENCE}' if prefix else text
+            )
+
+        output.append('\n')
+
+    def _highlight(self, old: str,
+                   new: str) -> Optional[Tuple[Segments, Segments]]:
+        a = _WORD_REGEX.findall(old)
+        b = _WORD_REGEX.findall(new)
+
+        # Matching words is quadratic, so every hunk gets a fixed budget
+        cost = len(a) * len(b)
+        if self._cost + cost > self.max_cost:
+            return None
+
+        self._cost += cost
+
+        matcher = SequenceMatcher(None, a, b, autojunk=False)
+        if matcher.ratio() < self.MIN_SIMILARITY:
+            return None
+
+        old_segments: Segments = []
+        new_segments: Segments = []
+
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            changed = tag != 'equal'
+
+            if i1 < i2:
+                old_segments.append((changed, ''.join(a[i1:i2])))
+
+            if j1 < j2:
+                new_segments.append((changed, ''.join(b[j1:j2])))
+
+        return old_segments, new_segments
+
+    def _flush_block(self, output: List[str]) -> None:
+        removed, added = self._removed, self._added
+
+        if not removed and not added:
+            return
+
+        highlights = [
+            self._highlight(old[1:], new[1:])
+            for old, new in zip(removed, added)
+        ]
+
+        for i, line in enumerate(removed):
+            highlight = highlights[i] if i < len(highlights) else None
+
+            if highlight is None:
+                self._emit(output, 'removed', line)
+            else:
+                self._emit_segments(output, 'removed', '-', highlight[0])
+
+        for i, line in enumerate(added):
+            highlight = highlights[i] if i < len(highlights) else None
+
+            if highlight is None:
+                self._emit(output, 'added', line)
+            else:
+                self._emit_segments(output, 'added', '+', highlight[1])
+
+        self._removed = []
+        self._added = []
+
+    def _handle_hunk_line(self, output: List[str], line: str) -> None:
+        tag = line[:1]
+
+        if tag == '-':
+            if self._added:
+                self._flush_block(output)
+
+            self._removed.append(line)
+            self._old_remaining -= 1
+        elif tag == '+':
+            self._added.append(line)
+            self._new_remaining -= 1
+        else:
+            self._flush_block(output)
+
+            if tag != '\\':
+                self._old_remaining -= 1
+                self._new_remaining -= 1
+
+            self._emit(output, 'context', line)
+
+        if len(self._removed) + len(self._added) >= self.max_block_lines:
+            self._flush_block(output)
+
+        if self._old_remaining <= 0 and self._new_remaining <= 0:
+            self._flush_block(output)
+
+    def _handle_line(self, output: List[str], line: str) -> None:
+        if self._old_remaining > 0 or self._new_remaining > 0:
+            if line[:1] in ('-', '+', ' ', '\\', ''):
+                self._handle_hunk_line(output, line)
+                return
+
+            # Hunk ended early, the diff is probably truncated
+            self._flush_block(output)
+            self._old_remaining = self._new_remaining = 0
+
+        if line.startswith('\\'):
+            self._emit(output, 'context', line)
+        elif match := _HUNK_HEADER_REGEX.match(line):
+            old_count, new_count = match.group(2), match.group(4)
+            self._old_remaining = 1 if old_count is None else int(old_count)
+            self._new_remaining = 1 if new_count is None else int(new_count)
+            self._cost = 0
+
+            self._emit(output, 'hunk', line)
+        elif line.startswith(_HEADER_PREFIXES):
+            self._emit(output, 'header', line)
+        else:
+            self._emit(output, 'context', line)
+
+    def feed(self, chunk: str) -> str:
+        data = self._pending + chunk
+        lines = data.split('\n')
+        self._pending = lines.pop()
+
+        output: List[str] = []
+
+        for line in lines:
+            self._handle_line(output, line)
+
+        return ''.join(output)
+
+    def close(self) -> str:
+        output: List[str] = []
+
+        if self._pending:
+            self._handle_line(output, self._pending)
+            self._pending = ''
+            self._flush_block(output)
+
+            # Last line had no newline, so neither does its output
+            if output and output[-1].endswith('\n'):
+                output[-1] = output[-1][:-1]
+
+        self._flush_block(output)
+        self._old_remaining = self._new_remaining = 0
+
+        return ''.join(output)
+
+    def render_stream(self, stream: Union[IO[str], IO[bytes]],
+                      chunk_size: int = 64 * 1024) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+
+        while chunk := stream.read(chunk_size):
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk)
+
+            if output := self.feed(chunk):
+                yield output
+
+        output = self.feed(decoder.decode(b'', final=True)) + self.close()
+        if output:
+            yield output
+
+    def render_files(self, a: Iterable[str], b: Iterable[str],
+                     fromfile: str = 'a', tofile: str = 'b', n: int = 3,
+                     batch_lines: int = 1024) -> Iterator[str]:
+        lines = unified_diff_streams(a, b, fromfile, tofile, n)
+
+        while batch := list(islice(lines, batch_lines)):
+            if output := self.feed(''.join(batch)):
+                yield output
+
+        if output := self.close():
+            yield output
+
+
+def _diff_ops(a: Iterable[str], b: Iterable[str],
+              window: int) -> Iterator[Op]:
+    a_lines, b_lines = iter(a), iter(b)
+    a_buffer: List[str] = []
+    b_buffer: List[str] = []
+    a_done = b_done = False
+
+    while True:
+        if not a_done and len(a_buffer) < window:
+            needed = window - len(a_buffer)
+            a_buffer.extend(islice(a_lines, needed))
+            a_done = len(a_buffer) < window
+
+        if not b_done and len(b_buffer) < window:
+            needed = window - len(b_buffer)
+            b_buffer.extend(islice(b_lines, needed))
+            b_done = len(b_buffer) < window
+
+        if not a_buffer and not b_buffer:
+            return
+
+        common = 0
+        for old, new in zip(a_buffer, b_buffer):
+            if old != new:
+                break
+            common += 1
+
+        if common:
+            yield 'equal', a_buffer[:common], b_buffer[:common]
+            del a_buffer[:common], b_buffer[:common]
+            continue
+
+        opcodes = SequenceMatcher(
+            None, a_buffer, b_buffer, autojunk=False
+        ).get_opcodes()
+
+        if not (a_done and b_done):
+            # Changes after the last common block might continue past the
+            # window, so they're diffed again with the next lines
+            anchors = [i for i, op in enumerate(opcodes) if op[0] == 'equal']
+
+            if anchors:
+                opcodes = opcodes[:anchors[-1] + 1]
+
+        for tag, i1, i2, j1, j2 in opcodes:
+            yield tag, a_buffer[i1:i2], b_buffer[j1:j2]
+
+        del a_buffer[:opcodes[-1][2]], b_buffer[:opcodes[-1][4]]
+
+
+def _format_range(start: int, count: int) -> str:
+    if count == 1:
+        return str(start)
+
+    if not count:
+        start -= 1
+
+    return f'{start},{count}'
+
+
+def _diff_line(sign: str, line: str) -> str:
+    if line.endswith('\n'):
+        return f'{sign}{line}'
+
+    return f'{sign}{line}\n{_NO_NEWLINE}'
+
+
+class _HunkWriter:
+    def __init__(self, fromfile: str, tofile: str, n: int,
+                 max_hunk_lines: int) -> None:
+        self.header = f'--- {fromfile}\n+++ {tofile}\n'
+        self.n = n
+        self.max_hunk_lines = max_hunk_lines
+
+        self.a_line = self.b_line = 1
+        self.before: Deque[str] = deque(maxlen=n)
+
+        self.lines: Optional[List[str]] = None
+        self.a_start = self.b_start = 0
+        self.a_count = self.b_count = 0
+        self.trailing = 0
+        self.gap = 0
+
+    def _open(self) -> None:
+        self.lines = [_diff_line(' ', line) for line in self.before]
+        self.a_start = self.a_line - len(self.before)
+        self.b_start = self.b_line - len(self.before)
+        self.a_count = self.b_count = len(self.before)
+        self.trailing = self.gap = 0
+
+    def _close(self) -> Iterator[str]:
+        if self.lines is None:
+            return
+
+        if self.header:
+            yield self.header
+            self.header = ''
+
+        yield (
+            f'@@ -{_format_range(self.a_start, self.a_count)} '
+            f'+{_format_range(self.b_start, self.b_count)} @@\n'
+        )
+        yield from self.lines
+
+        self.lines = None
+
+    def _equal(self, lines: List[str]) -> Iterator[str]:
+        position = 0
+
+        # Only a few lines after a change can end up in its hunk
+        while self.lines is not None and position < len(lines):
+            line = lines[position]
+            position += 1
+
+            if self.trailing < self.n:
+                self.lines.append(_diff_line(' ', line))
+                self.a_count += 1
+                self.b_count += 1
+                self.trailing += 1
+            else:
+                self.before.append(line)
+                self.gap += 1
+
+                if self.gap > self.n:
+                    yield from self._close()
+
+        # And only the last few ones before the next change
+        if position < len(lines):
+            self.before.extend(lines[max(position, len(lines) - self.n):])
+
+        self.a_line += len(lines)
+        self.b_line += len(lines)
+
+    def feed(self, op: Op) -> Iterator[str]:
+        tag, a_lines, b_lines = op
+
+        if tag == 'equal':
+            yield from self._equal(a_lines)
+            return
+
+        if self.lines is None:
+            self._open()
+        else:
+            # Lines between two close changes join them into one hunk
+            for line in self.before:
+                self.lines.append(_diff_line(' ', line))  # type: ignore
+
+            self.a_count += len(self.before)
+            self.b_count += len(self.before)
+
+        self.before.clear()
+        self.trailing = self.gap = 0
+
+        for sign, lines in (('-', a_lines), ('+', b_lines)):
+            for line in lines:
+                if len(self.lines) >= self.max_hunk_lines:  # type: ignore
+                    # Huge changes are split, so memory stays bounded
+                    yield from self._close()
+                    self._open()
+
+                self.lines.append(_diff_line(sign, line))  # type: ignore
+
+                if sign == '-':
+                    self.a_line += 1
+                    self.a_count += 1
+                else:
+                    self.b_line += 1
+                    self.b_count += 1
+
+    def close(self) -> Iterator[str]:
+        yield from self._close()
+
+
+def unified_diff_streams(a: Iterable[str], b: Iterable[str],
+                         fromfile: str = 'a', tofile: str = 'b',
+                         n: int = 3, window: int = 1000,
+                         max_hunk_lines: int = 10_000) -> Iterator[str]:
+    writer = _HunkWriter(fromfile, tofile, n, max_hunk_lines)
+
+    for op in _diff_ops(a, b, window):
+        yield from writer.feed(op)
+
+    yield from writer.close()
+
+
+def colorize_diff(text: str, styles: Optional[Mapping[str, str]] = None,
+                  **options: Any) -> str:
+    renderer = DiffRenderer(styles, **options)
+    return renderer.feed(text) + renderer.close()
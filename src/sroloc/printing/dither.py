@@ -0,0 +1,356 @@
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from sroloc.color.ansi import (
+    ANSIColor, ExtendedColor, ansi_color_to_rgb, nearest_ansi_color
+)
+from sroloc.color.bank import get_bank_version
+from sroloc.printing.sgr import RESET_SEQUENCE
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+DITHER_METHODS = ('none', 'bayer', 'floyd_steinberg')
+
+# Nearest colors are looked up with 5 bits per channel
+_BITS = 5
+_SHIFT = 8 - _BITS
+
+_CUBE_AND_GRAYS = list(range(16, 256))
+
+Rgb = Tuple[int, int, int]
+
+
+def _bayer_matrix(size: int) -> List[List[int]]:
+    matrix = [[0]]
+
+    while len(matrix) < size:
+        n = len(matrix)
+        matrix = [
+            [4 * matrix[y % n][x % n] + (0, 2, 3, 1)[2 * (y // n) + x // n]
+             for x in range(2 * n)]
+            for y in range(2 * n)
+        ]
+
+    return matrix
+
+
+# Thresholds centered around 0, in the range (-0.5, 0.5)
+BAYER_THRESHOLDS = [
+    [(value + 0.5) / 64 - 0.5 for value in row]
+    for row in _bayer_matrix(8)
+]
+
+
+def _key(r: int, g: int, b: int) -> int:
+    return (r >> _SHIFT) << (2 * _BITS) | (g >> _SHIFT) << _BITS | b >> _SHIFT
+
+
+def _clip(value: float) -> int:
+    return 0 if value < 0 else 255 if value > 255 else int(value + 0.5)
+
+
+class DitherPalette:
+    def __init__(self, scheme: Type[ANSIColor]) -> None:
+        indices = sorted(set(scheme._flat_bank().values()))
+
+        if scheme._BITS_PER_COLOR == 3:
+            indices = [i for i in indices if i < 8]
+        else:
+            # System colors depend on the terminal's theme, like in
+            # nearest_ansi_color only the fixed ones are used when present
+            indices = [i for i in indices if i >= 16] or indices
+
+        if not indices:
+            raise ValueError(f'No colors to dither with in {scheme.__name__}')
+
+        self.indices = indices
+        self.colors: List[Rgb] = [
+            tuple(ansi_color_to_rgb(i)) for i in indices  # type: ignore
+        ]
+
+        # Roughly the distance between neighboring colors of one channel
+        self.spread = 256 / max(round(len(indices) ** (1 / 3)), 1)
+
+        self._standard = indices == _CUBE_AND_GRAYS and \
+            scheme._BITS_PER_COLOR == 8
+        self._lut: List[int] = [-1] * (1 << (3 * _BITS))
+        self._lut_array: Any = None
+
+    def _search(self, key: int) -> int:
+        mask = (1 << _BITS) - 1
+        center = 1 << (_SHIFT - 1)
+
+        r = (key >> (2 * _BITS) << _SHIFT) + center
+        g = ((key >> _BITS & mask) << _SHIFT) + center
+        b = ((key & mask) << _SHIFT) + center
+
+        if self._standard:
+            return nearest_ansi_color((r, g, b)) - 16
+
+        return min(
+            range(len(self.colors)),
+            key=lambda i: (
+                (self.colors[i][0] - r) ** 2 + (self.colors[i][1] - g) ** 2
+                + (self.colors[i][2] - b) ** 2
+            )
+        )
+
+    def nearest(self, r: int, g: int, b: int) -> int:
+        key = _key(r, g, b)
+        position = self._lut[key]
+
+        # Filled in lazily, most images touch a small part of the table
+        if position < 0:
+            position = self._search(key)
+            self._lut[key] = position
+
+        return position
+
+    def lut_array(self) -> Any:
+        if self._lut_array is None and self._standard:
+            # Same choices as the pure Python path, ties included
+            self._lut_array = numpy.array(
+                [self._search(key) for key in range(1 << (3 * _BITS))],
+                dtype=numpy.intp
+            )
+
+        if self._lut_array is None:
+            keys = numpy.arange(1 << (3 * _BITS))
+            mask = (1 << _BITS) - 1
+            center = 1 << (_SHIFT - 1)
+
+            rgb = numpy.stack([
+                ((keys >> (2 * _BITS)) << _SHIFT) + center,
+                ((keys >> _BITS & mask) << _SHIFT) + center,
+                ((keys & mask) << _SHIFT) + center,
+            ], axis=1).astype(numpy.int32)
+            colors = numpy.array(self.colors, dtype=numpy.int32)
+
+            lut = numpy.empty(len(keys), dtype=numpy.intp)
+            for start in range(0, len(keys), 4096):
+                chunk = rgb[start:start + 4096, None, :] - colors[None]
+                distances = (chunk * chunk).sum(axis=2)
+                lut[start:start + 4096] = distances.argmin(axis=1)
+
+            self._lut_array = lut
+
+        return self._lut_array
+
+    def lookup_array(self, pixels: Any) -> Any:
+        pixels = pixels.astype(numpy.intp) >> _SHIFT
+        keys = (
+            pixels[..., 0] << (2 * _BITS) | pixels[..., 1] << _BITS
+            | pixels[..., 2]
+        )
+
+        return self.lut_array()[keys]
+
+
+def dither_palette(
+        scheme: Type[ANSIColor] = ExtendedColor
+) -> DitherPalette:
+    version = get_bank_version()
+    cached = scheme.__dict__.get('_DITHER_PALETTE')
+
+    if cached is None or cached[0] != version:
+        cached = (version, DitherPalette(scheme))
+        type.__setattr__(scheme, '_DITHER_PALETTE', cached)
+
+    return cached[1]  # type: ignore
+
+
+def _rows(pixels: Sequence[Sequence[Any]]) -> List[List[Rgb]]:
+    return [[(r, g, b) for r, g, b, *_ in row] for row in pixels]
+
+
+def _nearest_rows(rows: List[List[Rgb]],
+                  palette: DitherPalette) -> List[List[int]]:
+    nearest = palette.nearest
+    return [[nearest(r, g, b) for r, g, b in row] for row in rows]
+
+
+def _bayer_rows(rows: List[List[Rgb]], palette: DitherPalette,
+                spread: float) -> List[List[int]]:
+    nearest = palette.nearest
+    result = []
+
+    for y, row in enumerate(rows):
+        offsets = [t * spread for t in BAYER_THRESHOLDS[y % 8]]
+        result.append([
+            nearest(_clip(r + o), _clip(g + o), _clip(b + o))
+            for (r, g, b), o in zip(row, offsets * (len(row) // 8 + 1))
+        ])
+
+    return result
+
+
+def _floyd_steinberg_rows(rows: List[List[Rgb]],
+                          palette: DitherPalette) -> List[List[int]]:
+    nearest = palette.nearest
+    colors = palette.colors
+    width = max(map(len, rows), default=0)
+    result = []
+
+    # Errors of the next row, padded by one cell on both sides
+    below = [[0.0] * (width + 2) for _ in range(3)]
+
+    for row in rows:
+        current, below = below, [[0.0] * (width + 2) for _ in range(3)]
+        er, eg, eb = current
+        nr, ng, nb = below
+        positions = []
+
+        for x, (r, g, b) in enumerate(row, 1):
+            r = _clip(r + er[x])
+            g = _clip(g + eg[x])
+            b = _clip(b + eb[x])
+
+            position = nearest(r, g, b)
+            positions.append(position)
+
+            pr, pg, pb = colors[position]
+
+            # Unrolled per channel, this loop runs once per cell
+            error = (r - pr) / 16
+            if error:
+                er[x + 1] += 7 * error
+                nr[x - 1] += 3 * error
+                nr[x] += 5 * error
+                nr[x + 1] += error
+
+            error = (g - pg) / 16
+            if error:
+                eg[x + 1] += 7 * error
+                ng[x - 1] += 3 * error
+                ng[x] += 5 * error
+                ng[x + 1] += error
+
+            error = (b - pb) / 16
+            if error:
+                eb[x + 1] += 7 * error
+                nb[x - 1] += 3 * error
+                nb[x] += 5 * error
+                nb[x + 1] += error
+
+        result.append(positions)
+
+    return result
+
+
+def _bayer_array(pixels: Any, palette: DitherPalette, spread: float) -> Any:
+    height, width = pixels.shape[:2]
+    thresholds = numpy.array(BAYER_THRESHOLDS) * spread
+
+    tiled = numpy.tile(thresholds, (height // 8 + 1, width // 8 + 1))
+    offsets = tiled[:height, :width, None]
+
+    dithered = numpy.clip(pixels + offsets + 0.5, 0, 255)
+
+    return palette.lookup_array(dithered)
+
+
+def _floyd_steinberg_array(pixels: Any, palette: DitherPalette) -> Any:
+    height, width = pixels.shape[:2]
+    colors = numpy.array(palette.colors, dtype=numpy.float64)
+    lut = palette.lut_array()
+
+    errors = numpy.zeros((height + 1, width + 2, 3))
+    result = numpy.empty((height, width), dtype=numpy.intp)
+
+    # Pixel (y, x) needs errors from (y, x - 1) and (y - 1, x + 1), so all
+    # pixels with the same x + 2y are independent and handled at once
+    rows = numpy.arange(height)
+
+    for step in range(width + 2 * (height - 1)):
+        xs = step - 2 * rows
+        active = (xs >= 0) & (xs < width)
+        ys, xs = rows[active], xs[active]
+
+        values = numpy.clip(pixels[ys, xs] + errors[ys, xs + 1] + 0.5, 0, 255)
+        values = numpy.floor(values)
+
+        quantized = values.astype(numpy.intp) >> _SHIFT
+        positions = lut[
+            quantized[:, 0] << (2 * _BITS) | quantized[:, 1] << _BITS
+            | quantized[:, 2]
+        ]
+        result[ys, xs] = positions
+
+        error = values - colors[positions]
+        errors[ys, xs + 2] += error * (7 / 16)
+        errors[ys + 1, xs] += error * (3 / 16)
+        errors[ys + 1, xs + 1] += error * (5 / 16)
+        errors[ys + 1, xs + 2] += error * (1 / 16)
+
+    return result
+
+
+def dither(pixels: Any, scheme: Type[ANSIColor] = ExtendedColor,
+           method: str = 'floyd_steinberg',
+           spread: Optional[float] = None) -> Any:
+    if method not in DITHER_METHODS:
+        raise ValueError(f'Unknown dithering method: {method!r}')
+
+    palette = dither_palette(scheme)
+    indices = numpy.array(palette.indices) if numpy is not None else None
+
+    if spread is None:
+        spread = palette.spread
+
+    # (height, width, 3) arrays of RGB values are dithered all at once
+    if numpy is not None and isinstance(pixels, numpy.ndarray):
+        pixels = pixels[..., :3].astype(numpy.float64)
+
+        if method == 'bayer':
+            positions = _bayer_array(pixels, palette, spread)
+        elif method == 'floyd_steinberg':
+            positions = _floyd_steinberg_array(pixels, palette)
+        else:
+            positions = palette.lookup_array(pixels)
+
+        return indices[positions]
+
+    rows = _rows(pixels)
+
+    if method == 'bayer':
+        positions = _bayer_rows(rows, palette, spread)
+    elif method == 'floyd_steinberg':
+        positions = _floyd_steinberg_rows(rows, palette)
+    else:
+        positions = _nearest_rows(rows, palette)
+
+    return [[palette.indices[p] for p in row] for row in positions]
+
+
+def render_cells(indices: Any, scheme: Type[ANSIColor] = ExtendedColor,
+                 text: str = ' ', background: bool = True) -> List[str]:
+    if numpy is not None and isinstance(indices, numpy.ndarray):
+        indices = indices.tolist()
+
+    layer = 4 if background else 3
+    prefix = f'{layer}8;5;' if scheme._BITS_PER_COLOR == 8 else str(layer)
+
+    lines = []
+
+    for row in indices:
+        parts = []
+        cells: List[Optional[int]] = [*row, None]
+        previous: Optional[int] = None
+        run = 0
+
+        # Runs of one color share a single escape sequence
+        for index in cells:
+            if index == previous:
+                run += 1
+                continue
+
+            if previous is not None:
+                parts.append(f'\x1b[{prefix}{previous}m{text * run}')
+
+            previous, run = index, 1
+
+        lines.append(''.join(parts) + (RESET_SEQUENCE if parts else ''))
+
+    return lines
@@ -0,0 +1,299 @@
+import re
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sroloc.printing.sgr import EscapeStreamBuffer, RESET_SEQUENCE, SgrState
+
+_TOKEN_REGEX = re.compile(
+    r'\x1b\[(?P<parameters>[0-?]*)[ -/]*(?P<final>[@-~])'
+    r'|(?P<text>[^\x00-\x1f\x7f]+)'
+    r'|(?P<control>[\x00-\x1f\x7f])'
+)
+
+_BLANK = ord(' ')
+_TAB_SIZE = 8
+_MAX_TRANSITIONS = 4096
+
+StyleKey = Tuple[Optional[str], Optional[str], Tuple[int, ...]]
+
+
+class Cell(NamedTuple):
+    char: str
+    fg: Optional[str]
+    bg: Optional[str]
+    attrs: Tuple[int, ...]
+
+
+def _parse_numbers(parameters: str, default: int) -> List[int]:
+    numbers = []
+
+    for parameter in parameters.split(';'):
+        try:
+            numbers.append(int(parameter) if parameter else default)
+        except ValueError:
+            numbers.append(default)
+
+    return numbers
+
+
+class TerminalEmulator:
+    def __init__(self, width: int = 80, height: int = 24) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError(f'Invalid terminal size: {width}x{height}')
+
+        self.width = width
+        self.height = height
+
+        self._chars = array('I', [_BLANK]) * (width * height)
+        self._styles = array('H', [0]) * (width * height)
+
+        self._style_keys: List[StyleKey] = [(None, None, ())]
+        self._style_ids: Dict[StyleKey, int] = {(None, None, ()): 0}
+        self._transitions: Dict[Tuple[int, str], int] = {}
+
+        self._state = SgrState()
+        self._style_id = 0
+        self._buffer = EscapeStreamBuffer()
+
+        self.x = 0
+        self.y = 0
+        self._pending_wrap = False
+
+        self.bytes_fed = 0
+        self.cells_written = 0
+        self.escape_sequences = 0
+
+    @property
+    def bytes_per_cell(self) -> float:
+        return self.bytes_fed / self.cells_written if self.cells_written else 0
+
+    def _update_style(self) -> None:
+        state = self._state
+        key = (state.fg, state.bg, tuple(sorted(state.attrs)))
+
+        style_id = self._style_ids.get(key)
+        if style_id is None:
+            style_id = self._style_ids[key] = len(self._style_keys)
+            self._style_keys.append(key)
+
+        self._style_id = style_id
+
+    def _scroll(self) -> None:
+        width = self.width
+
+        del self._chars[:width]
+        del self._styles[:width]
+        self._chars.extend(array('I', [_BLANK]) * width)
+        self._styles.extend(array('H', [0]) * width)
+
+    def _line_feed(self) -> None:
+        if self.y + 1 < self.height:
+            self.y += 1
+        else:
+            self._scroll()
+
+    def _move_to(self, x: int, y: int) -> None:
+        self.x = min(max(x, 0), self.width - 1)
+        self.y = min(max(y, 0), self.height - 1)
+        self._pending_wrap = False
+
+    def _erase(self, start: int, end: int) -> None:
+        if start < end:
+            self._chars[start:end] = array('I', [_BLANK]) * (end - start)
+            self._styles[start:end] = array('H', [0]) * (end - start)
+
+    def _write_text(self, text: str) -> None:
+        width = self.width
+        style_id = self._style_id
+        position = 0
+
+        while position < len(text):
+            if self._pending_wrap:
+                self.x = 0
+                self._line_feed()
+                self._pending_wrap = False
+
+            run = text[position:position + width - self.x]
+            offset = self.y * width + self.x
+
+            self._chars[offset:offset + len(run)] = array('I', map(ord, run))
+            self._styles[offset:offset + len(run)] = \
+                array('H', [style_id]) * len(run)
+
+            position += len(run)
+            self.x += len(run)
+
+            # Cursor stays on the last column until the next character
+            if self.x >= width:
+                self.x = width - 1
+                self._pending_wrap = True
+
+        self.cells_written += len(text)
+
+    def _handle_control(self, char: str) -> None:
+        if char == '\n':
+            # Output is assumed to go through a tty translating LF to CRLF
+            self.x = 0
+            self._pending_wrap = False
+            self._line_feed()
+        elif char == '\r':
+            self._move_to(0, self.y)
+        elif char == '\b':
+            self._move_to(self.x - 1, self.y)
+        elif char == '\t':
+            self._move_to((self.x // _TAB_SIZE + 1) * _TAB_SIZE, self.y)
+
+    def _handle_escape(self, parameters: str, final: str) -> None:
+        self.escape_sequences += 1
+
+        if final == 'm':
+            key = (self._style_id, parameters)
+            style_id = self._transitions.get(key)
+
+            if style_id is None:
+                # The state is only rebuilt when the transition is new
+                state = self._state
+                state.fg, state.bg, attrs = self._style_keys[self._style_id]
+                state.attrs = set(attrs)
+                state.apply(parameters)
+                self._update_style()
+
+                if len(self._transitions) >= _MAX_TRANSITIONS:
+                    self._transitions.clear()
+
+                self._transitions[key] = self._style_id
+            else:
+                self._style_id = style_id
+
+            return
+
+        numbers = _parse_numbers(parameters, 0)
+        count = max(numbers[0], 1)
+
+        if final in 'Hf':
+            row, column = (_parse_numbers(parameters, 1) + [1, 1])[:2]
+            self._move_to(column - 1, row - 1)
+        elif final == 'A':
+            self._move_to(self.x, self.y - count)
+        elif final == 'B':
+            self._move_to(self.x, self.y + count)
+        elif final == 'C':
+            self._move_to(self.x + count, self.y)
+        elif final == 'D':
+            self._move_to(self.x - count, self.y)
+        elif final == 'G':
+            self._move_to(count - 1, self.y)
+        elif final == 'J':
+            cursor = self.y * self.width + self.x
+            start, end = {
+                0: (cursor, len(self._chars)),
+                1: (0, cursor + 1),
+            }.get(numbers[0], (0, len(self._chars)))
+            self._erase(start, end)
+        elif final == 'K':
+            line = self.y * self.width
+            cursor = line + self.x
+            start, end = {
+                0: (cursor, line + self.width),
+                1: (line, cursor + 1),
+            }.get(numbers[0], (line, line + self.width))
+            self._erase(start, end)
+
+    def feed(self, data: str) -> None:
+        self.bytes_fed += len(data.encode())
+
+        for match in _TOKEN_REGEX.finditer(self._buffer.feed(data)):
+            kind = match.lastgroup
+
+            if kind == 'text':
+                self._write_text(match.group())
+            elif kind == 'control':
+                self._handle_control(match.group())
+            else:
+                self._handle_escape(*match.group('parameters', 'final'))
+
+    def cell(self, x: int, y: int) -> Cell:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f'Cell ({x}, {y}) is out of the screen')
+
+        offset = y * self.width + x
+        fg, bg, attrs = self._style_keys[self._styles[offset]]
+
+        return Cell(chr(self._chars[offset]), fg, bg, attrs)
+
+    def row(self, y: int) -> List[Cell]:
+        return [self.cell(x, y) for x in range(self.width)]
+
+    def cells(self) -> List[List[Cell]]:
+        return [self.row(y) for y in range(self.height)]
+
+    @property
+    def visible_cells(self) -> int:
+        return sum(
+            1 for char, style in zip(self._chars, self._styles)
+            if char != _BLANK or self._style_keys[style][1] is not None
+            or 7 in self._style_keys[style][2]
+        )
+
+    def lines(self) -> List[str]:
+        width = self.width
+
+        return [
+            ''.join(map(chr, self._chars[y * width:(y + 1) * width]))
+            for y in range(self.height)
+        ]
+
+    def _style_sequence(self, style_id: int) -> str:
+        state = SgrState()
+        state.fg, state.bg, attrs = self._style_keys[style_id]
+        state.attrs = set(attrs)
+
+        return state.sequence()
+
+    def styled_lines(self) -> List[str]:
+        width = self.width
+        sequences: Dict[int, str] = {0: ''}
+        lines = []
+
+        for y in range(self.height):
+            chars = self._chars[y * width:(y + 1) * width]
+            styles = self._styles[y * width:(y + 1) * width]
+
+            # Trailing blanks without a style are left out, like in __str__
+            end = width
+            while end and chars[end - 1] == _BLANK and not styles[end - 1]:
+                end -= 1
+
+            parts = []
+            previous = 0
+            start = 0
+
+            for x in range(end + 1):
+                style = styles[x] if x < end else 0
+
+                if x < end and style == previous:
+                    continue
+
+                parts.append(''.join(map(chr, chars[start:x])))
+
+                if previous:
+                    parts.append(RESET_SEQUENCE)
+
+                if style not in sequences:
+                    sequences[style] = self._style_sequence(style)
+
+                parts.append(sequences[style])
+                previous, start = style, x
+
+            lines.append(''.join(parts))
+
+        return lines
+
+    def __str__(self) -> str:
+        return '\n'.join(line.rstrip() for line in self.lines())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TerminalEmulator):
+            return NotImplemented
+
+        return self.cells() == other.cells()
@@ -0,0 +1,399 @@
+import html
+import re
+import shutil
+import tempfile
+from typing import Dict, IO, List, Optional, Tuple, Type
+
+from sroloc.color.ansi import ansi_color_to_rgb, _ANSI_BASIC_COLORS
+from sroloc.color.bank import ColorBank
+from sroloc.color.true import TrueColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.sgr import EscapeStreamBuffer, SgrState
+
+_TOKEN_REGEX = re.compile(
+    r'\x1b\[(?P<parameters>[0-?]*)[ -/]*(?P<final>[@-~])'
+    r'|(?P<text>[^\x00-\x08\x0b-\x1f\x7f]+)'
+    r'|[\x00-\x1f\x7f]'
+)
+
+StyleKey = Tuple[Optional[str], Optional[str], Tuple[int, ...]]
+
+DEFAULT_FOREGROUND = '#e5e5e5'
+DEFAULT_BACKGROUND = '#000000'
+
+
+def build_css_palette(
+        color_scheme: Optional[Type[ColorBank]] = None  # type: ignore
+) -> List[str]:
+    if color_scheme is None:
+        color_scheme = ColorSegment._COLOR_SCHEME
+
+    palette = [ansi_color_to_rgb(i).as_hex() for i in range(256)]
+
+    # TrueColor themes define what the basic colors look like
+    if issubclass(color_scheme, TrueColor):
+        bank = color_scheme._flat_bank()
+
+        for name, index in _ANSI_BASIC_COLORS.items():
+            if name in bank:
+                palette[index] = bank[name].as_hex()
+
+    return palette
+
+
+class _SgrExporter:
+    CLASS_PREFIX: str = 's'
+
+    def __init__(
+            self,
+            color_scheme: Optional[Type[ColorBank]] = None,  # type: ignore
+            foreground: str = DEFAULT_FOREGROUND,
+            background: str = DEFAULT_BACKGROUND
+    ) -> None:
+        self.foreground = foreground
+        self.background = background
+
+        self._palette = build_css_palette(color_scheme)
+        self._css_colors: Dict[str, str] = {}
+        self._classes: Dict[StyleKey, str] = {}
+        self._class_keys: Dict[str, StyleKey] = {}
+
+        self._buffer = EscapeStreamBuffer()
+        self._state = SgrState()
+        self._state_class = ''
+        self._state_changed = False
+
+    def _css_color(self, code: str) -> str:
+        try:
+            return self._css_colors[code]
+        except KeyError:
+            pass
+
+        parts = code.split(';')
+
+        try:
+            if len(parts) == 1:
+                value = int(parts[0])
+                color = self._palette[value % 10 + (8 if value >= 90 else 0)]
+            elif parts[1] == '5':
+                color = self._palette[int(parts[2]) & 0xff]
+            else:
+                r, g, b = (min(int(x), 255) for x in parts[2:5])
+                color = f'#{r:02x}{g:02x}{b:02x}'
+        except (ValueError, IndexError):
+            color = self.foreground
+
+        self._css_colors[code] = color
+
+        return color
+
+    def _colors(self, key: StyleKey) -> Tuple[Optional[str], Optional[str]]:
+        fg_code, bg_code, attrs = key
+
+        fg = None if fg_code is None else self._css_color(fg_code)
+        bg = None if bg_code is None else self._css_color(bg_code)
+
+        if 7 in attrs:
+            fg, bg = bg or self.background, fg or self.foreground
+
+        return fg, bg
+
+    def _current_class(self) -> str:
+        if not self._state_changed:
+            return self._state_class
+
+        self._state_changed = False
+        state = self._state
+
+        if state.is_default:
+            self._state_class = ''
+            return ''
+
+        key = (state.fg, state.bg, tuple(sorted(state.attrs)))
+
+        css_class = self._classes.get(key)
+        if css_class is None:
+            css_class = f'{self.CLASS_PREFIX}{len(self._classes)}'
+            self._classes[key] = css_class
+            self._class_keys[css_class] = key
+
+        self._state_class = css_class
+
+        return css_class
+
+    def _apply_escape(self, parameters: str, final: str) -> None:
+        if final == 'm':
+            self._state.apply(parameters)
+            self._state_changed = True
+
+    def _tokens(self, chunk: str) -> 'List[re.Match[str]]':
+        return list(_TOKEN_REGEX.finditer(self._buffer.feed(chunk)))
+
+    def _pending_tokens(self) -> 'List[re.Match[str]]':
+        # An escape sequence cut off at the very end is kept as text
+        return list(_TOKEN_REGEX.finditer(self._buffer.flush()))
+
+
+def _text_decoration(attrs: Tuple[int, ...]) -> str:
+    decorations = [
+        name for attr, name in [(4, 'underline'), (9, 'line-through')]
+        if attr in attrs
+    ]
+
+    return ' '.join(decorations)
+
+
+def _font_declarations(attrs: Tuple[int, ...]) -> List[str]:
+    declarations = []
+
+    if 1 in attrs:
+        declarations.append('font-weight:bold')
+
+    if 2 in attrs:
+        declarations.append('opacity:0.6')
+
+    if 3 in attrs:
+        declarations.append('font-style:italic')
+
+    if 8 in attrs:
+        declarations.append('visibility:hidden')
+
+    if decoration := _text_decoration(attrs):
+        declarations.append(f'text-decoration:{decoration}')
+
+    return declarations
+
+
+class HtmlExporter(_SgrExporter):
+    def __init__(
+            self, title: str = '',
+            color_scheme: Optional[Type[ColorBank]] = None,  # type: ignore
+            foreground: str = DEFAULT_FOREGROUND,
+            background: str = DEFAULT_BACKGROUND
+    ) -> None:
+        super().__init__(color_scheme, foreground, background)
+        self.title = title
+        self._open_class = ''
+
+    def begin(self) -> str:
+        return (
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            f'<title>{html.escape(self.title)}</title>\n'
+            '<style>\npre.sroloc {'
+            f'color:{self.foreground};background-color:{self.background};'
+            'padding:1em;font-family:monospace}\n</style>\n'
+            '</head>\n<body>\n<pre class="sroloc">'
+        )
+
+    def _render(self, tokens: 'List[re.Match[str]]') -> str:
+        output: List[str] = []
+
+        for match in tokens:
+            kind = match.lastgroup
+
+            if kind == 'text':
+                css_class = self._current_class()
+
+                # Adjacent text sharing a class stays in one span
+                if css_class != self._open_class:
+                    if self._open_class:
+                        output.append('</span>')
+                    if css_class:
+                        output.append(f'<span class="{css_class}">')
+                    self._open_class = css_class
+
+                output.append(html.escape(match.group(), quote=False))
+            elif match.group('final'):
+                self._apply_escape(*match.group('parameters', 'final'))
+
+        return ''.join(output)
+
+    def feed(self, chunk: str) -> str:
+        return self._render(self._tokens(chunk))
+
+    def css(self) -> str:
+        rules = []
+
+        for key, css_class in self._classes.items():
+            fg, bg = self._colors(key)
+            declarations = _font_declarations(key[2])
+
+            if fg:
+                declarations.insert(0, f'color:{fg}')
+            if bg:
+                declarations.insert(1 if fg else 0, f'background-color:{bg}')
+
+            rules.append(f'.{css_class}{{{";".join(declarations)}}}')
+
+        return '\n'.join(rules)
+
+    def end(self) -> str:
+        text = self._render(self._pending_tokens())
+        closing = '</span>' if self._open_class else ''
+        self._open_class = ''
+
+        # Classes are only known after the whole stream has been seen
+        return (
+            f'{text}{closing}</pre>\n<style>\n{self.css()}\n</style>\n'
+            '</body>\n</html>\n'
+        )
+
+
+class SvgExporter(_SgrExporter):
+    FONT_SIZE: float = 14
+    CHAR_WIDTH: float = 8.4
+    LINE_HEIGHT: float = 17
+    TAB_SIZE: int = 8
+
+    def __init__(
+            self,
+            color_scheme: Optional[Type[ColorBank]] = None,  # type: ignore
+            foreground: str = DEFAULT_FOREGROUND,
+            background: str = DEFAULT_BACKGROUND
+    ) -> None:
+        super().__init__(color_scheme, foreground, background)
+
+        self._line: List[List[str]] = []  # [css class, text] pieces
+        self._column = 0
+        self._line_number = 0
+        self._columns = 0
+
+    def _add_text(self, text: str) -> None:
+        if '\t' in text:
+            text = text.expandtabs(self.TAB_SIZE)
+
+        css_class = self._current_class()
+
+        if self._line and self._line[-1][0] == css_class:
+            self._line[-1][1] += text
+        else:
+            self._line.append([css_class, text])
+
+        self._column += len(text)
+
+    def _end_line(self) -> str:
+        y = self._line_number * self.LINE_HEIGHT
+        baseline = y + self.LINE_HEIGHT - 4
+
+        rects: List[str] = []
+        spans: List[str] = []
+        column = 0
+
+        for css_class, text in self._line:
+            escaped = html.escape(text, quote=False)
+
+            if css_class:
+                spans.append(f'<tspan class="{css_class}">{escaped}</tspan>')
+
+                if self._colors(self._class_keys[css_class])[1]:
+                    rects.append(
+                        f'<rect class="{css_class}b" '
+                        f'x="{column * self.CHAR_WIDTH:g}" y="{y:g}" '
+                        f'width="{len(text) * self.CHAR_WIDTH:g}" '
+                        f'height="{self.LINE_HEIGHT:g}"/>'
+                    )
+            else:
+                spans.append(escaped)
+
+            column += len(text)
+
+        self._columns = max(self._columns, self._column)
+        self._line_number += 1
+        self._line = []
+        self._column = 0
+
+        return (
+            ''.join(rects)
+            + f'<text y="{baseline:g}" xml:space="preserve">'
+            + ''.join(spans) + '</text>\n'
+        )
+
+    def _render(self, tokens: 'List[re.Match[str]]') -> str:
+        output: List[str] = []
+
+        for match in tokens:
+            if match.lastgroup != 'text':
+                if match.group('final'):
+                    self._apply_escape(*match.group('parameters', 'final'))
+                continue
+
+            lines = match.group().split('\n')
+
+            for i, text in enumerate(lines):
+                if i:
+                    output.append(self._end_line())
+
+                if text:
+                    self._add_text(text)
+
+        return ''.join(output)
+
+    def feed(self, chunk: str) -> str:
+        return self._render(self._tokens(chunk))
+
+    def css(self) -> str:
+        rules = [f'text{{fill:{self.foreground}}}']
+
+        for key, css_class in self._classes.items():
+            fg, bg = self._colors(key)
+            declarations = _font_declarations(key[2])
+
+            if fg:
+                declarations.insert(0, f'fill:{fg}')
+
+            rules.append(f'.{css_class}{{{";".join(declarations)}}}')
+
+            if bg:
+                rules.append(f'.{css_class}b{{fill:{bg}}}')
+
+        return '\n'.join(rules)
+
+    def end(self) -> str:
+        text = self._render(self._pending_tokens())
+        return text + self._end_line() if self._line else text
+
+    def header(self) -> str:
+        width = max(self._columns, 1) * self.CHAR_WIDTH
+        height = max(self._line_number, 1) * self.LINE_HEIGHT
+
+        return (
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            f'width="{width:g}" height="{height:g}" '
+            f'font-family="monospace" font-size="{self.FONT_SIZE:g}">\n'
+            f'<style>\n{self.css()}\n</style>\n'
+            f'<rect width="100%" height="100%" fill="{self.background}"/>\n'
+        )
+
+    @staticmethod
+    def footer() -> str:
+        return '</svg>\n'
+
+
+def export_html(source: IO[str], destination: IO[str], title: str = '',
+                chunk_size: int = 1024 * 1024) -> None:
+    exporter = HtmlExporter(title)
+    destination.write(exporter.begin())
+
+    while chunk := source.read(chunk_size):
+        destination.write(exporter.feed(chunk))
+
+    destination.write(exporter.end())
+
+
+def export_svg(source: IO[str], destination: IO[str],
+               chunk_size: int = 1024 * 1024) -> None:
+    exporter = SvgExporter()
+
+    # The SVG size is only known at the end, so the body is spooled first
+    with tempfile.SpooledTemporaryFile(
+            max_size=16 * 1024 * 1024, mode='w+', encoding='utf-8'
+    ) as body:
+        while chunk := source.read(chunk_size):
+            body.write(exporter.feed(chunk))
+
+        body.write(exporter.end())
+        body.seek(0)
+
+        destination.write(exporter.header())
+        shutil.copyfileobj(body, destination)
+        destination.write(exporter.footer())
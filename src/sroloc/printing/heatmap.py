@@ -0,0 +1,265 @@
+import math
+from bisect import bisect_right
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+from sroloc.color.ansi import ANSIColor, ansi_color_to_rgb, nearest_ansi_color
+from sroloc.color.bank import ColorBank, get_bank_version
+from sroloc.color.utils import RgbColor, UnknownColorError, is_hex_color
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.sgr import RESET_SEQUENCE
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+COLOR_SCALES: Dict[str, Tuple[str, ...]] = {
+    'viridis': (
+        '#440154', '#482878', '#3e4989', '#31688e', '#26828e',
+        '#1f9e89', '#35b779', '#6ece58', '#b5de2b', '#fde725',
+    ),
+    'magma': (
+        '#000004', '#180f3d', '#440f76', '#721f81', '#9e2f7f',
+        '#cd4071', '#f1605d', '#fd9668', '#feca8d', '#fcfdbf',
+    ),
+    'inferno': (
+        '#000004', '#1b0c41', '#4a0c6b', '#781c6d', '#a52c60',
+        '#cf4446', '#ed6925', '#fb9b06', '#f7d13d', '#fcffa4',
+    ),
+    'traffic_light': ('#00c853', '#ffd600', '#d50000'),
+    'grayscale': ('#000000', '#ffffff'),
+}
+
+Colormap = Union[str, Sequence[Union[str, RgbColor]]]
+
+
+def _resolve_stop(color: Union[str, RgbColor],
+                  scheme: Type[ColorBank]) -> RgbColor:  # type: ignore
+    if isinstance(color, RgbColor):
+        return color
+
+    if is_hex_color(color):
+        return RgbColor.from_hex(color)
+
+    # Theme colors, so heatmaps follow the active scheme
+    if not scheme.has_color(color):
+        raise UnknownColorError(color)
+
+    value = scheme.get_color(color)
+
+    if isinstance(value, RgbColor):
+        return value
+
+    return ansi_color_to_rgb(value)
+
+
+def _as_values(values: Any) -> Any:
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values
+
+    return values if isinstance(values, Sequence) else list(values)
+
+
+def _interpolate(stops: Sequence[RgbColor], position: float) -> RgbColor:
+    if len(stops) == 1:
+        return stops[0]
+
+    scaled = position * (len(stops) - 1)
+    index = min(int(scaled), len(stops) - 2)
+    t = scaled - index
+
+    a, b = stops[index], stops[index + 1]
+
+    return RgbColor(*(
+        round(x + (y - x) * t) for x, y in zip(a, b)
+    ))
+
+
+class Heatmap:
+    def __init__(self, colormap: Colormap = 'viridis',
+                 vmin: Optional[float] = None, vmax: Optional[float] = None,
+                 levels: int = 32,
+                 thresholds: Optional[Sequence[float]] = None,
+                 background: bool = False) -> None:
+        if isinstance(colormap, str):
+            try:
+                colormap = COLOR_SCALES[colormap]
+            except KeyError:
+                raise ValueError(
+                    f'Unknown color scale: {colormap!r}'
+                ) from None
+
+        if not colormap:
+            raise ValueError('Colormap needs at least one color')
+
+        if thresholds is not None:
+            thresholds = sorted(thresholds)
+            levels = len(thresholds) + 1
+        elif levels < 1:
+            raise ValueError(f'Invalid number of levels: {levels}')
+
+        self.colormap = tuple(colormap)
+        self.vmin = vmin
+        self.vmax = vmax
+        self.levels = levels
+        self.thresholds = thresholds
+        self.background = background
+
+        self._tables: Tuple[Any, List[str], List[str]] = (None, [], [])
+
+    def _colors(
+            self, scheme: Type[ColorBank]  # type: ignore
+    ) -> List[RgbColor]:
+        stops = [_resolve_stop(color, scheme) for color in self.colormap]
+
+        # One color per threshold bucket when the colormap has just enough
+        if len(stops) == self.levels:
+            return stops
+
+        if self.levels == 1:
+            return [stops[0]]
+
+        return [
+            _interpolate(stops, i / (self.levels - 1))
+            for i in range(self.levels)
+        ]
+
+    def _color_code(self, color: RgbColor,
+                    scheme: Type[ColorBank]) -> str:  # type: ignore
+        layer = 4 if self.background else 3
+
+        if not issubclass(scheme, ANSIColor):
+            r, g, b = color
+            return f'{layer}8;2;{r};{g};{b}'
+
+        if scheme._BITS_PER_COLOR == 3:
+            return f'{layer}{nearest_ansi_color(color, 3)}'
+
+        return f'{layer}8;5;{nearest_ansi_color(color)}'
+
+    def _lookup_tables(self) -> Tuple[List[str], List[str]]:
+        scheme = ColorSegment._COLOR_SCHEME
+        key = (scheme, get_bank_version())
+
+        tables = self._tables
+
+        if tables[0] != key:
+            prefixes = [
+                f'\x1b[{self._color_code(color, scheme)}m'
+                for color in self._colors(scheme)
+            ]
+
+            # Extra slot for NaN, which is left uncolored
+            tables = (
+                key,
+                prefixes + [''],
+                [RESET_SEQUENCE] * len(prefixes) + [''],
+            )
+            self._tables = tables
+
+        return tables[1], tables[2]
+
+    @property
+    def prefixes(self) -> List[str]:
+        return self._lookup_tables()[0][:-1]
+
+    def _value_range(self, values: Any) -> Tuple[float, float]:
+        vmin, vmax = self.vmin, self.vmax
+
+        if vmin is None or vmax is None:
+            if numpy is not None and isinstance(values, numpy.ndarray):
+                finite = values[numpy.isfinite(values)]
+                low, high = (
+                    (finite.min(), finite.max()) if finite.size else (0, 0)
+                )
+            else:
+                finite = [v for v in values if math.isfinite(v)]
+                low, high = (min(finite), max(finite)) if finite else (0, 0)
+
+            vmin = low if vmin is None else vmin
+            vmax = high if vmax is None else vmax
+
+        return float(vmin), float(vmax)
+
+    def edges(self, values: Any = ()) -> List[float]:
+        if self.thresholds is not None:
+            return list(self.thresholds)
+
+        vmin, vmax = self._value_range(values)
+        step = (vmax - vmin) / self.levels
+
+        return [vmin + step * i for i in range(1, self.levels)]
+
+    def bucketize(self, values: Any) -> Any:
+        values = _as_values(values)
+        edges = self.edges(values)
+        nan_bucket = self.levels
+
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            indices = numpy.digitize(values, edges)
+
+            if values.dtype.kind == 'f':
+                indices[numpy.isnan(values)] = nan_bucket
+
+            return indices
+
+        bucket = partial(bisect_right, edges)
+
+        return [bucket(v) if v == v else nan_bucket for v in values]
+
+    def _texts(self, values: Any, texts: Optional[Sequence[str]],
+               format_spec: str) -> Sequence[str]:
+        if texts is not None:
+            if len(texts) != len(values):
+                raise ValueError('Every value needs exactly one text')
+
+            return texts
+
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            values = values.tolist()
+
+        if not format_spec:
+            return list(map(str, values))
+
+        return [format(v, format_spec) for v in values]
+
+    def colorize(self, values: Any, texts: Optional[Sequence[str]] = None,
+                 format_spec: str = '') -> List[str]:
+        values = _as_values(values)
+        prefixes, suffixes = self._lookup_tables()
+        indices = self.bucketize(values)
+
+        if numpy is not None and isinstance(indices, numpy.ndarray):
+            indices = indices.tolist()
+
+        texts = self._texts(values, texts, format_spec)
+
+        return [
+            prefix + text + suffix
+            for prefix, text, suffix in zip(
+                map(prefixes.__getitem__, indices),
+                texts,
+                map(suffixes.__getitem__, indices)
+            )
+        ]
+
+    def spans(self, values: Any, texts: Optional[Sequence[str]] = None,
+              format_spec: str = '') -> List[Tuple[str, str]]:
+        values = _as_values(values)
+        prefixes = self._lookup_tables()[0]
+        indices = self.bucketize(values)
+
+        if numpy is not None and isinstance(indices, numpy.ndarray):
+            indices = indices.tolist()
+
+        texts = self._texts(values, texts, format_spec)
+
+        return list(zip(texts, map(prefixes.__getitem__, indices)))
+
+
+def colorize_values(values: Any, colormap: Colormap = 'viridis',
+                    format_spec: str = '', **options: Any) -> List[str]:
+    return Heatmap(colormap, **options).colorize(
+        values, format_spec=format_spec
+    )
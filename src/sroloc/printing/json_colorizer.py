@@ -0,0 +1,218 @@
+import codecs
+import re
+from typing import Dict, Iterator, List, Mapping, Optional, IO, Union
+
+from sroloc.printing.color_segment import compile_styles
+from sroloc.printing.sgr import RESET_SEQUENCE
+
+DEFAULT_JSON_STYLES: Dict[str, str] = {
+    'key': 'b blue',
+    'string': 'green',
+    'number': 'cyan',
+    'boolean': 'yellow',
+    'null': 'purple',
+    'punctuation': '',
+}
+
+_WHITESPACE_REGEX = re.compile(r'[ \t\r\n]+')
+_STRING_BODY_REGEX = re.compile(r'(?:[^"\\]|\\.)*')
+_SCALAR_REGEX = re.compile(r'[^ \t\r\n{}\[\],:"]+')
+_NUMBER_REGEX = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+
+_LITERAL_KINDS = {'true': 'boolean', 'false': 'boolean', 'null': 'null'}
+
+
+def _match_end(regex: 're.Pattern[str]', data: str, position: int) -> int:
+    match = regex.match(data, position)
+    return position if match is None else match.end()
+
+
+class JsonColorizeError(ValueError):
+    def __init__(self, token: str, reason: str) -> None:
+        self.token = token
+        super().__init__(f'Invalid JSON near {token!r}: {reason}')
+
+
+class JsonColorizer:
+    def __init__(self, indent: int = 2,
+                 styles: Optional[Mapping[str, str]] = None) -> None:
+        if indent < 0:
+            raise ValueError(f'Invalid indent: {indent}')
+
+        self._indent = ' ' * indent
+        self._prefixes = compile_styles(DEFAULT_JSON_STYLES, styles)
+
+        self._stack: List[str] = []
+        self._expect_key = False
+        self._pending_newline = False
+        self._after_comma = False
+        self._in_string = False
+        self._string_kind = 'string'
+        self._pending = ''
+
+    def _emit(self, output: List[str], kind: str, text: str) -> None:
+        prefix = self._prefixes[kind]
+
+        if prefix:
+            output.append(f'{prefix}{text}{RESET_SEQUENCE}')
+        else:
+            output.append(text)
+
+    def _begin_value(self, output: List[str]) -> None:
+        if self._pending_newline:
+            output.append('\n' + self._indent * len(self._stack))
+            self._pending_newline = False
+
+    def _end_value(self, output: List[str]) -> None:
+        # Top-level values are separated by newlines (JSON lines)
+        if not self._stack:
+            output.append('\n')
+
+    def _handle_punctuation(self, output: List[str], char: str) -> None:
+        if char in '{[':
+            self._begin_value(output)
+            self._emit(output, 'punctuation', char)
+            self._stack.append(char)
+            self._expect_key = char == '{'
+            self._pending_newline = True
+            self._after_comma = False
+            return
+
+        if char in '}]':
+            if not self._stack or '{['['}]'.index(char)] != self._stack[-1]:
+                raise JsonColorizeError(char, 'unbalanced bracket')
+
+            # No value since the last separator
+            if self._pending_newline and self._after_comma:
+                raise JsonColorizeError(char, 'trailing comma')
+
+            self._stack.pop()
+
+            if self._pending_newline:
+                # Empty container stays on one line
+                self._pending_newline = False
+            else:
+                output.append('\n' + self._indent * len(self._stack))
+
+            self._emit(output, 'punctuation', char)
+            self._expect_key = False
+            self._end_value(output)
+            return
+
+        if not self._stack:
+            raise JsonColorizeError(char, 'unexpected separator')
+
+        if char == ',':
+            if self._pending_newline:
+                raise JsonColorizeError(char, 'missing value')
+
+            self._emit(output, 'punctuation', char)
+            self._pending_newline = True
+            self._after_comma = True
+            self._expect_key = self._stack[-1] == '{'
+        else:
+            self._emit(output, 'punctuation', char)
+            output.append(' ')
+            self._expect_key = False
+
+    def _handle_scalar(self, output: List[str], token: str) -> None:
+        kind = _LITERAL_KINDS.get(token)
+
+        if kind is None:
+            if _NUMBER_REGEX.fullmatch(token) is None:
+                raise JsonColorizeError(token, 'unknown token')
+
+            kind = 'number'
+
+        self._begin_value(output)
+        self._emit(output, kind, token)
+        self._end_value(output)
+
+    def feed(self, chunk: str, final: bool = False) -> str:
+        data = self._pending + chunk
+        self._pending = ''
+
+        output: List[str] = []
+        position, size = 0, len(data)
+        string_start = -1  # Opening quote of a string started in this chunk
+
+        while position < size:
+            if self._in_string:
+                start = position if string_start < 0 else string_start
+                string_start = -1
+                end = _match_end(_STRING_BODY_REGEX, data, position)
+
+                if end < size and data[end] == '"':
+                    self._emit(output, self._string_kind, data[start:end + 1])
+                    self._in_string = False
+                    position = end + 1
+
+                    if self._string_kind == 'string':
+                        self._end_value(output)
+
+                    continue
+
+                if start < end:
+                    self._emit(output, self._string_kind, data[start:end])
+
+                # A lone backslash has to wait for the escaped character
+                self._pending = data[end:]
+                break
+
+            char = data[position]
+
+            if char in ' \t\r\n':
+                position = _match_end(_WHITESPACE_REGEX, data, position)
+            elif char == '"':
+                self._begin_value(output)
+                self._string_kind = 'key' if self._expect_key else 'string'
+                self._in_string = True
+                string_start = position
+                position += 1
+            elif char in '{}[],:':
+                self._handle_punctuation(output, char)
+                position += 1
+            else:
+                end = _match_end(_SCALAR_REGEX, data, position)
+
+                if end == size and not final:
+                    # Scalar might continue in the next chunk
+                    self._pending = data[position:]
+                    break
+
+                self._handle_scalar(output, data[position:end])
+                position = end
+
+        if string_start >= 0:
+            self._emit(output, self._string_kind, '"')
+
+        return ''.join(output)
+
+    def close(self) -> str:
+        output = self.feed('', final=True)
+
+        if self._in_string or self._stack or self._pending:
+            raise JsonColorizeError(self._pending, 'unexpected end of input')
+
+        return output
+
+    def colorize_stream(self, stream: Union[IO[str], IO[bytes]],
+                        chunk_size: int = 64 * 1024) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+
+        while chunk := stream.read(chunk_size):
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk)
+
+            if output := self.feed(chunk):
+                yield output
+
+        output = self.feed(decoder.decode(b'', final=True)) + self.close()
+        if output:
+            yield output
+
+
+def colorize_json(text: str, indent: int = 2,
+                  styles: Optional[Mapping[str, str]] = None) -> str:
+    colorizer = JsonColorizer(indent, styles)
+    return colorizer.feed(text) + colorizer.close()
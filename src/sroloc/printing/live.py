@@ -0,0 +1,349 @@
+import shutil
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import (
+    Any, Callable, Deque, List, Optional, Sequence, TextIO, Tuple
+)
+
+from sroloc.color.bank import get_bank_version
+from sroloc.printing.color_segment import ColorSegment, get_format_version
+from sroloc.printing.sgr import RESET_SEQUENCE
+from sroloc.printing.wrap import truncate
+
+SPINNER_FRAMES = '⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏'
+
+_HIDE_CURSOR = '\x1b[?25l'
+_SHOW_CURSOR = '\x1b[?25h'
+_ERASE_LINE = '\x1b[K'
+
+
+def _paint(prefix: str, text: str) -> str:
+    return f'{prefix}{text}{RESET_SEQUENCE}' if prefix and text else text
+
+
+class _CompiledSpecs:
+    def __init__(self, *specs: str) -> None:
+        self.specs = specs
+        self._compiled: Tuple[Any, Tuple[str, ...]] = (None, ())
+
+        # Invalid specs fail at registration instead of in the render thread
+        self.prefixes()
+
+    def prefixes(self) -> Tuple[str, ...]:
+        key = (ColorSegment._COLOR_SCHEME, get_format_version(),
+               get_bank_version())
+        compiled = self._compiled
+
+        if compiled[0] != key:
+            compiled = (
+                key, tuple(map(ColorSegment.compile_spec, self.specs))
+            )
+            self._compiled = compiled
+
+        return compiled[1]
+
+
+class LiveItem(ABC):
+    def __init__(self, description: str, *specs: str) -> None:
+        # Plain attribute writes, so updating never waits for a frame
+        self.description = description
+        self.finished = False
+        self._specs = _CompiledSpecs(*specs)
+
+    def finish(self, description: Optional[str] = None) -> None:
+        if description is not None:
+            self.description = description
+
+        self.finished = True
+
+    @abstractmethod
+    def render(self, now: float, plain: bool = False) -> str:
+        pass
+
+
+class ProgressBar(LiveItem):
+    FILL_CHAR: str = '█'
+    EMPTY_CHAR: str = '░'
+
+    def __init__(self, description: str = '', total: Optional[int] = None,
+                 style: str = 'green', width: int = 30) -> None:
+        super().__init__(description, style, 'faint')
+        self.total = total
+        self.completed = 0
+        self.width = width
+
+    def update(self, completed: Optional[int] = None, advance: int = 0,
+               description: Optional[str] = None,
+               total: Optional[int] = None) -> None:
+        if total is not None:
+            self.total = total
+
+        if description is not None:
+            self.description = description
+
+        if completed is not None:
+            self.completed = completed
+
+        if advance:
+            self.completed += advance
+
+    def advance(self, amount: int = 1) -> None:
+        self.completed += amount
+
+    @property
+    def fraction(self) -> Optional[float]:
+        if not self.total:
+            return 1.0 if self.finished else None
+
+        return min(max(self.completed / self.total, 0.0), 1.0)
+
+    def render(self, now: float, plain: bool = False) -> str:
+        fraction = self.fraction
+        total = '?' if self.total is None else self.total
+        counter = f'{self.completed}/{total}'
+
+        if fraction is None:
+            return f'{self.description} {counter}'.lstrip()
+
+        percent = f'{fraction:4.0%}'
+
+        if plain:
+            return f'{self.description} {counter} {percent}'.lstrip()
+
+        filled = round(fraction * self.width)
+        fill_prefix, empty_prefix = self._specs.prefixes()
+
+        bar = (
+            _paint(fill_prefix, self.FILL_CHAR * filled)
+            + _paint(empty_prefix, self.EMPTY_CHAR * (self.width - filled))
+        )
+
+        return f'{self.description} {bar} {counter} {percent}'.lstrip()
+
+
+class Spinner(LiveItem):
+    FRAMES_PER_SECOND: float = 10
+    FINISHED_FRAME: str = '✔'
+
+    def __init__(self, description: str = '', style: str = 'cyan',
+                 frames: Sequence[str] = SPINNER_FRAMES) -> None:
+        super().__init__(description, style)
+        self.frames = frames
+
+    def render(self, now: float, plain: bool = False) -> str:
+        if plain:
+            state = 'done' if self.finished else '...'
+            return f'{self.description} {state}'
+
+        if self.finished:
+            frame = self.FINISHED_FRAME
+        else:
+            index = int(now * self.FRAMES_PER_SECOND) % len(self.frames)
+            frame = self.frames[index]
+
+        frame = _paint(self._specs.prefixes()[0], frame)
+
+        return f'{frame} {self.description}'
+
+
+class LiveRegion:
+    def __init__(self, stream: Optional[TextIO] = None, fps: float = 10,
+                 summary_interval: float = 5.0,
+                 is_tty: Optional[bool] = None,
+                 width: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if fps <= 0:
+            raise ValueError(f'Invalid frame rate: {fps}')
+
+        self.stream = sys.stdout if stream is None else stream
+        self.fps = fps
+        self.summary_interval = summary_interval
+        self.width = width
+        self.clock = clock
+
+        if is_tty is None:
+            try:
+                is_tty = self.stream.isatty()
+            except (AttributeError, ValueError):
+                is_tty = False
+
+        self.is_tty = is_tty
+
+        # Replaced, never modified, so frames can read it without a lock
+        self._items: Tuple[LiveItem, ...] = ()
+        self._messages: Deque[str] = deque()
+
+        self._add_lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self._lines: List[str] = []
+        self._last_summary: Optional[float] = None
+        self._summary_lines: List[str] = []
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.frames = 0
+
+    @property
+    def items(self) -> Tuple[LiveItem, ...]:
+        return self._items
+
+    def add(self, item: LiveItem) -> LiveItem:
+        with self._add_lock:
+            self._items = self._items + (item,)
+
+        return item
+
+    def add_bar(self, description: str = '', total: Optional[int] = None,
+                **options: Any) -> ProgressBar:
+        bar = ProgressBar(description, total, **options)
+        self.add(bar)
+
+        return bar
+
+    def add_spinner(self, description: str = '',
+                    **options: Any) -> Spinner:
+        spinner = Spinner(description, **options)
+        self.add(spinner)
+
+        return spinner
+
+    def log(self, message: str) -> None:
+        self._messages.append(message)
+
+    def _terminal_width(self) -> int:
+        if self.width is not None:
+            return self.width
+
+        return shutil.get_terminal_size().columns
+
+    def _render_lines(self, now: float) -> List[str]:
+        # One column is kept free, so no line ever wraps
+        width = self._terminal_width() - 1
+
+        return [
+            truncate(item.render(now), width)
+            for item in self._items
+        ]
+
+    def _pop_messages(self) -> List[str]:
+        messages = []
+
+        while self._messages:
+            messages.append(self._messages.popleft())
+
+        return messages
+
+    def _tty_frame(self, lines: List[str], messages: List[str]) -> str:
+        previous = self._lines
+        output: List[str] = []
+
+        if messages:
+            # Messages are printed above the region, which is then redrawn
+            if previous:
+                output.append(f'\x1b[{len(previous)}A\r')
+
+            for line in messages + lines:
+                output.append(f'{line}{_ERASE_LINE}\n')
+
+            output.append('\x1b[J')
+
+            return ''.join(output)
+
+        row = len(previous)
+
+        for i, (line, old_line) in enumerate(zip(lines, previous)):
+            if line == old_line:
+                continue
+
+            if i < row:
+                output.append(f'\x1b[{row - i}A')
+            elif i > row:
+                output.append(f'\x1b[{i - row}B')
+
+            output.append(f'\r{line}{_ERASE_LINE}')
+            row = i
+
+        if row < len(previous):
+            output.append(f'\x1b[{len(previous) - row}B\r')
+
+        for line in lines[len(previous):]:
+            output.append(f'{line}{_ERASE_LINE}\n')
+
+        return ''.join(output)
+
+    def _summary(self, now: float, force: bool) -> str:
+        output = ''.join(f'{message}\n' for message in self._pop_messages())
+
+        if (not force and self._last_summary is not None
+                and now - self._last_summary < self.summary_interval):
+            return output
+
+        self._last_summary = now
+        lines = [item.render(now, plain=True) for item in self._items]
+
+        if lines != self._summary_lines:
+            self._summary_lines = lines
+            output += ''.join(f'{line}\n' for line in lines)
+
+        return output
+
+    def refresh(self, force: bool = False) -> None:
+        with self._render_lock:
+            now = self.clock()
+
+            if self.is_tty:
+                messages = self._pop_messages()
+                lines = self._render_lines(now)
+                output = self._tty_frame(lines, messages)
+                self._lines = lines
+            else:
+                output = self._summary(now, force)
+
+            self.frames += 1
+
+            if output:
+                self.stream.write(output)
+                self.stream.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(1 / self.fps):
+            self.refresh()
+
+    def start(self) -> 'LiveRegion':
+        if self._thread is not None:
+            raise RuntimeError('Live region is already running')
+
+        if self.is_tty:
+            self.stream.write(_HIDE_CURSOR)
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='sroloc-live-region', daemon=True
+        )
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+        self.refresh(force=True)
+
+        if self.is_tty:
+            self.stream.write(_SHOW_CURSOR)
+            self.stream.flush()
+
+    def __enter__(self) -> 'LiveRegion':
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
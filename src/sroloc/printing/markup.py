@@ -0,0 +1,170 @@
+import re
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple, Type
+
+from sroloc.color.bank import ColorBank, get_bank_version
+from sroloc.printing.color_segment import ColorSegment, get_format_version
+from sroloc.printing.style import Style
+
+_SPECIAL_CHARS_REGEX = re.compile(r'[\[\\]')
+
+
+class MarkupError(ValueError):
+    def __init__(self, tag: str, reason: str) -> None:
+        self.tag = tag
+        super().__init__(f'Invalid markup tag {tag!r}: {reason}')
+
+
+@lru_cache(maxsize=1024)
+def _parse_tag(tag: str, color_scheme: Type[ColorBank],  # type: ignore
+               format_version: int, bank_version: int) -> Optional[Style]:
+    try:
+        return Style.parse(tag)
+    except ValueError:
+        return None
+
+
+class MarkupParser:
+    MAX_TAG_LENGTH: int = 256
+
+    def __init__(self) -> None:
+        self._stack: List[Tuple[str, Style]] = []
+        self._pending = ''
+
+    @property
+    def style(self) -> Optional[Style]:
+        return self._stack[-1][1] if self._stack else None
+
+    def _emit(self, run: List[str], output: List[str]) -> None:
+        text = ''.join(run)
+        run.clear()
+
+        if not text:
+            return
+
+        style = self.style
+        output.append(style.apply(text) if style else text)
+
+    def _close_tag(self, tag: str, name: str) -> None:
+        if not self._stack:
+            raise MarkupError(tag, 'no open tag to close')
+
+        if not name:
+            self._stack.pop()
+            return
+
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == name:
+                del self._stack[i:]
+                return
+
+        raise MarkupError(tag, 'closing tag does not match any open tag')
+
+    def _handle_tag(self, tag: str, run: List[str],
+                    output: List[str]) -> bool:
+        name = ' '.join(tag.split())
+
+        if name.startswith('/'):
+            self._emit(run, output)
+            self._close_tag(tag, name[1:].strip())
+            return True
+
+        if not name:
+            return False
+
+        style = _parse_tag(
+            name, ColorSegment._COLOR_SCHEME, get_format_version(),
+            get_bank_version()
+        )
+        if style is None:
+            return False
+
+        self._emit(run, output)
+
+        current = self.style
+        self._stack.append((name, current + style if current else style))
+
+        return True
+
+    def feed(self, chunk: str) -> str:
+        data = self._pending + chunk
+        self._pending = ''
+
+        output: List[str] = []
+        run: List[str] = []
+        position, size = 0, len(data)
+
+        while position < size:
+            match = _SPECIAL_CHARS_REGEX.search(data, position)
+            if match is None:
+                run.append(data[position:])
+                break
+
+            i = match.start()
+            run.append(data[position:i])
+
+            if data[i] == '\\':
+                if i + 1 == size:
+                    self._pending = '\\'
+                    break
+
+                if data[i + 1] in '[\\':
+                    run.append(data[i + 1])
+                    position = i + 2
+                else:
+                    run.append('\\')
+                    position = i + 1
+
+                continue
+
+            end = data.find(']', i + 1)
+            if end == -1:
+                if size - i > self.MAX_TAG_LENGTH:
+                    run.append('[')
+                    position = i + 1
+                    continue
+
+                # Tag might be completed by the next chunk
+                self._pending = data[i:]
+                break
+
+            if self._handle_tag(data[i + 1:end], run, output):
+                position = end + 1
+            else:
+                run.append('[')
+                position = i + 1
+
+        self._emit(run, output)
+
+        return ''.join(output)
+
+    def close(self) -> str:
+        output: List[str] = []
+        self._emit([self._pending], output)
+
+        self._pending = ''
+        self._stack.clear()
+
+        return ''.join(output)
+
+    def parse_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        for chunk in chunks:
+            if output := self.feed(chunk):
+                yield output
+
+        if output := self.close():
+            yield output
+
+
+@lru_cache(maxsize=1024)
+def _render_markup(markup: str, color_scheme: Type[ColorBank],  # type: ignore
+                   format_version: int, bank_version: int) -> str:
+    parser = MarkupParser()
+    return parser.feed(markup) + parser.close()
+
+
+def render_markup(markup: str) -> str:
+    return _render_markup(
+        markup, ColorSegment._COLOR_SCHEME, get_format_version(),
+        get_bank_version()
+    )
@@ -0,0 +1,170 @@
+import re
+from typing import Dict, IO, Iterator, List, Optional, Type
+
+from sroloc.color.ansi import (
+    ANSIColor, ansi_color_to_rgb, nearest_ansi_color, _ANSI_BASIC_COLORS
+)
+from sroloc.color.bank import ColorBank, get_bank_version
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.sgr import EscapeStreamBuffer
+
+_SGR_REGEX = re.compile(r'\x1b\[([0-9;]*)m')
+
+_BASIC_COLOR_NAMES = {
+    index: name for name, index in _ANSI_BASIC_COLORS.items()
+}
+
+
+def _split_codes(parameters: str) -> Iterator[str]:
+    numbers = parameters.split(';')
+    position, size = 0, len(numbers)
+
+    while position < size:
+        number = numbers[position]
+        length = 1
+
+        if number in ('38', '48') and position + 1 < size:
+            length = {'5': 3, '2': 5}.get(numbers[position + 1], 1)
+
+        yield ';'.join(numbers[position:position + length])
+        position += length
+
+
+class SgrRewriter:
+    def __init__(
+            self,
+            color_scheme: Optional[Type[ColorBank]] = None  # type: ignore
+    ) -> None:
+        if color_scheme is None:
+            color_scheme = ColorSegment._COLOR_SCHEME
+
+        if not issubclass(color_scheme, (ANSIColor, TrueColor)):
+            raise TypeError(
+                f'Cannot rewrite colors for {color_scheme.__name__!r}'
+            )
+
+        self.color_scheme = color_scheme
+
+        self._buffer = EscapeStreamBuffer()
+        self._table: Dict[str, str] = {}
+        self._bank_version = get_bank_version()
+
+    def _rewrite_index(self, index: int, layer: int) -> Optional[str]:
+        if issubclass(self.color_scheme, TrueColor):
+            name = _BASIC_COLOR_NAMES.get(index % 8 if index < 16 else -1)
+
+            if name is None or not self.color_scheme.has_color(name):
+                return None
+
+            if layer == 3:
+                return self.color_scheme.fg_color_code(name)
+
+            return self.color_scheme.bg_color_code(name)
+
+        # Only 3-bit schemes need indexed colors to be downsampled
+        if self.color_scheme._BITS_PER_COLOR == 8:
+            return None
+
+        # Even the first 8 colors of the 256-color form are unknown there
+        if 0 <= index < 8:
+            return f'{layer}{index}'
+
+        if index < 16:
+            return f'{layer}{index - 8}'
+
+        color = ansi_color_to_rgb(index)
+        return f'{layer}{nearest_ansi_color(color, 3)}'
+
+    def _rewrite_rgb(self, color: RgbColor, layer: int) -> Optional[str]:
+        if issubclass(self.color_scheme, TrueColor):
+            return None
+
+        bits = self.color_scheme._BITS_PER_COLOR
+        index = nearest_ansi_color(color, bits)
+
+        return f'{layer}{index}' if bits == 3 else f'{layer}8;5;{index}'
+
+    def _translate(self, code: str) -> str:
+        numbers = code.split(';')
+
+        try:
+            value = int(numbers[0])
+
+            if len(numbers) == 1:
+                if 30 <= value <= 37 or 40 <= value <= 47:
+                    rewritten = self._rewrite_index(value % 10, value // 10)
+                elif 90 <= value <= 97 or 100 <= value <= 107:
+                    rewritten = self._rewrite_index(
+                        value % 10 + 8, 3 if value < 100 else 4
+                    )
+                else:
+                    rewritten = None
+            elif numbers[1] == '5':
+                rewritten = self._rewrite_index(int(numbers[2]), value // 10)
+            else:
+                color = RgbColor(*map(int, numbers[2:]))
+                rewritten = self._rewrite_rgb(color, value // 10)
+        except (ValueError, TypeError, IndexError):
+            rewritten = None
+
+        return code if rewritten is None else rewritten
+
+    def rewrite_parameters(self, parameters: str) -> str:
+        if self._bank_version != get_bank_version():
+            self._table.clear()
+            self._bank_version = get_bank_version()
+
+        table = self._table
+        codes = []
+
+        for code in _split_codes(parameters):
+            translated = table.get(code)
+            if translated is None:
+                translated = table[code] = self._translate(code)
+
+            codes.append(translated)
+
+        return ';'.join(codes)
+
+    def feed(self, chunk: str) -> str:
+        data = self._buffer.feed(chunk)
+        pieces: List[str] = []
+        position = 0
+
+        for match in _SGR_REGEX.finditer(data):
+            parameters = match.group(1)
+            rewritten = self.rewrite_parameters(parameters)
+
+            # Text (and sequences left as they were) are copied in one slice
+            if rewritten != parameters:
+                pieces.append(data[position:match.start()])
+                pieces.append(f'\x1b[{rewritten}m')
+                position = match.end()
+
+        if not pieces:
+            return data
+
+        pieces.append(data[position:])
+
+        return ''.join(pieces)
+
+    def flush(self) -> str:
+        return self._buffer.flush()
+
+    def rewrite_stream(self, stream: IO[str],
+                       chunk_size: int = 64 * 1024) -> Iterator[str]:
+        while chunk := stream.read(chunk_size):
+            if output := self.feed(chunk):
+                yield output
+
+        if output := self.flush():
+            yield output
+
+
+def rewrite(text: str,
+            color_scheme: Optional[Type[ColorBank]] = None  # type: ignore
+            ) -> str:
+    rewriter = SgrRewriter(color_scheme)
+    return rewriter.feed(text) + rewriter.flush()
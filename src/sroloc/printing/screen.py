@@ -0,0 +1,225 @@
+from array import array
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sroloc.color.bank import get_bank_version
+from sroloc.printing.color_segment import ColorSegment, get_format_version
+from sroloc.printing.sgr import RESET_SEQUENCE, SgrState
+
+_BLANK = ord(' ')
+_UNKNOWN_STYLE = 0xffff  # Never a valid style id, forces a redraw
+_MAX_TRANSITIONS = 4096
+
+
+class Screen:
+    def __init__(self, width: int, height: int) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError(f'Invalid screen size: {width}x{height}')
+
+        self.width = width
+        self.height = height
+
+        size = width * height
+
+        # Back buffer holds what should be on screen,
+        # front buffer holds what was emitted by the last flush
+        self._chars = array('I', [_BLANK]) * size
+        self._styles = array('H', [0]) * size
+        self._front_chars = array('I', [0]) * size
+        self._front_styles = array('H', [_UNKNOWN_STYLE]) * size
+
+        # Dirty column span per row, empty when min > max
+        self._dirty_min = array('l', [0]) * height
+        self._dirty_max = array('l', [width - 1]) * height
+
+        # Specs are kept, so styles can be compiled again when the scheme,
+        # banks or grammar change
+        self._style_ids: Dict[str, int] = {'': 0}
+        self._style_specs: List[str] = ['']
+        self._style_states: List[SgrState] = [SgrState()]
+        self._styles_key: Tuple[Any, ...] = self._current_styles_key()
+
+        # Sequences switching from one style to another, by both style ids
+        self._transitions: Dict[Tuple[int, int], str] = {}
+
+    @staticmethod
+    def _current_styles_key() -> Tuple[Any, ...]:
+        return (ColorSegment._COLOR_SCHEME, get_format_version(),
+                get_bank_version())
+
+    @staticmethod
+    def _compile_style(format_spec: str) -> SgrState:
+        state = SgrState()
+        injector = ColorSegment.build_injector(format_spec)
+        state.apply(injector.sgr_parameters())
+        return state
+
+    def _refresh_styles(self) -> None:
+        key = self._current_styles_key()
+        if key == self._styles_key:
+            return
+
+        states = list(map(self._compile_style, self._style_specs))
+        self._styles_key = key
+        self._transitions.clear()
+
+        # Cells already on screen are drawn again in their new colors
+        if states != self._style_states:
+            self._style_states = states
+            self.invalidate()
+
+    def style_id(self, format_spec: str) -> int:
+        format_spec = ' '.join(format_spec.split())
+
+        try:
+            return self._style_ids[format_spec]
+        except KeyError:
+            pass
+
+        if len(self._style_specs) >= _UNKNOWN_STYLE:
+            raise OverflowError('Too many distinct styles on one screen')
+
+        self._refresh_styles()
+        state = self._compile_style(format_spec)
+
+        style_id = len(self._style_specs)
+        self._style_specs.append(format_spec)
+        self._style_states.append(state)
+        self._style_ids[format_spec] = style_id
+
+        return style_id
+
+    def _transition(self, old: int, new: int) -> str:
+        states = self._style_states
+        parameters = states[old].transition(states[new])
+
+        if len(self._transitions) >= _MAX_TRANSITIONS:
+            self._transitions.clear()
+
+        sequence = self._transitions[old, new] = \
+            f'\x1b[{parameters}m' if parameters else ''
+
+        return sequence
+
+    def _resolve_style(self, style: Union[str, int]) -> int:
+        if isinstance(style, str):
+            return self.style_id(style)
+
+        if not 0 <= style < len(self._style_specs):
+            raise ValueError(f'Unknown style id: {style}')
+
+        return style
+
+    def _mark_dirty(self, y: int, x_start: int, x_end: int) -> None:
+        if x_start < self._dirty_min[y]:
+            self._dirty_min[y] = x_start
+
+        if x_end > self._dirty_max[y]:
+            self._dirty_max[y] = x_end
+
+    def write(self, x: int, y: int, text: str,
+              style: Union[str, int] = '') -> None:
+        if not 0 <= y < self.height or x >= self.width:
+            return
+
+        if x < 0:
+            text = text[-x:]
+            x = 0
+
+        text = text[:self.width - x]
+        if not text:
+            return
+
+        style_id = self._resolve_style(style)
+        offset = y * self.width + x
+        end = offset + len(text)
+
+        self._chars[offset:end] = array('I', map(ord, text))
+        self._styles[offset:end] = array('H', [style_id]) * len(text)
+        self._mark_dirty(y, x, x + len(text) - 1)
+
+    def clear(self, x: int = 0, y: int = 0,
+              width: Optional[int] = None,
+              height: Optional[int] = None) -> None:
+        x_end = self.width if width is None else min(self.width, x + width)
+        y_end = self.height if height is None else min(self.height, y + height)
+        x, y = max(x, 0), max(y, 0)
+
+        if x >= x_end or y >= y_end:
+            return
+
+        blank_chars = array('I', [_BLANK]) * (x_end - x)
+        blank_styles = array('H', [0]) * (x_end - x)
+
+        for row in range(y, y_end):
+            offset = row * self.width
+            self._chars[offset + x:offset + x_end] = blank_chars
+            self._styles[offset + x:offset + x_end] = blank_styles
+            self._mark_dirty(row, x, x_end - 1)
+
+    def invalidate(self) -> None:
+        self._front_styles = array('H', [_UNKNOWN_STYLE]) * len(self._styles)
+
+        for row in range(self.height):
+            self._mark_dirty(row, 0, self.width - 1)
+
+    def flush(self) -> str:
+        self._refresh_styles()
+
+        chars, styles = self._chars, self._styles
+        front_chars, front_styles = self._front_chars, self._front_styles
+        transitions = self._transitions
+        width = self.width
+
+        output: List[str] = []
+        current_style = 0
+        cursor = -1  # Cell index the terminal cursor points at, -1 if unknown
+
+        for y in range(self.height):
+            x_min, x_max = self._dirty_min[y], self._dirty_max[y]
+            if x_min > x_max:
+                continue
+
+            self._dirty_min[y] = width
+            self._dirty_max[y] = -1
+
+            row_offset = y * width
+            for i in range(row_offset + x_min, row_offset + x_max + 1):
+                char, style = chars[i], styles[i]
+                if char == front_chars[i] and style == front_styles[i]:
+                    continue
+
+                if i != cursor:
+                    output.append(f'\x1b[{y + 1};{i - row_offset + 1}H')
+
+                if style != current_style:
+                    sequence = transitions.get((current_style, style))
+                    if sequence is None:
+                        sequence = self._transition(current_style, style)
+
+                    output.append(sequence)
+                    current_style = style
+
+                output.append(chr(char))
+                front_chars[i] = char
+                front_styles[i] = style
+
+                # Cursor position after writing the last column is
+                # terminal-dependent (pending wrap), so forget it
+                cursor = i + 1 if i + 1 - row_offset < width else -1
+
+        if not self._style_states[current_style].is_default:
+            output.append(RESET_SEQUENCE)
+
+        return ''.join(output)
+
+    def repaint(self) -> str:
+        self.invalidate()
+        return self.flush()
+
+    def __str__(self) -> str:
+        rows = (
+            ''.join(map(chr, self._chars[y * self.width:(y + 1) * self.width]))
+            for y in range(self.height)
+        )
+
+        return '\n'.join(rows)
@@ -0,0 +1,269 @@
+import re
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+ESCAPE_SEQUENCE_REGEX = re.compile(r'\x1b\[([0-?]*)[ -/]*([@-~])')
+RESET_SEQUENCE = '\x1b[0m'
+
+_INCOMPLETE_ESCAPE_REGEX = re.compile(r'\x1b(?:\[[0-?]*[ -/]*)?')
+_MAX_ESCAPE_LENGTH = 64
+
+# Codes turning off text attributes (and the attributes they clear)
+_ATTRIBUTE_RESETS = {
+    22: (1, 2),
+    23: (3,),
+    24: (4,),
+    25: (5, 6),
+    27: (7,),
+    28: (8,),
+    29: (9,),
+}
+
+_ATTRIBUTE_OFF = {
+    attr: code for code, attrs in _ATTRIBUTE_RESETS.items() for attr in attrs
+}
+
+_INTENSITY_ATTRIBUTES = (1, 2)
+
+
+class SgrState:
+    __slots__ = ('fg', 'bg', 'attrs')
+
+    def __init__(self) -> None:
+        # Colors are kept as their SGR parameter strings, e.g. '31' or
+        # '38;2;255;0;0', so they can be re-emitted without conversion
+        self.fg: Optional[str] = None
+        self.bg: Optional[str] = None
+        self.attrs: Set[int] = set()
+
+    def reset(self) -> None:
+        self.fg = None
+        self.bg = None
+        self.attrs.clear()
+
+    def copy(self) -> 'SgrState':
+        state = SgrState()
+        state.fg, state.bg = self.fg, self.bg
+        state.attrs = set(self.attrs)
+        return state
+
+    @property
+    def is_default(self) -> bool:
+        return self.fg is None and self.bg is None and not self.attrs
+
+    def apply(self, parameters: str) -> None:
+        if not parameters:
+            self.reset()
+            return
+
+        codes = parameters.split(';')
+        i, size = 0, len(codes)
+
+        while i < size:
+            try:
+                code = int(codes[i] or 0)
+            except ValueError:
+                i += 1
+                continue
+
+            i += 1
+
+            if code == 0:
+                self.reset()
+            elif code in (38, 48):
+                color, i = _read_extended_color(codes, i, code)
+                if color is not None:
+                    if code == 38:
+                        self.fg = color
+                    else:
+                        self.bg = color
+            elif 30 <= code <= 37 or 90 <= code <= 97:
+                self.fg = str(code)
+            elif 40 <= code <= 47 or 100 <= code <= 107:
+                self.bg = str(code)
+            elif code == 39:
+                self.fg = None
+            elif code == 49:
+                self.bg = None
+            elif 1 <= code <= 9:
+                self.attrs.add(code)
+            elif code in _ATTRIBUTE_RESETS:
+                self.attrs.difference_update(_ATTRIBUTE_RESETS[code])
+
+    def parameters(self) -> str:
+        elements: List[str] = [
+            str(attr) for attr in _INTENSITY_ATTRIBUTES if attr in self.attrs
+        ]
+
+        if self.fg is not None:
+            elements.append(self.fg)
+
+        if self.bg is not None:
+            elements.append(self.bg)
+
+        elements.extend(
+            str(attr) for attr in sorted(self.attrs)
+            if attr not in _INTENSITY_ATTRIBUTES
+        )
+
+        return ';'.join(elements)
+
+    def sequence(self) -> str:
+        parameters = self.parameters()
+        return f'\x1b[{parameters}m' if parameters else ''
+
+    def transition(self, target: 'SgrState') -> str:
+        if self == target:
+            return ''
+
+        # Attributes sharing an off code (like bold and faint) are turned
+        # back on after it
+        off_codes = sorted({_ATTRIBUTE_OFF[attr]
+                            for attr in self.attrs - target.attrs})
+        added = target.attrs - self.attrs
+
+        for code in off_codes:
+            added.update(target.attrs.intersection(_ATTRIBUTE_RESETS[code]))
+
+        elements = list(map(str, off_codes))
+
+        if self.fg != target.fg:
+            elements.append(target.fg or '39')
+
+        if self.bg != target.bg:
+            elements.append(target.bg or '49')
+
+        elements.extend(map(str, sorted(added)))
+
+        changes = ';'.join(elements)
+        parameters = target.parameters()
+        reset = f'0;{parameters}' if parameters else '0'
+
+        return changes if len(changes) <= len(reset) else reset
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SgrState):
+            return NotImplemented
+
+        return (self.fg == other.fg and self.bg == other.bg
+                and self.attrs == other.attrs)
+
+    def __repr__(self) -> str:
+        return f'SgrState({self.parameters()!r})'
+
+
+def _read_extended_color(codes: List[str], i: int,
+                         code: int) -> Tuple[Optional[str], int]:
+    if i >= len(codes):
+        return None, i
+
+    mode = codes[i]
+
+    if mode == '5' and i + 1 < len(codes):
+        return f'{code};5;{codes[i + 1]}', i + 2
+
+    if mode == '2' and i + 3 < len(codes):
+        r, g, b = codes[i + 1:i + 4]
+        return f'{code};2;{r};{g};{b}', i + 4
+
+    return None, len(codes)
+
+
+def strip_escape_sequences(text: str) -> str:
+    return ESCAPE_SEQUENCE_REGEX.sub('', text)
+
+
+class EscapeStreamBuffer:
+    def __init__(self) -> None:
+        self._pending = ''
+
+    def feed(self, chunk: str) -> str:
+        data = self._pending + chunk if self._pending else chunk
+        self._pending = ''
+
+        # Hold back an escape sequence cut off at the end of the chunk
+        start = data.rfind('\x1b', max(0, len(data) - _MAX_ESCAPE_LENGTH))
+        if start >= 0 and _INCOMPLETE_ESCAPE_REGEX.fullmatch(data, start):
+            self._pending = data[start:]
+            return data[:start]
+
+        return data
+
+    def flush(self) -> str:
+        pending, self._pending = self._pending, ''
+        return pending
+
+
+_SGR_TOKEN_REGEX = re.compile(r'\x1b\[([0-9;:]*)m|[^\x1b]+|\x1b')
+_MAX_CACHED_STATES = 4096
+
+StateKey = Tuple[Optional[str], Optional[str], FrozenSet[int]]
+_DEFAULT_KEY: StateKey = (None, None, frozenset())
+
+
+class SgrCollapser:
+    def __init__(self) -> None:
+        self._buffer = EscapeStreamBuffer()
+
+        # States are kept as hashable keys, so applying a sequence to a
+        # state is a dict lookup after the first time
+        self._wanted: StateKey = _DEFAULT_KEY
+        self._emitted: StateKey = _DEFAULT_KEY
+        self._applied: Dict[Tuple[StateKey, str], StateKey] = {}
+        self._sequences: Dict[StateKey, str] = {_DEFAULT_KEY: RESET_SEQUENCE}
+
+    def _apply(self, parameters: str) -> None:
+        key = (self._wanted, parameters)
+        wanted = self._applied.get(key)
+
+        if wanted is None:
+            state = SgrState()
+            state.fg, state.bg, attrs = self._wanted
+            state.attrs = set(attrs)
+            state.apply(parameters)
+
+            wanted = (state.fg, state.bg, frozenset(state.attrs))
+            self._sequences.setdefault(
+                wanted, f'\x1b[0;{state.parameters()}m'
+            )
+
+            if len(self._applied) >= _MAX_CACHED_STATES:
+                self._applied.clear()
+
+            self._applied[key] = wanted
+
+        self._wanted = wanted
+
+    def _transition(self) -> str:
+        if self._wanted == self._emitted:
+            return ''
+
+        self._emitted = self._wanted
+        return self._sequences[self._wanted]
+
+    def feed(self, chunk: str) -> str:
+        data = self._buffer.feed(chunk)
+
+        if self._wanted == self._emitted and '\x1b' not in data:
+            return data
+
+        output: List[str] = []
+
+        # Styles are applied lazily, so a reset followed by the same
+        # style (like between two ColorInjector segments) costs nothing
+        for match in _SGR_TOKEN_REGEX.finditer(data):
+            parameters = match.group(1)
+
+            if parameters is not None:
+                self._apply(parameters)
+                continue
+
+            if self._wanted != self._emitted:
+                output.append(self._transition())
+
+            output.append(match.group())
+
+        return ''.join(output)
+
+    def flush(self) -> str:
+        # An escape sequence cut off at the very end is passed through
+        return self._transition() + self._buffer.flush()
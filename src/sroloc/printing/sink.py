@@ -0,0 +1,207 @@
+import sys
+import threading
+from collections import deque
+from typing import Any, Deque, List, Optional, TextIO, Tuple
+
+from sroloc.printing.sgr import ESCAPE_SEQUENCE_REGEX, RESET_SEQUENCE, SgrState
+
+_RESETS = ('\x1b[0m', '\x1b[m')
+
+
+def seal_line(line: str) -> Tuple[str, str]:
+    # Returns the line ending in the default state and the sequence that
+    # restores its style on the next line
+    start = line.rfind('\x1b[')
+
+    if start < 0 or line.startswith(_RESETS, start):
+        return line, ''
+
+    state = SgrState()
+
+    for match in ESCAPE_SEQUENCE_REGEX.finditer(line):
+        if match.group(2) == 'm':
+            state.apply(match.group(1))
+
+    if state.is_default:
+        return line, ''
+
+    return line + RESET_SEQUENCE, state.sequence()
+
+
+class _ThreadBuffer:
+    __slots__ = ('parts', 'carry')
+
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        self.carry = ''
+
+
+class LineSink:
+    def __init__(self, stream: Optional[TextIO] = None,
+                 flush_interval: float = 0.05,
+                 max_batch_size: int = 1 << 16,
+                 max_pending: int = 10_000) -> None:
+        if flush_interval <= 0:
+            raise ValueError(f'Invalid flush interval: {flush_interval}')
+
+        self.stream = sys.stdout if stream is None else stream
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_pending = max_pending
+
+        # Appending to a deque is atomic, so producers never take a lock
+        # unless the writer falls behind
+        self._queue: Deque[str] = deque()
+        self._local = threading.local()
+        self._buffers: List[Tuple[threading.Thread, _ThreadBuffer]] = []
+        self._buffers_lock = threading.Lock()
+
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.chunks = 0
+        self.batches = 0
+
+    def _retire(self, buffer: _ThreadBuffer) -> None:
+        # Unfinished lines are still written, each on a line of its own
+        line = ''.join(buffer.parts)
+        buffer.parts.clear()
+
+        if line:
+            line = seal_line(buffer.carry + line)[0]
+            self._queue.append(line + '\n')
+
+        buffer.carry = ''
+
+    def _buffer(self) -> _ThreadBuffer:
+        buffer = self._local.buffer = _ThreadBuffer()
+
+        with self._buffers_lock:
+            # Buffers of threads that are gone are dropped here, so pools
+            # that keep replacing their threads don't pile them up
+            live = []
+
+            for thread, old in self._buffers:
+                if thread.is_alive():
+                    live.append((thread, old))
+                else:
+                    self._retire(old)
+
+            live.append((threading.current_thread(), buffer))
+            self._buffers = live
+
+        return buffer
+
+    def _publish(self, chunk: str) -> None:
+        queue = self._queue
+        was_empty = not queue
+        queue.append(chunk)
+
+        # A missed wakeup only delays the chunk until the next interval
+        if was_empty:
+            self._wakeup.set()
+        elif len(queue) >= self.max_pending:
+            self._drain()
+
+    def write(self, text: str) -> int:
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._buffer()
+
+        end = text.rfind('\n')
+
+        # print writes every argument separately, this is the common case
+        if end < 0:
+            buffer.parts.append(text)
+            return len(text)
+
+        complete = text[:end]
+        if buffer.parts:
+            complete = ''.join(buffer.parts) + complete
+            buffer.parts.clear()
+
+        if end + 1 < len(text):
+            buffer.parts.append(text[end + 1:])
+
+        if buffer.carry or '\x1b' in complete:
+            lines = []
+
+            for line in complete.split('\n'):
+                line, buffer.carry = seal_line(buffer.carry + line)
+                lines.append(line)
+
+            complete = '\n'.join(lines)
+
+        self._publish(complete + '\n')
+
+        return len(text)
+
+    def _drain(self) -> None:
+        with self._write_lock:
+            queue = self._queue
+            write = self.stream.write
+
+            while queue:
+                batch = []
+                size = 0
+
+                while queue and size < self.max_batch_size:
+                    chunk = queue.popleft()
+                    batch.append(chunk)
+                    size += len(chunk)
+
+                write(''.join(batch))
+                self.chunks += len(batch)
+                self.batches += 1
+
+            self.stream.flush()
+
+    def flush(self) -> None:
+        # Only complete lines are written, a partial one would tear
+        self._drain()
+
+    def isatty(self) -> bool:
+        try:
+            return self.stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._drain()
+
+    def start(self) -> 'LineSink':
+        if self._thread is not None:
+            raise RuntimeError('Line sink is already running')
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='sroloc-line-sink', daemon=True
+        )
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+
+        with self._buffers_lock:
+            for _, buffer in self._buffers:
+                self._retire(buffer)
+
+        self._drain()
+
+    def __enter__(self) -> 'LineSink':
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
@@ -0,0 +1,149 @@
+import importlib
+from dataclasses import dataclass
+from typing import Type, Tuple, Optional, Dict, Iterable, List
+
+from sroloc.color.ansi import BasicColor, ExtendedColor
+from sroloc.color.bank import ColorBank
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+from sroloc.printing.color_segment import ColorSegment
+
+_BASE_SCHEMES: Dict[str, Type[ColorBank]] = {  # type: ignore
+    'BasicColor': BasicColor,
+    'ExtendedColor': ExtendedColor,
+    'TrueColor': TrueColor,
+}
+
+
+@dataclass(frozen=True)
+class SchemeSnapshot:
+    module: str
+    qualname: str
+    base: str
+    names: Tuple[str, ...]
+    colors: bytes  # 4 bytes (r, g, b, a) per TrueColor color, 1 otherwise
+    default_color: Optional[bytes]
+    spec_names: Tuple[str, ...]
+    spec_prefixes: Tuple[bytes, ...]
+    # Translucent colors in the prefixes are blended with it
+    terminal_background: Optional[bytes] = None
+
+
+def _find_base_name(scheme: Type[ColorBank]) -> str:  # type: ignore
+    for klass in scheme.__mro__:
+        if klass in _BASE_SCHEMES.values():
+            return klass.__name__
+
+    raise TypeError(
+        f'Cannot snapshot color scheme {scheme.__name__!r}, '
+        'it does not derive from any built-in color scheme'
+    )
+
+
+def _pack_color(color: object) -> bytes:
+    if isinstance(color, RgbColor):
+        return bytes((*color, color.a))
+
+    return bytes((color,))  # type: ignore
+
+
+def _unpack_colors(data: bytes, is_true_color: bool) -> List[object]:
+    if not is_true_color:
+        return list(data)
+
+    return [
+        RgbColor(*data[i:i + 4])
+        for i in range(0, len(data), 4)
+    ]
+
+
+def take_snapshot(scheme: Optional[Type[ColorBank]] = None,  # type: ignore
+                  specs: Iterable[str] = ()) -> SchemeSnapshot:
+    if scheme is None:
+        scheme = ColorSegment._COLOR_SCHEME
+
+    base = _find_base_name(scheme)
+    bank = scheme._flat_bank()
+
+    spec_table: Dict[str, str] = {}
+    if scheme is ColorSegment._COLOR_SCHEME:
+        spec_table.update(ColorSegment._spec_table())
+
+    for spec in specs:
+        if spec not in spec_table:
+            # Compiling requires the scheme to be active
+            if scheme is not ColorSegment._COLOR_SCHEME:
+                raise ValueError(
+                    'Specs can only be compiled for the active color scheme'
+                )
+
+            spec_table[spec] = ColorSegment.compile_spec(spec)
+
+    default_color = scheme._DEFAULT_COLOR
+    terminal_background = (_pack_color(scheme._TERMINAL_BACKGROUND)
+                           if issubclass(scheme, TrueColor) else None)
+
+    return SchemeSnapshot(
+        module=scheme.__module__,
+        qualname=scheme.__qualname__,
+        base=base,
+        names=tuple(bank),
+        colors=b''.join(map(_pack_color, bank.values())),
+        default_color=(None if default_color is None
+                       else _pack_color(default_color)),
+        spec_names=tuple(spec_table),
+        spec_prefixes=tuple(p.encode() for p in spec_table.values()),
+        terminal_background=terminal_background,
+    )
+
+
+def _resolve_scheme(
+        snapshot: SchemeSnapshot
+) -> Type[ColorBank]:  # type: ignore
+    base = _BASE_SCHEMES[snapshot.base]
+
+    try:
+        scheme: object = importlib.import_module(snapshot.module)
+        for name in snapshot.qualname.split('.'):
+            scheme = getattr(scheme, name)
+    except (ImportError, AttributeError):
+        scheme = None
+
+    if isinstance(scheme, type) and issubclass(scheme, base):
+        return scheme
+
+    # Schemes defined dynamically (or not importable) are recreated
+    name = snapshot.qualname.rpartition('.')[2]
+    return type(name, (base,), {'__module__': snapshot.module})
+
+
+def install_snapshot(
+        snapshot: SchemeSnapshot
+) -> Type[ColorBank]:  # type: ignore
+    scheme = _resolve_scheme(snapshot)
+    is_true_color = issubclass(scheme, TrueColor)
+
+    colors = _unpack_colors(snapshot.colors, is_true_color)
+    scheme._BANK = dict(zip(snapshot.names, colors))
+
+    if snapshot.default_color is None:
+        scheme._DEFAULT_COLOR = None
+    else:
+        scheme._DEFAULT_COLOR = \
+            _unpack_colors(snapshot.default_color, is_true_color)[0]
+
+    if (snapshot.terminal_background is not None
+            and issubclass(scheme, TrueColor)):
+        background = RgbColor(*snapshot.terminal_background)
+
+        if background != scheme._TERMINAL_BACKGROUND:
+            scheme.set_terminal_background(background)
+
+    ColorSegment.set_color_scheme(scheme)
+
+    ColorSegment._publish_prefixes(scheme, dict(zip(
+        snapshot.spec_names,
+        (prefix.decode() for prefix in snapshot.spec_prefixes)
+    )))
+
+    return scheme
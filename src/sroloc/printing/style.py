@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+from typing import Type, Optional, Tuple, List
+
+from sroloc.color.bank import ColorBank
+from sroloc.color.utils import UnknownColorError
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.modifiers import ColorModifier, TextModifier
+from sroloc.printing.sgr import RESET_SEQUENCE
+
+
+@dataclass(frozen=True)
+class Style:
+    fg_color: Optional[str] = None
+    bg_color: Optional[str] = None
+    color_mod: Optional[ColorModifier] = None
+    text_mods: Tuple[TextModifier, ...] = ()
+    color_scheme: Optional[Type[ColorBank]] = None  # type: ignore
+    sgr_parameters: str = field(init=False, repr=False, compare=False)
+    prefix: str = field(init=False, repr=False, compare=False)
+    suffix: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.color_scheme is None:
+            object.__setattr__(
+                self, 'color_scheme', ColorSegment._COLOR_SCHEME
+            )
+
+        # Canonical order makes equal styles render to identical bytes
+        object.__setattr__(
+            self, 'text_mods', tuple(sorted(set(self.text_mods)))
+        )
+
+        sgr_parameters = self._build_sgr_parameters()
+        object.__setattr__(self, 'sgr_parameters', sgr_parameters)
+
+        if sgr_parameters:
+            object.__setattr__(self, 'prefix', f'\x1b[{sgr_parameters}m')
+            object.__setattr__(self, 'suffix', RESET_SEQUENCE)
+        else:
+            object.__setattr__(self, 'prefix', '')
+            object.__setattr__(self, 'suffix', '')
+
+    def _build_sgr_parameters(self) -> str:
+        scheme = self.color_scheme
+        assert scheme is not None
+
+        elements: List[str] = []
+
+        if self.color_mod:
+            elements.append(str(self.color_mod.value))
+
+        for color in (self.fg_color, self.bg_color):
+            if color is not None and not scheme.has_color(color):
+                raise UnknownColorError(color)
+
+        # Same hook as format specs, so translucent colors blend alike
+        elements.extend(scheme.color_codes(self.fg_color, self.bg_color))
+
+        for mod in self.text_mods:
+            elements.append(str(mod.value))
+
+        return ';'.join(elements)
+
+    @classmethod
+    def parse(cls, format_spec: str) -> 'Style':
+        injector = ColorSegment.build_injector(format_spec)
+
+        return cls(
+            fg_color=injector.fg_color,
+            bg_color=injector.bg_color,
+            color_mod=injector.color_mod,
+            text_mods=tuple(injector.text_mods),
+            color_scheme=injector.color_scheme
+        )
+
+    def apply(self, text: str) -> str:
+        return f'{self.prefix}{text}{self.suffix}'
+
+    def __add__(self, other: object) -> 'Style':
+        if not isinstance(other, Style):
+            return NotImplemented
+
+        if other.color_scheme is not self.color_scheme:
+            raise ValueError(
+                'Cannot combine styles of different color schemes: '
+                f'{self.color_scheme.__name__!r} and '  # type: ignore
+                f'{other.color_scheme.__name__!r}'  # type: ignore
+            )
+
+        return Style(
+            fg_color=other.fg_color or self.fg_color,
+            bg_color=other.bg_color or self.bg_color,
+            color_mod=(self.color_mod if other.color_mod is None
+                       else other.color_mod),
+            text_mods=self.text_mods + other.text_mods,
+            color_scheme=self.color_scheme
+        )
@@ -0,0 +1,230 @@
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Union, Iterator, Tuple
+
+from sroloc.printing.style import Style
+
+StyleLike = Union[Style, str, None]
+
+
+class StyledText:
+    def __init__(self, text: str = '', style: StyleLike = None) -> None:
+        # Text is kept in a single buffer, appends are joined lazily
+        self._chunks: List[str] = []
+        self._length = 0
+
+        # Parallel arrays of non-overlapping spans sorted by start
+        self._starts = array('L')
+        self._ends = array('L')
+        self._style_ids = array('H')
+
+        # Style table, id 0 is reserved for unstyled text
+        self._styles: List[Optional[Style]] = [None]
+        self._style_table: Dict[Style, int] = {}
+        self._parsed_specs: Dict[str, Style] = {}
+
+        if text:
+            self.append(text, style)
+
+    def _intern_style(self, style: StyleLike) -> int:
+        if isinstance(style, str):
+            spec = style
+
+            try:
+                style = self._parsed_specs[spec]
+            except KeyError:
+                style = self._parsed_specs[spec] = Style.parse(spec)
+
+        if style is None or not style.prefix:
+            return 0
+
+        try:
+            return self._style_table[style]
+        except KeyError:
+            style_id = len(self._styles)
+            self._styles.append(style)
+            self._style_table[style] = style_id
+            return style_id
+
+    def _add_span(self, start: int, end: int, style_id: int) -> None:
+        if not style_id or start >= end:
+            return
+
+        if (self._ends and self._ends[-1] == start
+                and self._style_ids[-1] == style_id):
+            self._ends[-1] = end
+            return
+
+        self._starts.append(start)
+        self._ends.append(end)
+        self._style_ids.append(style_id)
+
+    @property
+    def plain(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = [''.join(self._chunks)]
+
+        return self._chunks[0] if self._chunks else ''
+
+    @property
+    def styles(self) -> Tuple[Optional[Style], ...]:
+        return tuple(self._styles)
+
+    def spans(self) -> Iterator[Tuple[int, int, Style]]:
+        for start, end, style_id in zip(self._starts, self._ends,
+                                        self._style_ids):
+            yield start, end, self._styles[style_id]  # type: ignore
+
+    def append(self, text: str, style: StyleLike = None) -> 'StyledText':
+        if not text:
+            return self
+
+        start = self._length
+        self._chunks.append(text)
+        self._length += len(text)
+        self._add_span(start, self._length, self._intern_style(style))
+
+        return self
+
+    def append_styled(self, other: 'StyledText') -> 'StyledText':
+        offset = self._length
+        style_ids = [self._intern_style(style) for style in other._styles]
+
+        # Taken up front, other may be this very text
+        spans = list(zip(other._starts, other._ends, other._style_ids))
+
+        self._chunks.append(other.plain)
+        self._length += len(other)
+
+        for start, end, style_id in spans:
+            self._add_span(start + offset, end + offset, style_ids[style_id])
+
+        return self
+
+    def restyle(self, start: int, end: int, style: StyleLike) -> None:
+        start, end, _ = slice(start, end).indices(self._length)
+        if start >= end:
+            return
+
+        style_id = self._intern_style(style)
+        starts, ends, style_ids = self._starts, self._ends, self._style_ids
+
+        self._starts, self._ends, self._style_ids = \
+            array('L'), array('L'), array('H')
+
+        inserted = False
+        for span_start, span_end, span_style in zip(starts, ends, style_ids):
+            if span_end <= start or span_start >= end:
+                if span_start >= end and not inserted:
+                    self._add_span(start, end, style_id)
+                    inserted = True
+
+                self._add_span(span_start, span_end, span_style)
+                continue
+
+            self._add_span(span_start, min(span_end, start), span_style)
+
+            if not inserted:
+                self._add_span(start, end, style_id)
+                inserted = True
+
+            self._add_span(max(span_start, end), span_end, span_style)
+
+        if not inserted:
+            self._add_span(start, end, style_id)
+
+    def _slice(self, start: int, end: int) -> 'StyledText':
+        result = StyledText()
+        result._styles = self._styles.copy()
+        result._style_table = self._style_table.copy()
+        result._parsed_specs = self._parsed_specs
+
+        text = self.plain[start:end]
+        if not text:
+            return result
+
+        result._chunks.append(text)
+        result._length = len(text)
+
+        # First span that may overlap the slice
+        i = max(bisect_right(self._starts, start) - 1, 0)
+
+        while i < len(self._starts) and self._starts[i] < end:
+            result._add_span(
+                max(self._starts[i], start) - start,
+                min(self._ends[i], end) - start,
+                self._style_ids[i]
+            )
+            i += 1
+
+        return result
+
+    def __getitem__(self, key: Union[int, slice]) -> 'StyledText':
+        if isinstance(key, int):
+            if key < 0:
+                key += self._length
+
+            if not 0 <= key < self._length:
+                raise IndexError('StyledText index out of range')
+
+            return self._slice(key, key + 1)
+
+        start, end, step = key.indices(self._length)
+        if step != 1:
+            raise ValueError('StyledText slicing does not support steps')
+
+        return self._slice(start, end)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iadd__(self, other: object) -> 'StyledText':
+        if isinstance(other, StyledText):
+            return self.append_styled(other)
+
+        if isinstance(other, str):
+            return self.append(other)
+
+        return NotImplemented
+
+    def render(self) -> str:
+        text = self.plain
+        styles = self._styles
+        output: List[str] = []
+        position = 0
+
+        n = len(self._starts)
+        i = 0
+        while i < n:
+            start, end = self._starts[i], self._ends[i]
+            style_id = self._style_ids[i]
+
+            # Merge adjacent spans sharing a style
+            while (i + 1 < n and self._starts[i + 1] == end
+                   and self._style_ids[i + 1] == style_id):
+                i += 1
+                end = self._ends[i]
+
+            style = styles[style_id]
+            assert style is not None
+
+            output.append(text[position:start])
+            output.append(style.prefix)
+            output.append(text[start:end])
+            output.append(style.suffix)
+
+            position = end
+            i += 1
+
+        output.append(text[position:])
+
+        return ''.join(output)
+
+    def to_bytes(self, encoding: str = 'utf-8') -> bytes:
+        return self.render().encode(encoding)
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __repr__(self) -> str:
+        return f'StyledText({self.plain!r}, spans={len(self._starts)})'
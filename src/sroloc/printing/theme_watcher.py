@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+from typing import Callable, Iterable, Optional, Tuple, Type
+
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+from sroloc.printing.color_segment import ColorSegment
+
+ReloadCallback = Callable[[Type[TrueColor]], None]
+ErrorCallback = Callable[[Exception], None]
+
+
+class ThemeLoadError(ValueError):
+    def __init__(self, path: str, reason: str) -> None:
+        self.path = path
+        super().__init__(f'Could not load theme {path!r}: {reason}')
+
+
+def load_theme(path: str, base: Type[TrueColor] = TrueColor,
+               name: Optional[str] = None) -> Type[TrueColor]:
+    try:
+        with open(path, encoding='utf-8') as file:
+            colors = json.load(file)
+    except (OSError, ValueError) as error:
+        raise ThemeLoadError(path, str(error)) from error
+
+    if not isinstance(colors, dict):
+        raise ThemeLoadError(path, 'expected a mapping of colors')
+
+    try:
+        bank = {
+            color_name: RgbColor.from_hex(value)
+            for color_name, value in colors.items()
+        }
+    except (ValueError, AttributeError) as error:
+        raise ThemeLoadError(path, str(error)) from error
+
+    if name is None:
+        name = os.path.splitext(os.path.basename(path))[0].title() + 'Theme'
+
+    # A brand new class, so the theme in use is never modified in place
+    return type(name, (base,), {'_BANK': bank})  # type: ignore
+
+
+class ThemeWatcher:
+    def __init__(self, path: str, base: Type[TrueColor] = TrueColor,
+                 interval: float = 1.0, specs: Iterable[str] = (),
+                 on_reload: Optional[ReloadCallback] = None,
+                 on_error: Optional[ErrorCallback] = None) -> None:
+        self.path = path
+        self.base = base
+        self.interval = interval
+        self.specs = tuple(specs)
+        self.on_reload = on_reload
+        self.on_error = on_error
+
+        self.theme: Optional[Type[TrueColor]] = None
+        self.last_error: Optional[Exception] = None
+
+        self._signature: Optional[Tuple[int, int]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self) -> Type[TrueColor]:
+        # Specs in use right now are compiled for the new theme up front
+        specs = list(self.specs)
+        specs.extend(ColorSegment._spec_table())
+
+        theme = load_theme(self.path, self.base)
+
+        ColorSegment.set_color_scheme(theme, specs)
+        self.theme = theme
+
+        if self.on_reload is not None:
+            self.on_reload(theme)
+
+        return theme
+
+    def check(self) -> bool:
+        signature = self._file_signature()
+
+        if signature is None or signature == self._signature:
+            return False
+
+        self._signature = signature
+
+        try:
+            self.reload()
+        except ThemeLoadError as error:
+            # Broken themes (e.g. saved halfway) keep the current one active
+            self.last_error = error
+            if self.on_error is not None:
+                self.on_error(error)
+
+            return False
+
+        self.last_error = None
+
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> 'ThemeWatcher':
+        if self._thread is not None:
+            raise RuntimeError('Theme watcher is already running')
+
+        self.check()
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='sroloc-theme-watcher', daemon=True
+        )
+        self._thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self) -> 'ThemeWatcher':
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
@@ -0,0 +1,247 @@
+import linecache
+import logging
+import sys
+import threading
+import traceback
+from types import TracebackType
+from typing import (
+    Any, Callable, Dict, List, Mapping, Optional, TextIO, Tuple, Type
+)
+
+from sroloc.color.bank import get_bank_version
+from sroloc.printing.color_segment import (
+    ColorSegment, compile_styles, get_format_version
+)
+from sroloc.printing.sgr import RESET_SEQUENCE
+
+DEFAULT_TRACEBACK_STYLES: Dict[str, str] = {
+    'header': 'b',
+    'filename': 'cyan',
+    'lineno': 'yellow',
+    'name': 'purple',
+    'source': '',
+    'exception': 'b red',
+}
+
+_CAUSE_MESSAGE = (
+    '\nThe above exception was the direct cause '
+    'of the following exception:\n\n'
+)
+_CONTEXT_MESSAGE = (
+    '\nDuring handling of the above exception, '
+    'another exception occurred:\n\n'
+)
+
+FrameKey = Tuple[str, Optional[int], str, Optional[str]]
+
+
+class TracebackRenderer:
+    FRAME_CACHE_MAX_SIZE: int = 4096
+
+    def __init__(self, styles: Optional[Mapping[str, str]] = None) -> None:
+        self.styles = dict(DEFAULT_TRACEBACK_STYLES)
+
+        if styles is not None:
+            self.styles.update(styles)
+
+        self._compiled: Tuple[Any, Dict[str, str], Dict[FrameKey, str]] = (
+            None, {}, {}
+        )
+
+        # Invalid custom styles fail here, not in the middle of a crash
+        self._tables()
+
+    def _tables(self) -> Tuple[Dict[str, str], Dict[FrameKey, str]]:
+        key = (ColorSegment._COLOR_SCHEME, get_format_version(),
+               get_bank_version())
+        compiled = self._compiled
+
+        if compiled[0] != key:
+            # Rendered frames are only valid for the styles they were
+            # rendered with, so they're dropped together
+            compiled = (
+                key, compile_styles(DEFAULT_TRACEBACK_STYLES, self.styles), {}
+            )
+            self._compiled = compiled
+
+        return compiled[1], compiled[2]
+
+    @staticmethod
+    def _paint(prefixes: Dict[str, str], kind: str, text: str) -> str:
+        prefix = prefixes[kind]
+        return f'{prefix}{text}{RESET_SEQUENCE}' if prefix else text
+
+    def render_frame(self, filename: str, lineno: Optional[int], name: str,
+                     line: Optional[str] = None) -> str:
+        prefixes, frames = self._tables()
+        key = (filename, lineno, name, line)
+
+        try:
+            return frames[key]
+        except KeyError:
+            pass
+
+        paint = self._paint
+        rendered = (
+            f'  File "{paint(prefixes, "filename", filename)}", '
+            f'line {paint(prefixes, "lineno", str(lineno))}, '
+            f'in {paint(prefixes, "name", name)}\n'
+        )
+
+        if line:
+            rendered += f'    {paint(prefixes, "source", line.strip())}\n'
+
+        if len(frames) >= self.FRAME_CACHE_MAX_SIZE:
+            frames.clear()
+
+        frames[key] = rendered
+
+        return rendered
+
+    def _render_single(self, exc_type: Type[BaseException],
+                       exc_value: BaseException,
+                       exc_traceback: Optional[TracebackType],
+                       output: List[str]) -> None:
+        prefixes = self._tables()[0]
+
+        if exc_traceback is not None:
+            output.append(
+                self._paint(prefixes, 'header',
+                            'Traceback (most recent call last):') + '\n'
+            )
+
+            # Walking frames directly skips building a StackSummary,
+            # which costs more than rendering cached frames
+            for frame, lineno in traceback.walk_tb(exc_traceback):
+                code = frame.f_code
+                filename = code.co_filename
+                line = linecache.getline(filename, lineno, frame.f_globals)
+
+                output.append(self.render_frame(
+                    filename, lineno, code.co_name, line.strip() or None
+                ))
+
+        for line in traceback.format_exception_only(exc_type, exc_value):
+            output.append(
+                self._paint(prefixes, 'exception', line.rstrip('\n')) + '\n'
+            )
+
+    def render(self, exc_type: Type[BaseException],
+               exc_value: BaseException,
+               exc_traceback: Optional[TracebackType]) -> str:
+        # Iterative, so very long chains can't hit the recursion limit
+        chain: List[Tuple[Optional[str], BaseException]] = []
+        seen = set()
+        current: Optional[BaseException] = exc_value
+        message: Optional[str] = None
+
+        while current is not None and id(current) not in seen:
+            seen.add(id(current))
+            chain.append((message, current))
+
+            if current.__cause__ is not None:
+                message, current = _CAUSE_MESSAGE, current.__cause__
+            elif (current.__context__ is not None
+                  and not current.__suppress_context__):
+                message, current = _CONTEXT_MESSAGE, current.__context__
+            else:
+                current = None
+
+        output: List[str] = []
+
+        for i, (message, current) in enumerate(reversed(chain)):
+            if i == len(chain) - 1:
+                # The outermost exception is rendered as passed in
+                self._render_single(exc_type, exc_value, exc_traceback,
+                                    output)
+            else:
+                self._render_single(type(current), current,
+                                    current.__traceback__, output)
+
+            if message is not None:
+                output.append(message)
+
+        return ''.join(output)
+
+    def render_exception(self, exception: BaseException) -> str:
+        return self.render(
+            type(exception), exception, exception.__traceback__
+        )
+
+    def lazy(self, exception: BaseException) -> 'LazyTraceback':
+        return LazyTraceback(self, exception)
+
+
+class LazyTraceback:
+    def __init__(self, renderer: TracebackRenderer,
+                 exception: BaseException) -> None:
+        self.renderer = renderer
+        self.exception = exception
+
+    def __str__(self) -> str:
+        return self.renderer.render_exception(self.exception)
+
+
+class TracebackFormatter(logging.Formatter):
+    def __init__(self, *args: Any,
+                 renderer: Optional[TracebackRenderer] = None,
+                 **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.renderer = TracebackRenderer() if renderer is None else renderer
+
+    def formatException(self, ei: Any) -> str:
+        # Called by logging only for records the handler actually emits
+        return self.renderer.render(*ei).rstrip('\n')
+
+
+_previous_hooks: Optional[Tuple[Callable[..., Any], Callable[..., Any]]] = \
+    None
+
+
+def install(renderer: Optional[TracebackRenderer] = None,
+            stream: Optional[TextIO] = None) -> TracebackRenderer:
+    global _previous_hooks
+
+    if renderer is None:
+        renderer = TracebackRenderer()
+
+    def write(text: str) -> None:
+        output = sys.stderr if stream is None else stream
+
+        if output is not None:
+            output.write(text)
+            output.flush()
+
+    def excepthook(exc_type: Type[BaseException], exc_value: BaseException,
+                   exc_traceback: Optional[TracebackType]) -> None:
+        write(renderer.render(exc_type, exc_value,  # type: ignore
+                              exc_traceback))
+
+    def thread_excepthook(args: Any) -> None:
+        if args.exc_type is SystemExit:
+            return
+
+        name = args.thread.name if args.thread is not None else None
+        write(
+            f'Exception in thread {name}:\n'
+            + renderer.render(args.exc_type,  # type: ignore
+                              args.exc_value, args.exc_traceback)
+        )
+
+    if _previous_hooks is None:
+        _previous_hooks = (sys.excepthook, threading.excepthook)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
+
+    return renderer
+
+
+def uninstall() -> None:
+    global _previous_hooks
+
+    if _previous_hooks is None:
+        return
+
+    sys.excepthook, threading.excepthook = _previous_hooks
+    _previous_hooks = None
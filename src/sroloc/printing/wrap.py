@@ -0,0 +1,171 @@
+import re
+from typing import List
+
+from sroloc.printing.sgr import SgrState, RESET_SEQUENCE
+
+_TOKEN_REGEX = re.compile(
+    r'(?P<escape>\x1b\[(?P<parameters>[0-?]*)[ -/]*(?P<final>[@-~]))'
+    r'|(?P<newline>\n)'
+    r'|(?P<space>[^\S\n]+)'
+    r'|(?P<text>[^\x1b\s]+|\x1b)'
+)
+
+
+class _LineBuilder:
+    def __init__(self, width: int, break_long_words: bool) -> None:
+        self.width = width
+        self.break_long_words = break_long_words
+        self.state = SgrState()
+        self.lines: List[str] = []
+        self.parts: List[str] = ['']
+        self.line_width = 0
+
+    def end_line(self) -> None:
+        if not self.state.is_default:
+            self.parts.append(RESET_SEQUENCE)
+
+        self.lines.append(''.join(self.parts))
+
+        # Continuation lines re-open the style active at the break
+        self.parts = [self.state.sequence()]
+        self.line_width = 0
+
+    def add_escape(self, escape: str, parameters: str, final: str) -> None:
+        self.parts.append(escape)
+
+        if final == 'm':
+            self.state.apply(parameters)
+
+    def add_text(self, text: str) -> None:
+        while self.break_long_words \
+                and self.line_width + len(text) > self.width:
+            room = self.width - self.line_width
+            if room <= 0:
+                self.end_line()
+                continue
+
+            self.parts.append(text[:room])
+            self.line_width += room
+            text = text[room:]
+
+        self.parts.append(text)
+        self.line_width += len(text)
+
+    def add_word(self, space: str, word: List[re.Match],  # type: ignore
+                 word_width: int) -> None:
+        if word_width == 0:
+            # Escapes not followed by text do not need any space
+            for match in word:
+                self.add_escape(*match.group('escape', 'parameters', 'final'))
+            return
+
+        fits = self.line_width + len(space) + word_width <= self.width
+
+        # Words longer than a whole line are broken to fill the current one
+        if not fits and not (self.break_long_words
+                             and word_width > self.width
+                             and self.line_width + len(space) < self.width):
+            if self.line_width > 0:
+                self.end_line()
+        elif space:
+            self.parts.append(space)
+            self.line_width += len(space)
+
+        for match in word:
+            if match.lastgroup == 'text':
+                self.add_text(match.group())
+            else:
+                self.add_escape(*match.group('escape', 'parameters', 'final'))
+
+    def finish(self) -> List[str]:
+        if self.line_width > 0 or len(self.parts) > 1 or not self.lines:
+            if not self.state.is_default:
+                self.parts.append(RESET_SEQUENCE)
+
+            self.lines.append(''.join(self.parts))
+
+        return self.lines
+
+
+def wrap(text: str, width: int = 70, *,
+         break_long_words: bool = True) -> List[str]:
+    if width <= 0:
+        raise ValueError(f'Invalid width: {width}')
+
+    builder = _LineBuilder(width, break_long_words)
+
+    space = ''
+    word: List[re.Match] = []  # type: ignore
+    word_width = 0
+    at_paragraph_start = True
+
+    for match in _TOKEN_REGEX.finditer(text):
+        kind = match.lastgroup
+
+        if kind == 'text':
+            word.append(match)
+            word_width += match.end() - match.start()
+            continue
+
+        if kind == 'escape':
+            word.append(match)
+            continue
+
+        if word:
+            builder.add_word(space, word, word_width)
+            at_paragraph_start = at_paragraph_start and word_width == 0
+            space, word, word_width = '', [], 0
+
+        if kind == 'space':
+            # Indentation is only kept at the beginning of a paragraph
+            if at_paragraph_start or builder.line_width > 0:
+                space = match.group()
+        else:
+            builder.end_line()
+            space = ''
+            at_paragraph_start = True
+
+    if word:
+        builder.add_word(space, word, word_width)
+
+    return builder.finish()
+
+
+def fill(text: str, width: int = 70, *, break_long_words: bool = True) -> str:
+    return '\n'.join(wrap(text, width, break_long_words=break_long_words))
+
+
+def truncate(text: str, width: int, placeholder: str = '…') -> str:
+    if width < len(placeholder):
+        raise ValueError(
+            f'Width {width} is too small for placeholder {placeholder!r}'
+        )
+
+    cut_width = width - len(placeholder)
+    cut_index = -1
+    cut_state_is_default = True
+
+    state = SgrState()
+    visible = 0
+
+    for match in _TOKEN_REGEX.finditer(text):
+        if match.lastgroup == 'escape':
+            if match.group('final') == 'm':
+                state.apply(match.group('parameters'))
+            continue
+
+        length = match.end() - match.start()
+
+        if cut_index < 0 and visible + length >= cut_width:
+            cut_index = match.start() + cut_width - visible
+            cut_state_is_default = state.is_default
+
+        visible += length
+        if visible > width:
+            break
+    else:
+        return text
+
+    suffix = '' if cut_state_is_default else RESET_SEQUENCE
+
+    return text[:cut_index] + placeholder + suffix
@@ -0,0 +1,12 @@
+import pytest
+
+from sroloc.color.ansi import BasicColor
+from sroloc.printing.color_segment import ColorSegment
+
+
+@pytest.fixture(scope='function', autouse=True)
+def basic_color_scheme():
+    previous_color_scheme = ColorSegment._COLOR_SCHEME
+    ColorSegment._COLOR_SCHEME = BasicColor
+    yield BasicColor
+    ColorSegment._COLOR_SCHEME = previous_color_scheme
@@ -0,0 +1,97 @@
+import pytest
+
+from sroloc.color.ansi import BasicColor, ExtendedColor
+from sroloc.printing.accessors import StyleAccessor, style
+from sroloc.printing.color_segment import ColorSegment
+
+
+@pytest.fixture(scope='function')
+def accessor():
+    return StyleAccessor()
+
+
+def test_color_accessor(accessor):
+    assert accessor.red('text') == '\x1b[31mtext\x1b[0m'
+
+
+def test_chained_accessors(accessor):
+    assert accessor.b.red_on_cyan('text') == \
+        f'{ColorSegment("text"):b red/cyan}'
+    assert accessor.u.on_blue('text') == '\x1b[44;4mtext\x1b[0m'
+
+
+def test_accessors_are_cached(accessor):
+    assert accessor.bold.red is accessor.bold.red
+    assert 'red' in vars(accessor.bold)
+
+
+def test_unknown_attribute(accessor):
+    with pytest.raises(AttributeError):
+        accessor.not_a_color
+
+    assert hasattr(accessor, 'hot_pink') is False
+
+
+def test_accessor_follows_scheme_changes(accessor):
+    assert accessor.red('x') == '\x1b[31mx\x1b[0m'
+
+    ColorSegment.set_color_scheme(ExtendedColor)
+    assert accessor.red('x') == '\x1b[38;5;9mx\x1b[0m'
+    assert accessor.hot_pink('x') == '\x1b[38;5;205mx\x1b[0m'
+
+
+def test_accessor_follows_bank_changes(accessor):
+    class Theme(BasicColor):
+        pass
+
+    ColorSegment.set_color_scheme(Theme)
+    accessor.red('x')
+
+    Theme.add_color_to_bank('red', 2)
+
+    assert accessor.red('x') == '\x1b[32mx\x1b[0m'
+
+
+def test_cached_accessors_are_validated_again(accessor, monkeypatch):
+    red_on_blue = accessor.red_on_blue
+
+    monkeypatch.setattr(ColorSegment, 'COLOR_SPLITTER', ':')
+    assert red_on_blue('x') == '\x1b[31;44mx\x1b[0m'
+    assert red_on_blue.spec == 'red:blue'
+
+    ColorSegment.set_color_scheme(ExtendedColor)
+    hot_pink = accessor.hot_pink
+    ColorSegment.set_color_scheme(BasicColor)
+
+    with pytest.raises(AttributeError):
+        hot_pink('x')
+
+    with pytest.raises(AttributeError):
+        accessor.hot_pink('x')
+
+
+def test_empty_accessor_returns_text(accessor):
+    assert accessor('text') == 'text'
+    assert accessor.spec == ''
+
+
+def test_color_segment_shortcuts():
+    assert ColorSegment.bold.red('text') == style.bold.red('text')
+
+    with pytest.raises(AttributeError):
+        ColorSegment.not_a_color
+
+
+def test_color_segment_forwards_only_style_names():
+    assert hasattr(ColorSegment, 'red') is True
+    assert hasattr(ColorSegment, 'not_a_color') is False
+
+    with pytest.raises(AttributeError, match='has no attribute'):
+        ColorSegment.COLOR_SPLITER
+
+
+def test_dir_lists_modifiers_and_colors(accessor):
+    names = dir(accessor)
+
+    assert 'bold' in names
+    assert 'purple' in names
@@ -0,0 +1,113 @@
+import pytest
+
+from sroloc.color.alpha import composite_colors
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor, _composite
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.markup import render_markup
+from sroloc.printing.snapshot import install_snapshot, take_snapshot
+from sroloc.printing.style import Style
+from sroloc.printing.styled_text import StyledText
+
+
+class OverlayTheme(TrueColor):
+    pass
+
+
+OverlayTheme.add_hex_colors_to_bank({
+    'overlay': '#ff000080',
+    'blue': '#0000ff',
+    'glass': '#ffffff00',
+})
+
+
+@pytest.fixture(scope='function', autouse=True)
+def overlay_color_scheme():
+    previous_color_scheme = ColorSegment._COLOR_SCHEME
+    ColorSegment._COLOR_SCHEME = OverlayTheme
+    yield OverlayTheme
+    ColorSegment._COLOR_SCHEME = previous_color_scheme
+    OverlayTheme.set_terminal_background(TrueColor._TERMINAL_BACKGROUND)
+
+
+def test_translucent_fg_is_composited_against_explicit_bg():
+    assert ColorSegment.compile_spec('overlay/blue') == \
+        '\x1b[38;2;128;0;127;48;2;0;0;255m'
+
+
+def test_styles_blend_like_format_specs():
+    expected = f'{ColorSegment("x"):overlay/blue}'
+
+    assert Style.parse('overlay/blue').apply('x') == expected
+    assert render_markup('[overlay/blue]x[/]') == expected
+    assert StyledText('x', 'overlay/blue').render() == expected
+
+
+def test_snapshots_keep_terminal_background():
+    OverlayTheme.set_terminal_background(RgbColor(255, 255, 255))
+    snapshot = take_snapshot(specs=['overlay'])
+
+    OverlayTheme.set_terminal_background(RgbColor(0, 0, 0))
+    install_snapshot(snapshot)
+
+    assert OverlayTheme._TERMINAL_BACKGROUND == RgbColor(255, 255, 255)
+    assert ColorSegment.compile_spec('overlay') == '\x1b[38;2;255;127;127m'
+
+
+def test_translucent_colors_use_terminal_background():
+    assert ColorSegment.compile_spec('overlay') == '\x1b[38;2;128;0;0m'
+
+    OverlayTheme.set_terminal_background(RgbColor(255, 255, 255))
+
+    assert ColorSegment.compile_spec('overlay') == '\x1b[38;2;255;127;127m'
+    assert ColorSegment.compile_spec('_/glass') == '\x1b[48;2;255;255;255m'
+
+
+def test_translucent_bg_is_composited_before_fg():
+    assert ColorSegment.compile_spec('blue/overlay') == \
+        '\x1b[38;2;0;0;255;48;2;128;0;0m'
+
+
+def test_terminal_background_must_be_opaque():
+    with pytest.raises(ValueError):
+        OverlayTheme.set_terminal_background(RgbColor(0, 0, 0, 1))
+
+
+def test_composited_pairs_are_cached():
+    _composite.cache_clear()
+
+    for _ in range(3):
+        ColorSegment.build_injector('overlay/blue').sgr_parameters()
+
+    assert _composite.cache_info().hits >= 2
+
+
+def test_composite_colors_sequence():
+    gradient = [RgbColor(255, 0, 0, a) for a in (0, 128, 255)]
+
+    assert composite_colors(gradient, RgbColor(0, 0, 255)) == [
+        RgbColor(0, 0, 255), RgbColor(128, 0, 127), RgbColor(255, 0, 0)
+    ]
+    assert composite_colors([RgbColor(255, 0, 0, 128)]) == \
+        [RgbColor(128, 0, 0)]
+
+
+def test_composite_colors_array_matches_sequence():
+    numpy = pytest.importorskip('numpy')
+
+    pixels = numpy.array(
+        [[[255, 0, 0, a], [10, 20, 30, 255 - a]] for a in range(256)],
+        dtype=numpy.uint8
+    )
+    background = RgbColor(1, 2, 3)
+
+    blended = composite_colors(pixels, background)
+    expected = composite_colors(
+        [RgbColor(*p) for row in pixels.tolist() for p in row], background
+    )
+
+    assert blended.shape == (256, 2, 3)
+    assert [RgbColor(*p) for row in blended.tolist() for p in row] == expected
+
+    with pytest.raises(ValueError):
+        composite_colors(pixels[..., :3], background)
@@ -0,0 +1,205 @@
+import io
+import json
+
+import pytest
+
+from sroloc.__main__ import main
+from sroloc.printing.asciicast import (
+    AsciicastError, AsciicastReader, AsciicastRecorder, final_screen, play,
+    render_final_screen
+)
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.sgr import SgrCollapser
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+def _record(writes, window=0.01, **options):
+    clock = FakeClock()
+    destination = io.StringIO()
+
+    with AsciicastRecorder(destination, clock=clock, window=window,
+                           **options) as recorder:
+        for delay, text in writes:
+            clock.now += delay
+            recorder.write(text)
+
+    return destination.getvalue()
+
+
+def _events(recording):
+    return [json.loads(line) for line in recording.splitlines()[1:]]
+
+
+def test_header():
+    recording = _record([], width=100, height=30, title='demo')
+    header = json.loads(recording.splitlines()[0])
+
+    assert header['version'] == 2
+    assert (header['width'], header['height']) == (100, 30)
+    assert header['title'] == 'demo'
+    assert isinstance(header['timestamp'], int)
+
+
+def test_bursts_are_coalesced():
+    recording = _record([
+        (0.5, 'a'), (0.001, 'b'), (0.001, 'c'), (1.0, 'd'), (0.02, 'e')
+    ])
+
+    assert _events(recording) == [
+        [0.5, 'o', 'abc'], [1.502, 'o', 'd'], [1.522, 'o', 'e']
+    ]
+
+
+def test_events_are_written_incrementally():
+    clock = FakeClock()
+    destination = io.StringIO()
+    recorder = AsciicastRecorder(destination, clock=clock)
+
+    recorder.write('first')
+    assert _events(destination.getvalue()) == []
+
+    clock.now += 1
+    recorder.write('second')
+    assert _events(destination.getvalue()) == [[0.0, 'o', 'first']]
+
+    recorder.close()
+    assert _events(destination.getvalue())[-1] == [1.0, 'o', 'second']
+
+    with pytest.raises(ValueError):
+        recorder.write('third')
+
+
+def test_escape_sequences_are_not_split():
+    recording = _record([(0, 'a\x1b[3'), (1, '1mb'), (1, '\x1b[')])
+
+    assert _events(recording) == [
+        [0.0, 'o', 'a'], [1.0, 'o', '\x1b[31mb'], [2.0, 'o', '\x1b[']
+    ]
+
+
+def test_output_is_passed_through():
+    stream = io.StringIO()
+    _record([(0, 'a'), (1, 'b')], stream=stream)
+
+    assert stream.getvalue() == 'ab'
+
+
+def test_recorder_can_be_printed_to():
+    destination = io.StringIO()
+
+    with AsciicastRecorder(destination) as recorder:
+        print(format(ColorSegment('ok'), 'green'), file=recorder)
+
+    assert _events(destination.getvalue()) == [
+        [pytest.approx(0, abs=0.1), 'o', '\x1b[32mok\x1b[0m\n']
+    ]
+
+
+def test_reader_streams_events():
+    recording = _record([(0, 'a'), (1, 'b')])
+    reader = AsciicastReader(io.StringIO(recording))
+
+    assert reader.width == 80
+    assert [tuple(event) for event in reader] == [
+        (0.0, 'o', 'a'), (1.0, 'o', 'b')
+    ]
+
+
+@pytest.mark.parametrize('recording', [
+    '', 'not json\n', '[1, 2]\n', '{"version": 1}\n',
+    '{"version": 2}\n[0, "o"]\n',
+])
+def test_invalid_recordings(recording):
+    with pytest.raises(AsciicastError):
+        list(AsciicastReader(io.StringIO(recording)))
+
+
+def test_play_keeps_timing():
+    recording = _record([(0.5, 'a'), (1, 'b'), (10, 'c')])
+    clock = FakeClock()
+    output = io.StringIO()
+
+    play(io.StringIO(recording), output, speed=2, sleep=clock.sleep,
+         clock=clock)
+
+    assert output.getvalue() == 'abc'
+    assert clock.sleeps == [0.25, 0.5, 5.0]
+
+
+def test_play_limits_idle_time():
+    recording = _record([(0.5, 'a'), (1, 'b'), (10, 'c')])
+    clock = FakeClock()
+    output = io.StringIO()
+
+    play(io.StringIO(recording), output, max_idle=2, sleep=clock.sleep,
+         clock=clock)
+
+    assert clock.sleeps == [0.5, 1.0, 2.0]
+
+    with pytest.raises(ValueError):
+        play(io.StringIO(recording), output, speed=0)
+
+
+def test_play_collapses_redundant_sgr():
+    segments = ''.join(
+        format(ColorSegment(word), 'red') for word in ('a', 'b', 'c')
+    )
+    recording = _record([(0, segments), (1, '\n'), (1, segments)])
+
+    collapsed = io.StringIO()
+    play(io.StringIO(recording), collapsed, speed=float('inf'))
+
+    raw = io.StringIO()
+    play(io.StringIO(recording), raw, speed=float('inf'), collapse=False)
+
+    assert raw.getvalue() == segments + '\n' + segments
+    assert collapsed.getvalue() == \
+        '\x1b[0;31mabc\x1b[0m\n\x1b[0;31mabc\x1b[0m'
+
+
+def test_sgr_collapser_keeps_changes():
+    collapser = SgrCollapser()
+
+    output = collapser.feed('\x1b[1m\x1b[31ma\x1b[0;1;31mb\x1b[32m')
+    output += collapser.feed('c\x1b[0m') + collapser.flush()
+
+    assert output == '\x1b[0;1;31mab\x1b[0;1;32mc\x1b[0m'
+
+
+def test_final_screen():
+    recording = _record([
+        (0, 'progress: 10%'), (1, '\r\x1b[Kprogress: '),
+        (0, format(ColorSegment('done'), 'green') + '\n'),
+    ], width=20, height=5)
+
+    screen = final_screen(io.StringIO(recording))
+
+    assert screen.lines()[0].rstrip() == 'progress: done'
+    assert render_final_screen(io.StringIO(recording)) == \
+        'progress: \x1b[32mdone\x1b[0m'
+
+
+def test_main_entry_point(tmp_path, capsys):
+    path = tmp_path / 'session.cast'
+    path.write_text(_record([(0, 'one\n'), (5, 'two\n')]))
+
+    assert main(['play', str(path), '--speed', '1000']) == 0
+    assert capsys.readouterr().out == 'one\ntwo\n'
+
+    assert main(['play', str(path), '--final']) == 0
+    assert capsys.readouterr().out == 'one\ntwo\n'
+
+    path.write_text('garbage\n')
+    assert main(['play', str(path)]) == 1
@@ -1,6 +1,7 @@
 import pytest
 
-from sroloc.color.ansi import BasicColor, ExtendedColor
+from sroloc.color.ansi import BasicColor, ExtendedColor, _ANSI_BASIC_COLORS
+from sroloc.color.bank import get_bank_version
 from sroloc.color.true import TrueColor
 from sroloc.color.utils import RgbColor, UnknownColorError, \
     InvalidAnsiColorValueError
@@ -162,3 +163,91 @@ def test_set_default_color_from_bank(basic_color_empty):
     basic_color_empty.set_default_color_from_bank(default_color_name)
 
     assert basic_color_empty._DEFAULT_COLOR == default_color_value
+
+
+def test_subclass_colors_do_not_leak_into_base_class():
+    class Theme(TrueColor):
+        pass
+
+    Theme.add_hex_color_to_bank('brand', '#123456')
+
+    assert Theme.has_color('brand') is True
+    assert TrueColor.has_color('brand') is False
+
+
+def test_builtin_banks_do_not_alias_module_dicts():
+    assert BasicColor._BANK is not _ANSI_BASIC_COLORS
+
+
+def test_subclass_overlays_parent_colors(basic_color_empty):
+    class Parent(BasicColor):
+        pass
+
+    class Child(Parent):
+        pass
+
+    Parent.add_colors_to_bank({'a': 1, 'b': 2})
+    Child.add_color_to_bank('b', 3)
+
+    assert Child.get_color('a') == 1
+    assert Child.get_color('b') == 3
+    assert Parent.get_color('b') == 2
+
+
+def test_parent_changes_invalidate_children(basic_color_empty):
+    class Child(BasicColor):
+        pass
+
+    assert Child.has_color('late') is False
+
+    basic_color_empty.add_color_to_bank('late', 4)
+
+    assert Child.get_color('late') == 4
+
+
+def test_bulk_add_bumps_bank_version_once(basic_color_empty):
+    version = get_bank_version()
+
+    basic_color_empty.add_colors_to_bank({'a': 1, 'b': 2, 'c': 3})
+
+    assert get_bank_version() == version + 1
+
+
+def test_bulk_add_validates_every_color(basic_color_empty):
+    with pytest.raises(InvalidAnsiColorValueError):
+        basic_color_empty.add_colors_to_bank({'a': 1, 'b': 8})
+
+    assert basic_color_empty.has_color('a') is False
+
+
+def test_add_hex_colors_to_bank(true_color_empty):
+    true_color_empty.add_hex_colors_to_bank({'a': '#010203', 'b': '#fff'})
+
+    assert true_color_empty.get_color('a') == RgbColor(1, 2, 3)
+    assert true_color_empty.get_color('b') == RgbColor(255, 255, 255)
+
+
+def test_new_schemes_keep_bank_version(basic_color_empty):
+    version = get_bank_version()
+
+    class Theme(BasicColor):
+        _BANK = {'accent': 3}
+
+    assert get_bank_version() == version
+    assert Theme.get_color('accent') == 3
+
+
+def test_adding_same_colors_keeps_bank_version(basic_color_empty):
+    basic_color_empty.add_colors_to_bank({'a': 1, 'b': 2})
+    version = get_bank_version()
+
+    basic_color_empty.add_colors_to_bank({'a': 1})
+
+    assert get_bank_version() == version
+
+
+def test_layers_are_read_only(basic_color_empty):
+    with pytest.raises(TypeError):
+        basic_color_empty._BANK['a'] = 1
+
+    assert basic_color_empty.has_color('a') is False
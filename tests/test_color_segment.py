@@ -1,5 +1,8 @@
+import threading
+
 import pytest
 
+from sroloc.color.ansi import BasicColor
 from sroloc.color.true import TrueColor
 from sroloc.printing.color_injector import ColorInjector
 from sroloc.printing.color_segment import ColorSegment
@@ -266,3 +269,73 @@ def test_converting_to_string():
     cs = ColorSegment(value)
 
     assert str(cs) == value
+
+
+def test_spec_tables_grow_in_place(default_segment):
+    table = ColorSegment._spec_table()
+
+    f'{default_segment:bold #ff0000}'
+
+    assert ColorSegment._spec_table() is table
+    assert table['bold #ff0000'] == '\x1b[1;38;2;255;0;0m'
+
+
+def test_scheme_swap_while_compiling(default_segment, monkeypatch):
+    class Old(TrueColor):
+        pass
+
+    class New(TrueColor):
+        pass
+
+    Old.add_hex_colors_to_bank({'brand': '#010203'})
+    New.add_hex_colors_to_bank({'brand': '#102030'})
+
+    ColorSegment._COLOR_SCHEME = Old
+    build_prefix = ColorSegment._build_prefix
+
+    def build_prefix_and_swap(format_spec, scheme):
+        ColorSegment._COLOR_SCHEME = New
+        return build_prefix(format_spec, scheme)
+
+    monkeypatch.setattr(ColorSegment, '_build_prefix', build_prefix_and_swap)
+    assert f'{default_segment:brand}' == '\x1b[38;2;1;2;3mtest\x1b[0m'
+
+    monkeypatch.undo()
+    assert f'{default_segment:brand}' == '\x1b[38;2;16;32;48mtest\x1b[0m'
+
+
+def test_thread_prefixes_follow_changes(default_segment):
+    assert f'{default_segment:#ff0000/#0000ff}' == \
+        '\x1b[38;2;255;0;0;48;2;0;0;255mtest\x1b[0m'
+
+    ColorSegment.COLOR_SPLITTER = ':'
+    assert f'{default_segment:#ff0000:#0000ff}' == \
+        '\x1b[38;2;255;0;0;48;2;0;0;255mtest\x1b[0m'
+
+    with pytest.raises(ValueError):
+        f'{default_segment:#ff0000/#0000ff}'
+
+    ColorSegment._COLOR_SCHEME = BasicColor
+    assert f'{default_segment:red:blue}' == '\x1b[31;44mtest\x1b[0m'
+
+
+def test_threads_format_with_their_own_prefixes(default_segment):
+    results = {}
+    ready = threading.Barrier(4)
+
+    def work(index):
+        ready.wait()
+        results[index] = [
+            f'{ColorSegment(str(i)):bold #00ff00}' for i in range(200)
+        ]
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    expected = [f'\x1b[1;38;2;0;255;0m{i}\x1b[0m' for i in range(200)]
+    assert all(result == expected for result in results.values())
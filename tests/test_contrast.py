@@ -0,0 +1,108 @@
+import pytest
+
+from sroloc.color.ansi import BasicColor, ExtendedColor
+from sroloc.color.contrast import (
+    audit_contrast, auto_foreground, contrast_ratio, luminance_table,
+    relative_luminance
+)
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.style import Style
+
+
+def test_relative_luminance():
+    assert relative_luminance(RgbColor(0, 0, 0)) == 0
+    assert relative_luminance(RgbColor(255, 255, 255)) == pytest.approx(1)
+    assert contrast_ratio(RgbColor(255, 255, 255), RgbColor(0, 0, 0)) == \
+        pytest.approx(21)
+    gray, white = RgbColor(0x77, 0x77, 0x77), RgbColor(255, 255, 255)
+    assert contrast_ratio(gray, white) == pytest.approx(4.48, abs=0.01)
+
+
+@pytest.mark.parametrize('spec, expected', [
+    ('auto/yellow', '\x1b[30;43mx\x1b[0m'),
+    ('auto/blue', '\x1b[37;44mx\x1b[0m'),
+    ('b auto/white', '\x1b[1;30;47mx\x1b[0m'),
+    ('_/blue auto', '\x1b[37;44mx\x1b[0m'),
+    ('auto', 'x'),
+])
+def test_auto_foreground_spec(spec, expected):
+    assert format(ColorSegment('x'), spec) == expected
+
+
+def test_auto_is_only_a_foreground():
+    with pytest.raises(ValueError):
+        format(ColorSegment('x'), 'red/auto')
+
+
+def test_auto_foreground_follows_theme():
+    class Theme(TrueColor):
+        _BANK = {
+            'black': RgbColor(0x28, 0x2a, 0x36),
+            'white': RgbColor(0xf8, 0xf8, 0xf2),
+            'paper': RgbColor(0xff, 0xfb, 0xeb),
+        }
+
+    ColorSegment.set_color_scheme(Theme)
+
+    assert f'{ColorSegment("x"):auto/paper}' == \
+        '\x1b[38;2;40;42;54;48;2;255;251;235mx\x1b[0m'
+    assert Style.parse('auto/#000080').fg_color == 'white'
+
+    Theme.add_hex_color_to_bank('paper', '#101010')
+
+    assert f'{ColorSegment("x"):auto/paper}'.startswith('\x1b[38;2;248;')
+
+
+def test_auto_foreground_without_black_and_white():
+    assert auto_foreground(TrueColor, '#ffff00') == '#000000'
+    assert auto_foreground(TrueColor, '#202020') == '#ffffff'
+
+
+def test_auto_foreground_from_candidates():
+    candidates = ['red', 'green', 'blue']
+
+    assert auto_foreground(BasicColor, 'black', candidates) == 'green'
+    assert auto_foreground(BasicColor, 'white', candidates) == 'blue'
+
+    with pytest.raises(ValueError):
+        auto_foreground(BasicColor, 'white', [])
+
+
+def test_luminance_table_is_cached_per_bank_version():
+    table = luminance_table(ExtendedColor)
+
+    assert len(table) == 256
+    assert luminance_table(ExtendedColor) is table
+
+    class Theme(TrueColor):
+        _BANK = {'accent': RgbColor(0, 0, 0)}
+
+    table = luminance_table(Theme)
+    Theme.add_color_to_bank('accent', RgbColor(255, 255, 255))
+
+    assert luminance_table(Theme) is not table
+    assert luminance_table(Theme)['accent'] == pytest.approx(1)
+
+
+def test_audit_contrast():
+    issues = audit_contrast(BasicColor)
+
+    assert issues[0].ratio <= issues[-1].ratio < 4.5
+    assert ('black', 'white') not in [(i.fg_color, i.bg_color)
+                                      for i in issues]
+    assert ('blue', 'black') in [(i.fg_color, i.bg_color) for i in issues]
+
+    everything = audit_contrast(BasicColor, minimum=None)
+    assert len(everything) == 8 * 7
+
+
+def test_audit_contrast_subset():
+    pairs = audit_contrast(
+        BasicColor, None, fg_colors=['black', 'white'], bg_colors=['yellow']
+    )
+
+    assert [(p.fg_color, p.bg_color) for p in pairs] == [
+        ('white', 'yellow'), ('black', 'yellow')
+    ]
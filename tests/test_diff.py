@@ -0,0 +1,198 @@
+import difflib
+import io
+
+import pytest
+
+from sroloc.__main__ import main
+from sroloc.printing.diff import (
+    DiffRenderer, colorize_diff, unified_diff_streams
+)
+from sroloc.printing.sgr import strip_escape_sequences
+
+PATCH = (
+    'diff --git a/app.conf b/app.conf\n'
+    '--- a/app.conf\n'
+    '+++ b/app.conf\n'
+    '@@ -1,3 +1,3 @@\n'
+    ' [server]\n'
+    '-port = 8080\n'
+    '+port = 9090\n'
+    ' host = localhost\n'
+)
+
+
+def _apply(lines, patch):
+    # Just enough of patch(1) to check hunks of generated diffs
+    result, position = [], 0
+    patch_lines = patch.splitlines(keepends=True)[2:]
+
+    for i, line in enumerate(patch_lines):
+        if line.startswith('@@'):
+            old = line.split()[1][1:].split(',')
+            start = int(old[0]) - (1 if len(old) == 1 or old[1] != '0' else 0)
+            result.extend(lines[position:start])
+            position = start
+            continue
+
+        if line.startswith('\\'):
+            continue
+
+        if i + 1 < len(patch_lines) and patch_lines[i + 1].startswith('\\'):
+            line = line[:-1]
+
+        if line[0] in ' -':
+            assert lines[position] == line[1:]
+            position += 1
+
+        if line[0] in ' +':
+            result.append(line[1:])
+
+    return result + lines[position:]
+
+
+def test_lines_are_styled():
+    lines = colorize_diff(PATCH).splitlines()
+
+    assert lines[0] == '\x1b[1mdiff --git a/app.conf b/app.conf\x1b[0m'
+    assert lines[3] == '\x1b[36m@@ -1,3 +1,3 @@\x1b[0m'
+    assert lines[4] == ' [server]'
+    assert lines[5] == (
+        '\x1b[31m-port = \x1b[0m\x1b[31;7m8080\x1b[0m'
+    )
+    assert lines[6] == (
+        '\x1b[32m+port = \x1b[0m\x1b[32;7m9090\x1b[0m'
+    )
+    assert strip_escape_sequences(colorize_diff(PATCH)) == PATCH
+
+
+def test_unrelated_lines_are_not_highlighted():
+    patch = '@@ -1 +1 @@\n-completely different\n+nothing alike here\n'
+
+    assert colorize_diff(patch) == (
+        '\x1b[36m@@ -1 +1 @@\x1b[0m\n'
+        '\x1b[31m-completely different\x1b[0m\n'
+        '\x1b[32m+nothing alike here\x1b[0m\n'
+    )
+
+
+def test_highlight_cost_cap():
+    renderer = DiffRenderer(max_cost=0)
+    output = renderer.feed(PATCH) + renderer.close()
+
+    assert '\x1b[31m-port = 8080\x1b[0m' in output
+    assert '7m' not in output
+
+
+def test_cost_cap_is_per_hunk():
+    # Five words on each side, so one pair of lines costs 25
+    hunk = '@@ -1 +1 @@\n-port = 8080\n+port = 9090\n'
+    renderer = DiffRenderer(max_cost=25)
+    output = renderer.feed(hunk * 3) + renderer.close()
+
+    assert output.count('\x1b[31;7m8080') == 3
+
+    hunk = '@@ -1,2 +1,2 @@\n-port = 8080\n-port = 8081\n' \
+        '+port = 9090\n+port = 9091\n'
+    output = colorize_diff(hunk, max_cost=25)
+
+    assert output.count('\x1b[31;7m') == 1
+
+
+def test_hunk_lines_look_like_headers():
+    patch = '@@ -1,2 +1,2 @@\n--- not a header\n+++ not a header\n x\n'
+    lines = colorize_diff(patch).splitlines()
+
+    assert lines[1].startswith('\x1b[31m-')
+    assert lines[2].startswith('\x1b[32m+')
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 1000])
+def test_chunked_input_renders_the_same_text(chunk_size):
+    renderer = DiffRenderer()
+    output = ''.join(
+        renderer.feed(PATCH[i:i + chunk_size])
+        for i in range(0, len(PATCH), chunk_size)
+    ) + renderer.close()
+
+    assert output == colorize_diff(PATCH)
+
+
+def test_missing_final_newline():
+    patch = '@@ -1 +1 @@\n-a\n\\ No newline at end of file\n+b'
+    output = colorize_diff(patch)
+
+    assert output.endswith('\\ No newline at end of file\n\x1b[32m+b\x1b[0m')
+
+
+@pytest.mark.parametrize('patch, expected', [
+    ('@@ -1,2 +1 @@\n-a\n-b', '\x1b[31m-a\x1b[0m\n\x1b[31m-b\x1b[0m'),
+    ('@@ -1 +1 @@\n-a b\n+a c',
+     '\x1b[32m+a \x1b[0m\x1b[32;7mc\x1b[0m'),
+])
+def test_truncated_block(patch, expected):
+    # What a diff cut off with head -c looks like
+    assert colorize_diff(patch).endswith(expected)
+
+
+def test_render_byte_stream():
+    stream = io.BytesIO(PATCH.replace('9090', 'ünï').encode())
+    output = ''.join(DiffRenderer().render_stream(stream, chunk_size=5))
+
+    assert '\x1b[32;7münï\x1b[0m' in output
+
+
+def test_unified_diff_streams_matches_difflib():
+    a = [f'line {i}\n' for i in range(40)]
+    b = list(a)
+    b[5] = 'changed\n'
+    b[30:32] = []
+    b.insert(20, 'inserted\n')
+
+    assert ''.join(unified_diff_streams(a, b, 'a', 'b')) == \
+        ''.join(difflib.unified_diff(a, b, 'a', 'b'))
+    assert ''.join(unified_diff_streams(a, a)) == ''
+
+
+@pytest.mark.parametrize('window, max_hunk_lines', [
+    (3, 10_000), (8, 10_000), (1000, 4),
+])
+def test_unified_diff_streams_with_small_buffers(window, max_hunk_lines):
+    a = [f'{i % 7}\n' for i in range(200)]
+    b = [line for i, line in enumerate(a) if i % 13]
+    b[50:50] = ['x\n'] * 10
+    b[-1] = b[-1].rstrip()
+
+    patch = ''.join(unified_diff_streams(
+        iter(a), iter(b), window=window, max_hunk_lines=max_hunk_lines
+    ))
+
+    assert _apply(a, patch) == b
+    assert patch.endswith('\\ No newline at end of file\n')
+
+
+def test_render_files():
+    a = ['[server]\n', 'port = 8080\n', 'host = localhost\n']
+    b = ['[server]\n', 'port = 9090\n', 'host = localhost\n']
+
+    output = ''.join(DiffRenderer().render_files(
+        a, b, 'a/app.conf', 'b/app.conf'
+    ))
+
+    assert output == colorize_diff(PATCH.split('\n', 1)[1])
+
+
+def test_main_entry_point(tmp_path, capsys):
+    old, new = tmp_path / 'old.conf', tmp_path / 'new.conf'
+    old.write_text('port = 8080\n')
+    new.write_text('port = 9090\n')
+
+    assert main(['diff', str(old), str(new)]) == 0
+
+    output = strip_escape_sequences(capsys.readouterr().out)
+    assert output.endswith('@@ -1 +1 @@\n-port = 8080\n+port = 9090\n')
+
+    patch = tmp_path / 'change.patch'
+    patch.write_text(PATCH)
+
+    assert main(['diff', str(patch)]) == 0
+    assert capsys.readouterr().out == colorize_diff(PATCH)
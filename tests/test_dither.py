@@ -0,0 +1,159 @@
+from typing import Dict
+
+import pytest
+
+from sroloc.color.ansi import BasicColor, ExtendedColor, ansi_color_to_rgb
+from sroloc.printing.dither import (
+    BAYER_THRESHOLDS, dither, dither_palette, render_cells
+)
+
+
+def _gradient(width=128, height=32):
+    return [
+        [(x * 255 // (width - 1), 80, 255 - x * 255 // (width - 1))
+         for x in range(width)]
+        for _ in range(height)
+    ]
+
+
+def _block_error(image, indices, size=8):
+    # Mean difference between the average colors of size x size blocks,
+    # which is what the eye sees from a distance
+    height, width = len(image), len(image[0])
+    total = 0.0
+    count = 0
+
+    for y in range(0, height, size):
+        for x in range(0, width, size):
+            cells = [
+                (yy, xx) for yy in range(y, min(y + size, height))
+                for xx in range(x, min(x + size, width))
+            ]
+
+            for channel in range(3):
+                expected = sum(image[yy][xx][channel] for yy, xx in cells)
+                actual = sum(
+                    tuple(ansi_color_to_rgb(int(indices[yy][xx])))[channel]
+                    for yy, xx in cells
+                )
+                total += abs(expected - actual) / len(cells)
+                count += 1
+
+    return total / count
+
+
+def test_bayer_thresholds_are_balanced():
+    values = sorted(t for row in BAYER_THRESHOLDS for t in row)
+
+    assert len(values) == 64
+    assert len(set(values)) == 64
+    assert sum(values) == pytest.approx(0)
+    assert -0.5 < values[0] and values[-1] < 0.5
+
+
+def test_palette_is_shared_per_scheme():
+    palette = dither_palette(ExtendedColor)
+
+    assert dither_palette(ExtendedColor) is palette
+    assert palette.indices == list(range(16, 256))
+    assert dither_palette(BasicColor).indices == list(range(8))
+
+
+def test_palette_follows_bank_changes():
+    class Grays(BasicColor):
+        _BANK: Dict[str, int] = {}
+
+    palette = dither_palette(Grays)
+    assert palette is not dither_palette(BasicColor)
+
+    Grays.add_color_to_bank('gray', 7)
+
+    assert dither_palette(Grays) is not palette
+    assert dither_palette(Grays).indices == list(range(8))
+
+
+def test_palette_nearest_matches_brute_force():
+    palette = dither_palette(BasicColor)
+
+    for color in [(0, 0, 0), (250, 10, 10), (120, 200, 60), (255, 255, 255)]:
+        expected = min(
+            range(len(palette.colors)),
+            key=lambda i: sum(
+                (a - b) ** 2 for a, b in zip(palette.colors[i], color)
+            )
+        )
+        assert palette.nearest(*color) == expected
+
+
+def test_nearest_mapping_without_dithering():
+    image = [[(0, 0, 0), (255, 0, 0)], [(0, 0, 255), (255, 255, 255)]]
+
+    assert dither(image, BasicColor, 'none') == [[0, 1], [4, 7]]
+    assert dither(image, ExtendedColor, 'none') == [[16, 196], [21, 231]]
+
+
+def test_flat_colors_of_the_palette_stay_flat():
+    image = [[(255, 0, 0)] * 16 for _ in range(8)]
+
+    for method in ('bayer', 'floyd_steinberg'):
+        assert dither(image, ExtendedColor, method) == [[196] * 16] * 8
+
+
+@pytest.mark.parametrize('scheme', [BasicColor, ExtendedColor])
+def test_dithering_reduces_banding(scheme):
+    image = _gradient()
+
+    nearest = _block_error(image, dither(image, scheme, 'none'))
+    bayer = _block_error(image, dither(image, scheme, 'bayer'))
+    diffused = _block_error(image, dither(image, scheme, 'floyd_steinberg'))
+
+    assert bayer < nearest
+    assert diffused < nearest / 2
+
+
+def test_error_diffusion_keeps_average_color():
+    image = [[(128, 128, 128)] * 64 for _ in range(16)]
+    indices = dither(image, BasicColor, 'floyd_steinberg')
+
+    for channel in range(3):
+        average = sum(
+            tuple(ansi_color_to_rgb(i))[channel]
+            for row in indices for i in row
+        ) / (64 * 16)
+
+        assert average == pytest.approx(128, abs=4)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        dither([[(0, 0, 0)]], BasicColor, 'atkinson')
+
+
+def test_render_cells_merges_runs():
+    assert render_cells([[1, 1, 2], []], BasicColor) == [
+        '\x1b[41m  \x1b[42m \x1b[0m', ''
+    ]
+    assert render_cells([[196, 21]], ExtendedColor, text='#',
+                        background=False) == [
+        '\x1b[38;5;196m#\x1b[38;5;21m#\x1b[0m'
+    ]
+
+
+def test_numpy_arrays_match_lists():
+    numpy = pytest.importorskip('numpy')
+
+    image = _gradient(96, 24)
+    array = numpy.array(image, dtype=numpy.uint8)
+
+    for scheme in (BasicColor, ExtendedColor):
+        for method in ('none', 'bayer'):
+            assert dither(array, scheme, method).tolist() == \
+                dither(image, scheme, method)
+
+        # Error sums can round differently, so only the result is compared
+        diffused = dither(array, scheme, 'floyd_steinberg')
+        assert diffused.shape == (24, 96)
+        assert _block_error(image, diffused) == pytest.approx(
+            _block_error(image, dither(image, scheme, 'floyd_steinberg')),
+            abs=1
+        )
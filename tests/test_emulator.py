@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.emulator import Cell, TerminalEmulator
+from sroloc.printing.screen import Screen
+from sroloc.printing.sgr import EscapeStreamBuffer
+
+
+@pytest.fixture(scope='function')
+def terminal():
+    return TerminalEmulator(10, 3)
+
+
+def test_escape_stream_buffer_holds_back_incomplete_sequences():
+    buffer = EscapeStreamBuffer()
+
+    assert buffer.feed('abc\x1b[3') == 'abc'
+    assert buffer.feed('1mdef\x1b') == '\x1b[31mdef'
+    assert buffer.feed('') == ''
+    assert buffer.flush() == '\x1b'
+
+
+def test_plain_text(terminal):
+    terminal.feed('hello\nworld')
+
+    assert str(terminal) == 'hello\nworld\n'
+    assert (terminal.x, terminal.y) == (5, 1)
+
+
+def test_styled_cells(terminal):
+    terminal.feed(f'{ColorSegment("ab"):b red/cyan u}c')
+
+    assert terminal.cell(0, 0) == Cell('a', '31', '46', (1, 4))
+    assert terminal.cell(1, 0) == Cell('b', '31', '46', (1, 4))
+    assert terminal.cell(2, 0) == Cell('c', None, None, ())
+
+
+def test_parameter_order_does_not_matter():
+    a, b = TerminalEmulator(5, 1), TerminalEmulator(5, 1)
+
+    a.feed('\x1b[4;31;1mx\x1b[0m')
+    b.feed('\x1b[1m\x1b[31;4mx\x1b[m')
+
+    assert a == b
+
+
+def test_cursor_movement_and_erase(terminal):
+    terminal.feed('abcdefghij\x1b[1;3H\x1b[K\x1b[2;2Hxy\x1b[2D\x1b[Bz')
+
+    assert terminal.lines() == ['ab        ', ' xy       ', ' z        ']
+
+
+def test_erase_display(terminal):
+    terminal.feed('aaa\nbbb\nccc\x1b[2;2H\x1b[J')
+
+    assert str(terminal) == 'aaa\nb\n'
+
+
+def test_autowrap_and_scroll(terminal):
+    terminal.feed('0123456789abc\nline 3\nline 4')
+
+    assert terminal.lines() == [
+        'abc       ', 'line 3    ', 'line 4    '
+    ]
+
+
+def test_sequences_split_across_feeds(terminal):
+    for char in '\x1b[31mred\x1b[0m':
+        terminal.feed(char)
+
+    assert terminal.cell(0, 0) == Cell('r', '31', None, ())
+    assert terminal.escape_sequences == 2
+
+
+def test_byte_accounting(terminal):
+    terminal.feed('\x1b[31mab\x1b[0m')
+
+    assert terminal.bytes_fed == 11
+    assert terminal.cells_written == 2
+    assert terminal.bytes_per_cell == 5.5
+    assert terminal.visible_cells == 2
+
+
+def test_screen_flush_matches_repaint():
+    width, height = 30, 8
+    screen = Screen(width, height)
+    incremental = TerminalEmulator(width, height)
+    rng = random.Random(0)
+
+    for _ in range(5):
+        for _ in range(20):
+            screen.write(rng.randrange(width), rng.randrange(height),
+                         rng.choice('abc'), rng.choice(['', 'red', 'b u']))
+        incremental.feed(screen.flush())
+
+    repainted = TerminalEmulator(width, height)
+    repainted.feed(screen.repaint())
+
+    assert incremental == repainted
+    assert incremental.lines() == str(screen).splitlines()
+
+
+def test_styled_lines(terminal):
+    terminal.feed('a\x1b[31mbc\x1b[1mde\x1b[0mf   \n\n\x1b[44m  \x1b[0m')
+
+    assert terminal.styled_lines()[:3] == [
+        'a\x1b[31mbc\x1b[0m\x1b[1;31mde\x1b[0mf',
+        '',
+        '\x1b[44m  \x1b[0m',
+    ]
+
+    replayed = TerminalEmulator(terminal.width, terminal.height)
+    replayed.feed('\n'.join(terminal.styled_lines()))
+
+    assert replayed == terminal
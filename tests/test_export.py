@@ -0,0 +1,148 @@
+import io
+import re
+
+import pytest
+
+from sroloc.color.ansi import ansi_color_to_rgb
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.export import (
+    HtmlExporter, SvgExporter, build_css_palette, export_html, export_svg
+)
+
+
+def _html_body(exporter, *chunks):
+    return ''.join(exporter.feed(chunk) for chunk in chunks)
+
+
+@pytest.mark.parametrize('color, expected', [
+    (1, '#cd0000'),
+    (9, '#ff0000'),
+    (21, '#0000ff'),
+    (196, '#ff0000'),
+    (232, '#080808'),
+    (255, '#eeeeee'),
+])
+def test_ansi_color_to_rgb(color, expected):
+    assert ansi_color_to_rgb(color).as_hex() == expected
+
+
+def test_ansi_color_to_rgb_rejects_invalid_values():
+    with pytest.raises(ValueError):
+        ansi_color_to_rgb(256)
+
+
+def test_html_export_escapes_text_and_merges_spans():
+    exporter = HtmlExporter()
+    body = _html_body(
+        exporter, '\x1b[31ma<b>', '\x1b[0m\x1b[31m&c\x1b[0m plain'
+    )
+
+    assert body == '<span class="s0">a&lt;b&gt;&amp;c</span> plain'
+    assert '.s0{color:#cd0000}' in exporter.end()
+
+
+def test_html_export_handles_sequences_split_between_chunks():
+    exporter = HtmlExporter()
+    body = _html_body(exporter, 'x\x1b[', '1;4', '2mbold\x1b', '[0m')
+
+    assert body == 'x<span class="s0">bold'
+    assert exporter.end().startswith('</span></pre>')
+    assert exporter.css() == (
+        '.s0{background-color:#00cd00;font-weight:bold}'
+    )
+
+
+def test_html_export_keeps_truncated_sequence_at_end():
+    exporter = HtmlExporter()
+    body = exporter.feed('\x1b[31mred\x1b[3')
+
+    assert body == '<span class="s0">red'
+    assert exporter.end().startswith('[3</span></pre>')
+
+
+def test_html_export_deduplicates_classes():
+    exporter = HtmlExporter()
+    _html_body(exporter, '\x1b[32mA\x1b[0m\x1b[1mB\x1b[0m\x1b[32mC')
+
+    assert exporter.css().count('\n') == 1
+
+
+def test_html_export_attributes_and_extended_colors():
+    exporter = HtmlExporter()
+    _html_body(exporter, '\x1b[3;4;9;38;5;196;48;2;1;2;3mx')
+
+    assert exporter.css() == (
+        '.s0{color:#ff0000;background-color:#010203;font-style:italic;'
+        'text-decoration:underline line-through}'
+    )
+
+
+def test_html_export_reverse_video_uses_default_colors():
+    exporter = HtmlExporter(foreground='#aaaaaa', background='#111111')
+    _html_body(exporter, '\x1b[7mx')
+
+    assert exporter.css() == '.s0{color:#111111;background-color:#aaaaaa}'
+
+
+def test_html_export_drops_control_characters():
+    exporter = HtmlExporter()
+
+    body = _html_body(exporter, 'a\x07b\tc\nd\x1b]x')
+
+    assert body == 'ab\tc\nd]x'
+
+
+def test_css_palette_uses_true_color_theme():
+    class Theme(TrueColor):
+        _BANK = {'red': RgbColor(0x12, 0x34, 0x56)}
+
+    palette = build_css_palette(Theme)
+
+    assert palette[1] == '#123456'
+    assert palette[2] == ansi_color_to_rgb(2).as_hex()
+    assert build_css_palette()[1] == '#cd0000'
+
+
+def test_export_html_streams_documents():
+    source = io.StringIO(f'{ColorSegment("hi"):b red}\n' * 1000)
+    destination = io.StringIO()
+
+    export_html(source, destination, title='<log>', chunk_size=7)
+    document = destination.getvalue()
+
+    assert '<title>&lt;log&gt;</title>' in document
+    assert document.count('<span class="s0">hi</span>') == 1000
+    assert document.endswith('</html>\n')
+
+
+def test_svg_export_lines_and_backgrounds():
+    exporter = SvgExporter()
+    body = exporter.feed('ab\x1b[41mcd\x1b[0m\nx') + exporter.end()
+    lines = body.splitlines()
+
+    assert len(lines) == 2
+    assert '<rect class="s0b" x="16.8" y="0" width="16.8"' in lines[0]
+    assert lines[0].endswith('ab<tspan class="s0">cd</tspan></text>')
+    assert '.s0b{fill:#cd0000}' in exporter.css()
+    assert 'width="33.6" height="34"' in exporter.header()
+
+
+def test_svg_export_keeps_truncated_sequence_at_end():
+    exporter = SvgExporter()
+
+    assert exporter.feed('ab\x1b[4') == ''
+    assert exporter.end() == '<text y="13" xml:space="preserve">ab[4</text>\n'
+
+
+def test_export_svg_produces_complete_document():
+    destination = io.StringIO()
+    export_svg(io.StringIO('\x1b[1m<a&b>\x1b[0m\n\tz\n'), destination)
+    document = destination.getvalue()
+
+    assert document.startswith('<svg ')
+    assert document.endswith('</svg>\n')
+    assert '&lt;a&amp;b&gt;' in document
+    assert '        z' in document
+    assert len(re.findall('<text ', document)) == 2
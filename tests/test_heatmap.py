@@ -0,0 +1,114 @@
+import pytest
+
+from sroloc.color.ansi import BasicColor, ExtendedColor
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor, UnknownColorError
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.heatmap import Heatmap, colorize_values
+
+
+@pytest.fixture(scope='function', autouse=True)
+def true_color_scheme():
+    previous_color_scheme = ColorSegment._COLOR_SCHEME
+    ColorSegment._COLOR_SCHEME = TrueColor
+    yield TrueColor
+    ColorSegment._COLOR_SCHEME = previous_color_scheme
+
+
+def test_thresholds_use_colormap_stops():
+    heatmap = Heatmap('traffic_light', thresholds=[500, 100])
+
+    assert heatmap.colorize([1, 100, 499, 800], format_spec='04d') == [
+        '\x1b[38;2;0;200;83m0001\x1b[0m',
+        '\x1b[38;2;255;214;0m0100\x1b[0m',
+        '\x1b[38;2;255;214;0m0499\x1b[0m',
+        '\x1b[38;2;213;0;0m0800\x1b[0m',
+    ]
+
+
+def test_levels_interpolate_between_stops():
+    heatmap = Heatmap(['#000000', '#ffffff'], levels=3, vmin=0, vmax=3)
+
+    assert heatmap.prefixes == [
+        '\x1b[38;2;0;0;0m', '\x1b[38;2;128;128;128m', '\x1b[38;2;255;255;255m'
+    ]
+    assert heatmap.bucketize([-5, 0, 0.99, 1, 2.5, 3, 100]) == \
+        [0, 0, 0, 1, 2, 2, 2]
+
+
+def test_value_range_defaults_to_data_range():
+    heatmap = Heatmap(levels=5)
+
+    assert heatmap.bucketize(iter(range(10))) == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+    assert heatmap.edges([float('inf'), 0, 10]) == [2, 4, 6, 8]
+
+
+def test_nan_is_left_uncolored():
+    heatmap = Heatmap('grayscale', levels=2)
+
+    assert heatmap.colorize([0, float('nan'), 1]) == [
+        '\x1b[38;2;0;0;0m0\x1b[0m', 'nan', '\x1b[38;2;255;255;255m1\x1b[0m'
+    ]
+
+
+def test_spans_share_prefixes():
+    heatmap = Heatmap('grayscale', levels=2, background=True)
+    spans = heatmap.spans([0, 1, 0], texts=['a', 'b', 'c'])
+
+    assert spans == [
+        ('a', '\x1b[48;2;0;0;0m'),
+        ('b', '\x1b[48;2;255;255;255m'),
+        ('c', '\x1b[48;2;0;0;0m'),
+    ]
+    assert spans[0][1] is spans[2][1]
+
+    with pytest.raises(ValueError):
+        heatmap.spans([0, 1], texts=['a'])
+
+
+def test_theme_stops_and_scheme_changes():
+    class Theme(TrueColor):
+        _BANK = {'ok': RgbColor(0, 255, 0), 'bad': RgbColor(255, 0, 0)}
+
+    heatmap = Heatmap(['ok', 'bad'], thresholds=[0.5])
+
+    ColorSegment._COLOR_SCHEME = Theme
+    assert heatmap.prefixes == ['\x1b[38;2;0;255;0m', '\x1b[38;2;255;0;0m']
+
+    ColorSegment._COLOR_SCHEME = BasicColor
+    heatmap = Heatmap(['green', 'red'], thresholds=[0.5])
+    assert heatmap.prefixes == ['\x1b[32m', '\x1b[31m']
+
+    ColorSegment._COLOR_SCHEME = ExtendedColor
+    assert heatmap.prefixes == ['\x1b[38;5;40m', '\x1b[38;5;196m']
+
+
+def test_unknown_theme_stops():
+    with pytest.raises(UnknownColorError):
+        Heatmap(['green', 'blu']).prefixes
+
+
+@pytest.mark.parametrize('options', [
+    {'colormap': 'no_such_scale'},
+    {'colormap': []},
+    {'levels': 0},
+])
+def test_invalid_heatmaps(options):
+    with pytest.raises(ValueError):
+        Heatmap(**options)
+
+
+def test_colorize_values():
+    assert colorize_values([1.5], 'grayscale', '.2f', vmin=0, vmax=1) == \
+        ['\x1b[38;2;255;255;255m1.50\x1b[0m']
+
+
+def test_numpy_arrays_match_sequences():
+    numpy = pytest.importorskip('numpy')
+
+    values = numpy.array([0.5, numpy.nan, 3.0, -1.0, 10.0])
+    heatmap = Heatmap(levels=8)
+
+    assert heatmap.bucketize(values).tolist() == \
+        heatmap.bucketize(values.tolist())
+    assert heatmap.colorize(values) == heatmap.colorize(values.tolist())
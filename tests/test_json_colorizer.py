@@ -0,0 +1,104 @@
+import io
+import json
+
+import pytest
+
+from sroloc.__main__ import main
+from sroloc.printing.json_colorizer import JsonColorizeError, \
+    JsonColorizer, colorize_json
+from sroloc.printing.sgr import strip_escape_sequences
+
+DOCUMENT = {
+    'name': 'sroloc',
+    'escaped': 'quote " and backslash \\ and unicode ż',
+    'numbers': [0, -1, 2.5, 1e-07],
+    'flags': {'yes': True, 'no': False, 'nothing': None},
+    'empty': {'object': {}, 'array': []},
+}
+
+
+def _expected_layout(value):
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def test_layout_matches_json_dumps():
+    text = json.dumps(DOCUMENT, ensure_ascii=False)
+
+    assert strip_escape_sequences(colorize_json(text)) == \
+        _expected_layout(DOCUMENT) + '\n'
+
+
+def test_tokens_are_styled():
+    assert colorize_json('{"a": ["b", 1, true, null]}', indent=0) == (
+        '{\n\x1b[1;34m"a"\x1b[0m: [\n\x1b[32m"b"\x1b[0m,\n'
+        '\x1b[36m1\x1b[0m,\n\x1b[33mtrue\x1b[0m,\n\x1b[35mnull\x1b[0m\n]\n}\n'
+    )
+
+
+def test_custom_styles():
+    assert colorize_json('[1]', styles={'number': 'red', 'punctuation': 'b'}) \
+        == '\x1b[1m[\x1b[0m\n  \x1b[31m1\x1b[0m\n\x1b[1m]\x1b[0m\n'
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7])
+def test_chunked_input_renders_the_same_text(chunk_size):
+    text = json.dumps(DOCUMENT, ensure_ascii=False)
+    colorizer = JsonColorizer()
+
+    output = ''.join(
+        colorizer.feed(text[i:i + chunk_size])
+        for i in range(0, len(text), chunk_size)
+    ) + colorizer.close()
+
+    assert strip_escape_sequences(output) == \
+        _expected_layout(DOCUMENT) + '\n'
+
+
+def test_json_lines_byte_stream():
+    lines = [{'a': 1}, [True], 'text']
+    data = '\n'.join(json.dumps(line) for line in lines).encode()
+
+    output = ''.join(
+        JsonColorizer().colorize_stream(io.BytesIO(data), chunk_size=3)
+    )
+
+    assert strip_escape_sequences(output) == ''.join(
+        _expected_layout(line) + '\n' for line in lines
+    )
+
+
+@pytest.mark.parametrize('text', [
+    '{"a": 1', '[1}', '[tru]', '"abc', ']', '[1,]', '{"a": 1,}', '[,1]',
+    '[1,,2]',
+])
+def test_invalid_json(text):
+    with pytest.raises(JsonColorizeError):
+        colorize_json(text)
+
+
+def test_main_entry_point(tmp_path, capsys):
+    path = tmp_path / 'data.json'
+    path.write_text('{"a": [1, 2]}')
+
+    assert main(['json', '--indent', '4', str(path)]) == 0
+    assert strip_escape_sequences(capsys.readouterr().out) == \
+        _expected_layout({'a': [1, 2]}).replace('  ', '    ') + '\n'
+
+
+def test_default_styles_on_true_color(tmp_path, capsys):
+    path = tmp_path / 'data.json'
+    path.write_text('[1, null]')
+
+    assert main(['json', '--scheme', 'true', str(path)]) == 0
+    assert capsys.readouterr().out == (
+        '[\n  \x1b[38;2;0;205;205m1\x1b[0m,\n'
+        '  \x1b[38;2;205;0;205mnull\x1b[0m\n]\n'
+    )
+
+
+def test_main_entry_point_reports_errors(tmp_path, capsys):
+    path = tmp_path / 'data.json'
+    path.write_text('{"a": ]')
+
+    assert main(['json', str(path)]) == 1
+    assert 'Invalid JSON' in capsys.readouterr().err
@@ -0,0 +1,193 @@
+import io
+import threading
+
+import pytest
+
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.emulator import TerminalEmulator
+from sroloc.printing.live import LiveItem, LiveRegion, ProgressBar, Spinner
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope='function')
+def clock():
+    return FakeClock()
+
+
+def _tty_region(clock, width=40):
+    return LiveRegion(io.StringIO(), is_tty=True, width=width, clock=clock)
+
+
+def _take_output(region):
+    output = region.stream.getvalue()
+    region.stream.seek(0)
+    region.stream.truncate()
+    return output
+
+
+def test_progress_bar_render():
+    bar = ProgressBar('copy', total=4, width=4)
+    bar.advance()
+
+    assert bar.render(0) == \
+        'copy \x1b[32m█\x1b[0m\x1b[2m░░░\x1b[0m 1/4  25%'
+    assert bar.render(0, plain=True) == 'copy 1/4  25%'
+
+    bar.update(completed=10)
+    assert bar.fraction == 1.0
+
+
+def test_progress_bar_without_total():
+    bar = ProgressBar('scan')
+    bar.update(advance=3)
+
+    assert bar.render(0) == 'scan 3/?'
+
+
+def test_spinner_render():
+    spinner = Spinner('wait', frames='ab')
+
+    assert spinner.render(0.0) == '\x1b[36ma\x1b[0m wait'
+    assert spinner.render(0.1) == '\x1b[36mb\x1b[0m wait'
+
+    spinner.finish('done')
+    assert spinner.render(0.2) == '\x1b[36m✔\x1b[0m done'
+
+
+def test_styles_follow_format_changes(monkeypatch):
+    keywords = dict(ColorSegment.MODIFIER_KEYWORDS)
+    keywords['faint'] = ColorSegment.MODIFIER_KEYWORDS['u']
+    bar = ProgressBar('copy', total=4, width=4)
+
+    assert '\x1b[2m░░░░' in bar.render(0)
+
+    monkeypatch.setattr(ColorSegment, 'MODIFIER_KEYWORDS', keywords)
+
+    assert '\x1b[4m░░░░' in bar.render(0)
+
+
+def test_invalid_styles_fail_on_registration():
+    with pytest.raises(ValueError):
+        ProgressBar('x', style='no_such_color')
+
+
+def test_items_must_render():
+    with pytest.raises(TypeError):
+        LiveItem('x')
+
+
+def test_only_changed_lines_are_rewritten(clock):
+    region = _tty_region(clock)
+    first = region.add_bar('a', 10, width=4)
+    region.add_bar('b', 10, width=4)
+
+    region.refresh()
+    _take_output(region)
+
+    region.refresh()
+    assert _take_output(region) == ''
+
+    first.advance(5)
+    region.refresh()
+    output = _take_output(region)
+
+    assert output.startswith('\x1b[2A\r')
+    assert output.count('\r') == 2
+    assert 'b ' not in output
+
+
+def test_region_draws_on_terminal(clock):
+    region = _tty_region(clock, width=30)
+    bars = [region.add_bar(f'job{i}', 10, width=10) for i in range(3)]
+    terminal = TerminalEmulator(30, 8)
+
+    for step in range(1, 11):
+        for i, bar in enumerate(bars):
+            bar.advance(1 if i != 1 or step % 2 else 0)
+
+        region.refresh()
+
+    region.log('job0 finished')
+    bars[0].finish()
+    region.refresh()
+    terminal.feed(region.stream.getvalue())
+
+    assert str(terminal).rstrip().splitlines() == [
+        'job0 finished',
+        'job0 ██████████ 10/10 100%',
+        'job1 █████░░░░░ 5/10  50%',
+        'job2 ██████████ 10/10 100%',
+    ]
+    assert terminal.cell(5, 1).fg == '32'
+    assert terminal.cell(14, 2).attrs == (2,)
+
+
+def test_long_lines_are_truncated(clock):
+    region = _tty_region(clock, width=12)
+    region.add_bar('a very long description', 10)
+    region.refresh()
+
+    terminal = TerminalEmulator(12, 2)
+    terminal.feed(region.stream.getvalue())
+
+    assert terminal.lines()[0] == 'a very lon… '
+    assert (terminal.x, terminal.y) == (0, 1)
+
+
+def test_non_tty_prints_periodic_summaries(clock):
+    region = LiveRegion(io.StringIO(), summary_interval=5, clock=clock)
+    bar = region.add_bar('copy', 4)
+    region.add_spinner('wait')
+
+    region.refresh()
+    bar.advance()
+    clock.now = 1
+    region.refresh()
+    clock.now = 5
+    region.refresh()
+    region.log('note')
+    clock.now = 6
+    region.refresh(force=True)
+
+    assert region.stream.getvalue() == (
+        'copy 0/4   0%\nwait ...\n'
+        'copy 1/4  25%\nwait ...\n'
+        'note\n'
+    )
+
+
+def test_threaded_updates(clock):
+    stream = io.StringIO()
+    region = LiveRegion(stream, fps=100, is_tty=True, width=60)
+    bars = [region.add_bar(f'job{i}', 1000, width=10) for i in range(8)]
+
+    def work(bar):
+        for _ in range(1000):
+            bar.advance()
+
+    with region:
+        threads = [threading.Thread(target=work, args=(b,)) for b in bars]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    terminal = TerminalEmulator(60, 10)
+    terminal.feed(stream.getvalue())
+
+    assert [line.rstrip() for line in terminal.lines()[:8]] == [
+        f'job{i} ██████████ 1000/1000 100%' for i in range(8)
+    ]
+    assert stream.getvalue().endswith('\x1b[?25h')
+
+
+def test_invalid_frame_rate():
+    with pytest.raises(ValueError):
+        LiveRegion(io.StringIO(), fps=0)
@@ -0,0 +1,84 @@
+import pytest
+
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.markup import MarkupError, MarkupParser, \
+    render_markup, _render_markup
+
+
+def test_render_markup():
+    assert render_markup('[b red]ERROR[/] disk [u]sda[/u] full') == (
+        '\x1b[1;31mERROR\x1b[0m disk \x1b[4msda\x1b[0m full'
+    )
+
+
+def test_nested_styles_stack():
+    assert render_markup('[red]a[u]b[blue]c[/]d[/]e[/red]f') == (
+        '\x1b[31ma\x1b[0m\x1b[31;4mb\x1b[0m\x1b[34;4mc\x1b[0m'
+        '\x1b[31;4md\x1b[0m\x1b[31me\x1b[0mf'
+    )
+
+
+def test_closing_outer_tag_closes_inner_tags():
+    assert render_markup('[red]a[u]b[/red]c') == (
+        '\x1b[31ma\x1b[0m\x1b[31;4mb\x1b[0mc'
+    )
+
+
+@pytest.mark.parametrize('markup', ['[1/3] done', '[] empty', 'a [b c'])
+def test_unknown_tags_are_literal(markup):
+    assert render_markup(markup) == markup
+
+
+def test_escaped_brackets():
+    assert render_markup(r'\[red] \\ [red]x') == r'[red] \ ' + \
+        '\x1b[31mx\x1b[0m'
+
+
+@pytest.mark.parametrize('markup', ['[/]', '[red]a[/blue]'])
+def test_invalid_closing_tags(markup):
+    with pytest.raises(MarkupError):
+        render_markup(markup)
+
+
+def test_streaming_tags_split_across_chunks():
+    parser = MarkupParser()
+    chunks = ['abc [b r', 'ed]ERR', 'OR[/', '] done \\', '[x]']
+
+    output = ''.join(parser.parse_stream(chunks))
+
+    assert output == (
+        'abc \x1b[1;31mERR\x1b[0m\x1b[1;31mOR\x1b[0m done [x]'
+    )
+
+
+def test_streaming_emits_text_without_buffering():
+    parser = MarkupParser()
+
+    assert parser.feed('[red]abc') == '\x1b[31mabc\x1b[0m'
+    assert parser.feed('def[/]') == '\x1b[31mdef\x1b[0m'
+    assert parser.feed('ghi') == 'ghi'
+
+
+def test_rendered_markup_is_cached():
+    render_markup('[green]cached[/]')
+    before = _render_markup.cache_info().hits
+    render_markup('[green]cached[/]')
+
+    assert _render_markup.cache_info().hits == before + 1
+
+
+def test_rendered_markup_follows_format_changes(monkeypatch):
+    keywords = dict(ColorSegment.MODIFIER_KEYWORDS)
+    keywords['b'] = ColorSegment.MODIFIER_KEYWORDS['f']
+
+    assert render_markup('[red/blue]x[/] [b]y[/]') == \
+        '\x1b[31;44mx\x1b[0m \x1b[1my\x1b[0m'
+
+    monkeypatch.setattr(ColorSegment, 'COLOR_SPLITTER', ':')
+    monkeypatch.setattr(ColorSegment, 'MODIFIER_KEYWORDS', keywords)
+
+    assert render_markup('[red:blue]x[/] [b]y[/]') == \
+        '\x1b[31;44mx\x1b[0m \x1b[2my\x1b[0m'
+
+    with pytest.raises(MarkupError):
+        render_markup('[red/blue]x[/]')
@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+from sroloc.color.ansi import ansi_color_to_rgb
+from sroloc.color.palette import (
+    assign_color_names, extract_palette, extract_theme
+)
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+
+BRAND_COLORS = [
+    (0x1e, 0x1e, 0x2e),  # background
+    (0xf3, 0x8b, 0xa8),  # red
+    (0xa6, 0xe3, 0xa1),  # green
+    (0xf9, 0xe2, 0xaf),  # yellow
+    (0x89, 0xb4, 0xfa),  # blue
+    (0xcb, 0xa6, 0xf7),  # purple
+    (0x94, 0xe2, 0xd5),  # cyan
+    (0xcd, 0xd6, 0xf4),  # text
+]
+
+
+def _image(colors, pixels_per_color=2000, channels=3, noise=4):
+    rng = random.Random(0)
+    data = bytearray()
+
+    for color in colors:
+        for _ in range(pixels_per_color):
+            data.extend(
+                min(max(c + rng.randint(-noise, noise), 0), 255)
+                for c in color
+            )
+            if channels == 4:
+                data.append(255)
+
+    return bytes(data)
+
+
+def _close(a, b, tolerance=12):
+    return all(abs(x - y) <= tolerance for x, y in zip(a, b))
+
+
+def test_extract_palette_finds_dominant_colors():
+    palette = extract_palette(_image(BRAND_COLORS), colors=8)
+
+    assert len(palette) == 8
+    assert sum(count for _, count in palette) == 8 * 2000
+
+    for color in BRAND_COLORS:
+        assert any(_close(found, color) for found, _ in palette)
+
+
+def test_extract_palette_is_sorted_by_population():
+    image = _image(BRAND_COLORS[:1], 3000) + _image(BRAND_COLORS[1:2], 1000)
+    palette = extract_palette(image, colors=2)
+
+    assert [count for _, count in palette] == [3000, 1000]
+    assert _close(palette[0][0], BRAND_COLORS[0])
+
+
+def test_extract_palette_inputs():
+    colors = [RgbColor(*c) for c in BRAND_COLORS[:2]] * 50
+
+    palette = extract_palette(colors, colors=2)
+    assert {tuple(color) for color, _ in palette} == {
+        (0x1c, 0x1c, 0x2c), (0xf4, 0x8c, 0xac)
+    }
+
+    translucent = [RgbColor(255, 0, 0, 0)] * 10 + [RgbColor(0, 0, 255)]
+    assert len(extract_palette(translucent, colors=4)) == 1
+
+    rgba = _image(BRAND_COLORS[1:3], channels=4)
+    assert len(extract_palette(rgba, colors=2, channels=4)) == 2
+
+    assert extract_palette(b'', colors=2) == []
+
+
+def test_extract_palette_subsamples_large_buffers():
+    image = _image(BRAND_COLORS, 5000)
+    palette = extract_palette(image, colors=8, max_samples=1000)
+
+    for color in BRAND_COLORS:
+        assert any(_close(found, color) for found, _ in palette)
+
+
+@pytest.mark.parametrize('options', [{'colors': 0}, {'channels': 2}])
+def test_extract_palette_invalid_options(options):
+    with pytest.raises(ValueError):
+        extract_palette(b'\x00\x00\x00', **options)
+
+
+def test_assign_color_names_by_hue():
+    names = assign_color_names([RgbColor(*c) for c in BRAND_COLORS])
+
+    assert list(names) == [
+        'black', 'red', 'green', 'yellow', 'blue', 'purple', 'cyan', 'white'
+    ]
+    assert tuple(names['black']) == BRAND_COLORS[0]
+    assert tuple(names['white']) == BRAND_COLORS[7]
+
+    for i, name in enumerate(['red', 'green', 'yellow', 'blue', 'purple',
+                              'cyan'], 1):
+        assert tuple(names[name]) == BRAND_COLORS[i], name
+
+
+def test_missing_hues_fall_back_to_terminal_colors():
+    names = assign_color_names([RgbColor(0, 0, 0), RgbColor(200, 0, 0)])
+
+    assert names['red'] == RgbColor(200, 0, 0)
+    assert names['blue'] == ansi_color_to_rgb(4)
+
+    with pytest.raises(ValueError):
+        assign_color_names([])
+
+
+def test_extract_theme():
+    theme = extract_theme(_image(BRAND_COLORS), 'BrandTheme', colors=8)
+
+    assert theme.__name__ == 'BrandTheme'
+    assert issubclass(theme, TrueColor)
+    assert _close(theme.get_color('blue'), BRAND_COLORS[4])
+    assert theme.has_color('palette_7')
+    assert not theme.has_color('palette_8')
+    assert theme.fg_color_code('red').startswith('38;2;')
+
+
+def test_numpy_pixels_match_buffers():
+    numpy = pytest.importorskip('numpy')
+
+    image = _image(BRAND_COLORS, channels=4)
+    array = numpy.frombuffer(image, dtype=numpy.uint8).reshape(80, 200, 4)
+
+    assert extract_palette(array, colors=8) == \
+        extract_palette(image, colors=8, channels=4)
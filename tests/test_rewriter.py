@@ -0,0 +1,101 @@
+import io
+
+import pytest
+
+from sroloc.color.ansi import (
+    BasicColor, ExtendedColor, ansi_color_to_rgb, nearest_ansi_color
+)
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+from sroloc.printing.rewriter import SgrRewriter, rewrite
+
+
+@pytest.fixture(scope='function')
+def theme():
+    class Theme(TrueColor):
+        pass
+
+    Theme.add_hex_colors_to_bank({'red': '#ff5555', 'green': '#50fa7b'})
+
+    return Theme
+
+
+def test_nearest_ansi_color_round_trips_palette():
+    for color in range(16, 256):
+        nearest = nearest_ansi_color(ansi_color_to_rgb(color))
+        assert ansi_color_to_rgb(nearest) == ansi_color_to_rgb(color)
+
+
+def test_nearest_ansi_color_basic():
+    assert nearest_ansi_color(RgbColor(250, 10, 10), 3) == 1
+    assert nearest_ansi_color(RgbColor(10, 10, 10), 3) == 0
+
+    with pytest.raises(ValueError):
+        nearest_ansi_color(RgbColor(0, 0, 0), 4)
+
+
+def test_retheme_maps_basic_colors(theme):
+    text = '\x1b[1;31mred\x1b[0m \x1b[92;44mgreen\x1b[0m'
+
+    assert rewrite(text, theme) == (
+        '\x1b[1;38;2;255;85;85mred\x1b[0m '
+        '\x1b[38;2;80;250;123;44mgreen\x1b[0m'
+    )
+
+
+def test_retheme_keeps_unknown_and_true_colors(theme):
+    text = '\x1b[38;5;200;48;2;1;2;3mx\x1b[34m'
+    assert rewrite(text, theme) == text
+
+
+def test_downsample_true_color_to_extended():
+    assert rewrite('\x1b[38;2;255;0;0mx', ExtendedColor) == '\x1b[38;5;196mx'
+    assert rewrite('\x1b[48;2;8;8;8mx', ExtendedColor) == '\x1b[48;5;232mx'
+
+
+def test_downsample_to_basic():
+    text = '\x1b[38;5;196;48;2;0;0;250;93mx\x1b[m'
+    assert rewrite(text, BasicColor) == '\x1b[31;44;33mx\x1b[m'
+
+
+def test_downsample_first_indexed_colors_to_basic():
+    text = '\x1b[38;5;1;48;5;7mx\x1b[31;47my'
+    assert rewrite(text, BasicColor) == '\x1b[31;47mx\x1b[31;47my'
+
+
+def test_invalid_codes_pass_through():
+    text = '\x1b[38;2;300;0;0mx\x1b[38;5mx\x1b[;1mx'
+    assert rewrite(text, BasicColor) == text
+
+
+def test_text_without_changes_is_not_copied():
+    rewriter = SgrRewriter(ExtendedColor)
+    text = 'plain \x1b[31mtext\x1b[2J'
+
+    assert rewriter.feed(text) is text
+
+
+def test_sequences_split_between_chunks():
+    stream = io.StringIO('a\x1b[38;2;255;0;0mb\x1b[0m' * 100)
+    output = ''.join(SgrRewriter(ExtendedColor).rewrite_stream(stream, 3))
+
+    assert output == 'a\x1b[38;5;196mb\x1b[0m' * 100
+
+
+def test_translation_table_is_memoized(theme):
+    rewriter = SgrRewriter(theme)
+    rewriter.feed('\x1b[31mx')
+
+    assert rewriter._table == {'31': '38;2;255;85;85'}
+
+    theme.add_hex_colors_to_bank({'red': '#000000'})
+
+    assert rewriter.feed('\x1b[31mx') == '\x1b[38;2;0;0;0mx'
+
+
+def test_unsupported_scheme():
+    class NotAScheme:
+        pass
+
+    with pytest.raises(TypeError):
+        SgrRewriter(NotAScheme)
@@ -23,6 +23,12 @@ def test_create_invalid_rgb_color(r, g, b):
         RgbColor(r, g, b)
 
 
+@pytest.mark.parametrize('a', [-1, 256])
+def test_create_invalid_rgb_color_alpha(a):
+    with pytest.raises(ValueError):
+        RgbColor(0, 0, 0, a)
+
+
 @pytest.mark.parametrize('hex_value,expected_rgb', [
     ('#00ff00', RgbColor(0, 0xff, 0)),
     ('#123abc', RgbColor(0x12, 0x3a, 0xbc)),
@@ -44,10 +50,10 @@ def test_valid_hex_to_rgb_conversion_short(hex_value, expected_rgb):
 
 
 @pytest.mark.parametrize('hex_value,expected_rgb', [
-    ('#00ff00a1', RgbColor(0, 0xff, 0)),
-    ('#123abc0b', RgbColor(0x12, 0x3a, 0xbc)),
-    ('#52998811', RgbColor(0x52, 0x99, 0x88)),
-    ('#90afa8fa', RgbColor(0x90, 0xaf, 0xa8))
+    ('#00ff00a1', RgbColor(0, 0xff, 0, 0xa1)),
+    ('#123abc0b', RgbColor(0x12, 0x3a, 0xbc, 0x0b)),
+    ('#52998811', RgbColor(0x52, 0x99, 0x88, 0x11)),
+    ('#90afa8fa', RgbColor(0x90, 0xaf, 0xa8, 0xfa))
 ])
 def test_valid_hex_to_rgb_conversion_with_alpha(hex_value, expected_rgb):
     assert RgbColor.from_hex(hex_value) == expected_rgb
@@ -56,7 +62,7 @@ def test_valid_hex_to_rgb_conversion_with_alpha(hex_value, expected_rgb):
 @pytest.mark.parametrize('hex_value,expected_rgb', [
     ('  #00ff00', RgbColor(0, 0xff, 0)),
     ('#123  ', RgbColor(0x11, 0x22, 0x33)),
-    ('#529988aa\t ', RgbColor(0x52, 0x99, 0x88)),
+    ('#529988aa\t ', RgbColor(0x52, 0x99, 0x88, 0xaa)),
     ('\t#90afa8   ', RgbColor(0x90, 0xaf, 0xa8))
 ])
 def test_valid_hex_to_rgb_conversion_with_whitespace(hex_value, expected_rgb):
@@ -126,3 +132,24 @@ def test_rgb_color_format_str():
 
     with pytest.raises(ValueError):
         f'{color:invalid_format_spec}'
+
+
+def test_rgb_color_alpha():
+    color = RgbColor(1, 2, 3, 4)
+
+    assert tuple(color) == (1, 2, 3)
+    assert not color.is_opaque
+    assert RgbColor(1, 2, 3).is_opaque
+    assert color != RgbColor(1, 2, 3)
+    assert color.as_hex() == '#01020304'
+    assert RgbColor.from_hex(color.as_hex()) == color
+    assert repr(color) == '(r=1, g=2, b=3, a=4)'
+
+
+@pytest.mark.parametrize('color,background,expected', [
+    (RgbColor(255, 0, 0, 128), RgbColor(0, 0, 255), RgbColor(128, 0, 127)),
+    (RgbColor(255, 255, 255, 0), RgbColor(1, 2, 3), RgbColor(1, 2, 3)),
+    (RgbColor(10, 20, 30), RgbColor(1, 2, 3), RgbColor(10, 20, 30)),
+])
+def test_rgb_color_composite(color, background, expected):
+    assert color.composite(background) == expected
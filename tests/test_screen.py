@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+from sroloc.color.ansi import ExtendedColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.screen import Screen
+
+
+@pytest.fixture(scope='function')
+def flushed_screen():
+    screen = Screen(10, 3)
+    screen.flush()
+    return screen
+
+
+def test_invalid_screen_size():
+    with pytest.raises(ValueError):
+        Screen(0, 10)
+
+
+def test_first_flush_paints_every_cell():
+    screen = Screen(4, 2)
+    output = screen.flush()
+
+    assert output == '\x1b[1;1H    \x1b[2;1H    '
+
+
+def test_flush_without_changes_is_empty(flushed_screen):
+    assert flushed_screen.flush() == ''
+
+
+def test_write_emits_only_changed_cells(flushed_screen):
+    flushed_screen.write(2, 1, 'ab')
+
+    assert flushed_screen.flush() == '\x1b[2;3Hab'
+
+
+def test_rewriting_same_content_emits_nothing(flushed_screen):
+    flushed_screen.write(0, 0, '   ')
+
+    assert flushed_screen.flush() == ''
+
+
+def test_write_moves_cursor_only_over_gaps(flushed_screen):
+    flushed_screen.write(0, 0, 'a')
+    flushed_screen.write(1, 0, ' ')
+    flushed_screen.write(2, 0, 'b')
+
+    assert flushed_screen.flush() == '\x1b[1;1Ha\x1b[1;3Hb'
+
+
+def test_styles_are_emitted_on_change_only(flushed_screen):
+    flushed_screen.write(0, 0, 'ab', 'red')
+    flushed_screen.write(2, 0, 'c', 'red')
+    flushed_screen.write(3, 0, 'd')
+
+    assert flushed_screen.flush() == \
+        '\x1b[1;1H\x1b[31mabc\x1b[0md'
+
+
+def test_output_ends_in_reset_state(flushed_screen):
+    flushed_screen.write(9, 2, 'x', 'bold')
+
+    assert flushed_screen.flush() == '\x1b[3;10H\x1b[1mx\x1b[0m'
+
+
+def test_only_changed_style_parameters_are_emitted(flushed_screen):
+    flushed_screen.write(0, 0, 'a', 'b u red')
+    flushed_screen.write(1, 0, 'b', 'b u blue')
+    flushed_screen.write(2, 0, 'c', 'f u blue/white')
+    flushed_screen.write(3, 0, 'd', 'i')
+
+    assert flushed_screen.flush() == (
+        '\x1b[1;1H\x1b[31;1;4ma\x1b[34mb\x1b[22;47;2mc\x1b[0;3md\x1b[0m'
+    )
+
+
+def test_styles_follow_scheme_changes(flushed_screen, monkeypatch):
+    flushed_screen.write(0, 0, 'ab', 'red')
+    flushed_screen.flush()
+
+    monkeypatch.setattr(ColorSegment, '_COLOR_SCHEME', ExtendedColor)
+
+    assert flushed_screen.flush() == \
+        '\x1b[1;1H\x1b[38;5;9mab\x1b[0m' + ' ' * 8 + \
+        '\x1b[2;1H' + ' ' * 10 + '\x1b[3;1H' + ' ' * 10
+
+
+def test_style_ids_are_interned(flushed_screen):
+    style_id = flushed_screen.style_id('bold  red')
+
+    assert flushed_screen.style_id('bold red') == style_id
+    assert flushed_screen.style_id('') == 0
+
+    with pytest.raises(ValueError):
+        flushed_screen.style_id('invalid_color')
+
+
+def test_write_is_clipped_to_screen(flushed_screen):
+    flushed_screen.write(8, 0, 'abcd')
+    flushed_screen.write(-2, 1, 'xyz')
+    flushed_screen.write(0, 5, 'out of screen')
+
+    assert str(flushed_screen).splitlines() == [
+        '        ab', 'z         ', '          '
+    ]
+
+
+def test_clear_resets_region(flushed_screen):
+    flushed_screen.write(0, 0, 'abcdef', 'red')
+    flushed_screen.flush()
+
+    flushed_screen.clear(1, 0, 2, 1)
+
+    assert flushed_screen.flush() == '\x1b[1;2H  '
+    assert str(flushed_screen).splitlines()[0] == 'a  def    '
+
+
+def test_sparse_updates_are_cheaper_than_repaint():
+    width, height = 200, 60
+    screen = Screen(width, height)
+    rng = random.Random(0)
+
+    for y in range(height):
+        screen.write(0, y, 'x' * width, 'green')
+    screen.flush()
+
+    for _ in range(width * height // 100):
+        screen.write(rng.randrange(width), rng.randrange(height), 'o', 'red')
+
+    update = screen.flush()
+    repaint = screen.repaint()
+
+    assert len(update) * 5 < len(repaint)
@@ -0,0 +1,168 @@
+import io
+import threading
+
+import pytest
+
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.sgr import ESCAPE_SEQUENCE_REGEX, SgrState
+from sroloc.printing.sink import LineSink, seal_line
+
+
+class SlowStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+
+        # Writing in small pieces lets other threads run in between
+        for i in range(0, len(text), 7):
+            super().write(text[i:i + 7])
+
+        return len(text)
+
+
+def _ends_in_default_state(line):
+    state = SgrState()
+
+    for match in ESCAPE_SEQUENCE_REGEX.finditer(line):
+        if match.group(2) == 'm':
+            state.apply(match.group(1))
+
+    return state.is_default
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('plain', ('plain', '')),
+    ('\x1b[31mred\x1b[0m', ('\x1b[31mred\x1b[0m', '')),
+    ('\x1b[31mred\x1b[39m', ('\x1b[31mred\x1b[39m', '')),
+    ('\x1b[1;31mred', ('\x1b[1;31mred\x1b[0m', '\x1b[1;31m')),
+    ('\x1b[44mblue\x1b[K', ('\x1b[44mblue\x1b[K\x1b[0m', '\x1b[44m')),
+])
+def test_seal_line(line, expected):
+    assert seal_line(line) == expected
+
+
+def test_lines_are_written_whole():
+    stream = io.StringIO()
+
+    with LineSink(stream) as sink:
+        sink.write('one ')
+        sink.write('two')
+        sink.flush()
+        assert stream.getvalue() == ''
+
+        sink.write(' three\nfour\nfi')
+        sink.flush()
+        assert stream.getvalue() == 'one two three\nfour\n'
+
+        sink.write('ve')
+
+    assert stream.getvalue() == 'one two three\nfour\nfive\n'
+
+
+def test_styles_are_carried_over_lines():
+    stream = io.StringIO()
+
+    with LineSink(stream) as sink:
+        sink.write('\x1b[31mred\nstill red\x1b[0m plain\n')
+
+    assert stream.getvalue() == (
+        '\x1b[31mred\x1b[0m\n\x1b[31mstill red\x1b[0m plain\n'
+    )
+
+
+def test_print_to_sink():
+    stream = io.StringIO()
+
+    with LineSink(stream) as sink:
+        print(format(ColorSegment('ok'), 'green'), 'done', file=sink)
+
+    assert stream.getvalue() == '\x1b[32mok\x1b[0m done\n'
+
+
+def test_threads_never_tear_lines():
+    stream = SlowStream()
+    thread_count, line_count = 16, 200
+
+    def work(index):
+        color = ['red', 'green', 'blue', 'yellow'][index % 4]
+
+        for i in range(line_count):
+            # Every line is written in pieces, like print does
+            print(format(ColorSegment(f'thread {index}'), color),
+                  format(ColorSegment(f'line {i}'), 'b'),
+                  '\x1b[3' + f'{index % 8}mleft open', file=sink)
+
+    with LineSink(stream, flush_interval=0.001, max_pending=50) as sink:
+        threads = [
+            threading.Thread(target=work, args=(i,))
+            for i in range(thread_count)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == thread_count * line_count
+
+    seen = {}
+
+    for line in lines:
+        index = int(line.split('thread ')[1].split('\x1b')[0])
+        number = int(line.split('line ')[1].split('\x1b')[0])
+
+        # Lines of a thread stay in order
+        assert number == seen.get(index, -1) + 1
+        seen[index] = number
+
+        assert line.endswith('left open\x1b[0m')
+        assert _ends_in_default_state(line)
+
+    assert stream.writes < len(lines)
+    assert sink.chunks == len(lines)
+
+
+def test_unfinished_lines_of_other_threads_are_written_on_stop():
+    stream = io.StringIO()
+    sink = LineSink(stream).start()
+
+    thread = threading.Thread(
+        target=lambda: sink.write('\x1b[31mno newline')
+    )
+    thread.start()
+    thread.join()
+
+    sink.stop()
+
+    assert stream.getvalue() == '\x1b[31mno newline\x1b[0m\n'
+
+
+def test_buffers_of_finished_threads_are_dropped():
+    stream = io.StringIO()
+
+    with LineSink(stream) as sink:
+        for i in range(50):
+            thread = threading.Thread(target=sink.write, args=(f'{i}\n',))
+            thread.start()
+            thread.join()
+
+        assert len(sink._buffers) <= 2
+
+    assert stream.getvalue().splitlines() == [str(i) for i in range(50)]
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        LineSink(io.StringIO(), flush_interval=0)
+
+    sink = LineSink(io.StringIO()).start()
+
+    with pytest.raises(RuntimeError):
+        sink.start()
+
+    sink.stop()
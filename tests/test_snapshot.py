@@ -0,0 +1,94 @@
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from sroloc.color.ansi import BasicColor
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.snapshot import install_snapshot, take_snapshot
+
+
+class SnapshotTheme(TrueColor):
+    pass
+
+
+@pytest.fixture(scope='function', autouse=True)
+def restore_color_scheme():
+    previous_color_scheme = ColorSegment._COLOR_SCHEME
+    previous_bank = SnapshotTheme._BANK
+
+    SnapshotTheme._BANK = dict()
+    yield
+
+    ColorSegment._COLOR_SCHEME = previous_color_scheme
+    SnapshotTheme._BANK = previous_bank
+
+
+def _render(spec):
+    return f'{ColorSegment("text"):{spec}}'
+
+
+def test_snapshot_is_compact_and_picklable():
+    SnapshotTheme.add_hex_colors_to_bank({'brand': '#102030', 'dim': '#444'})
+    ColorSegment.set_color_scheme(SnapshotTheme)
+    _render('brand')
+
+    snapshot = pickle.loads(pickle.dumps(take_snapshot()))
+
+    assert snapshot.names == ('brand', 'dim')
+    assert snapshot.colors == bytes([
+        0x10, 0x20, 0x30, 0xff, 0x44, 0x44, 0x44, 0xff
+    ])
+    assert dict(zip(snapshot.spec_names, snapshot.spec_prefixes)) == {
+        'brand': b'\x1b[38;2;16;32;48m'
+    }
+
+
+def test_install_snapshot_restores_scheme():
+    SnapshotTheme.add_hex_color_to_bank('brand', '#102030')
+    ColorSegment.set_color_scheme(SnapshotTheme)
+    snapshot = take_snapshot(specs=['b brand'])
+    expected = _render('b brand')
+
+    SnapshotTheme._BANK = dict()
+    ColorSegment.set_color_scheme(BasicColor)
+
+    assert install_snapshot(snapshot) is SnapshotTheme
+    assert SnapshotTheme.get_color('brand') == RgbColor(0x10, 0x20, 0x30)
+    assert ColorSegment._spec_table() == {'b brand': '\x1b[1;38;2;16;32;48m'}
+    assert _render('b brand') == expected
+
+
+def test_install_snapshot_recreates_unknown_scheme():
+    class LocalTheme(BasicColor):
+        pass
+
+    LocalTheme.add_color_to_bank('accent', 5)
+    snapshot = take_snapshot(LocalTheme)
+
+    scheme = install_snapshot(snapshot)
+
+    assert scheme is not LocalTheme
+    assert issubclass(scheme, BasicColor)
+    assert scheme.get_color('accent') == 5
+
+
+def test_specs_need_active_scheme():
+    with pytest.raises(ValueError):
+        take_snapshot(SnapshotTheme, specs=['bold'])
+
+
+def test_spawned_workers_render_like_parent():
+    SnapshotTheme.add_hex_colors_to_bank({'brand': '#102030'})
+    ColorSegment.set_color_scheme(SnapshotTheme)
+    specs = ['brand', 'b brand/#fff', 'u _/brand']
+    expected = [_render(spec) for spec in specs]
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(1, mp_context=context,
+                             initializer=install_snapshot,
+                             initargs=(take_snapshot(specs=specs),)) as pool:
+        assert list(pool.map(_render, specs)) == expected
@@ -0,0 +1,78 @@
+import pytest
+
+from sroloc.color.ansi import BasicColor
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import UnknownColorError
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.modifiers import ColorModifier, TextModifier
+from sroloc.printing.style import Style
+
+
+def test_parse_style():
+    style = Style.parse('bold red/cyan underline')
+
+    assert style.fg_color == 'red'
+    assert style.bg_color == 'cyan'
+    assert style.color_mod is ColorModifier.bold
+    assert style.text_mods == (TextModifier.underline,)
+    assert style.color_scheme is BasicColor
+
+
+def test_parse_invalid_style():
+    with pytest.raises(ValueError):
+        Style.parse('bold invalid_color')
+
+
+def test_keyword_style_with_unknown_color():
+    with pytest.raises(UnknownColorError):
+        Style(fg_color='invalid_color')
+
+
+def test_style_prefix_is_canonical():
+    a = Style.parse('strikethrough italic underline red')
+    b = Style.parse('underline red strikethrough italic')
+
+    assert a.prefix == b.prefix == '\x1b[31;3;4;9m'
+
+
+def test_style_matches_color_segment_output():
+    spec = 'blink b s green/black i'
+    segment = ColorSegment('text')
+
+    assert Style.parse(spec).apply('text') == f'{segment:{spec}}'
+
+
+def test_empty_style_applies_nothing():
+    assert Style().apply('text') == 'text'
+    assert Style.parse('_/_').apply('text') == 'text'
+
+
+def test_style_equality_and_hash():
+    a = Style.parse('b red i u')
+    b = Style(fg_color='red', color_mod=ColorModifier.bold,
+              text_mods=(TextModifier.underline, TextModifier.italic))
+
+    assert a == b
+    assert hash(a) == hash(b)
+    assert len({a, b, Style.parse('red')}) == 2
+
+
+def test_style_is_immutable():
+    style = Style.parse('red')
+
+    with pytest.raises(AttributeError):
+        style.fg_color = 'blue'  # type: ignore
+
+
+def test_style_composition():
+    base = Style.parse('bold red/black italic')
+    overlay = Style.parse('blue underline')
+
+    combined = base + overlay
+
+    assert combined == Style.parse('bold blue/black italic underline')
+
+
+def test_style_composition_with_different_schemes():
+    with pytest.raises(ValueError):
+        Style.parse('red') + Style(color_scheme=TrueColor)
@@ -0,0 +1,94 @@
+import pytest
+
+from sroloc.printing.style import Style
+from sroloc.printing.styled_text import StyledText
+
+
+@pytest.fixture(scope='function')
+def report():
+    text = StyledText()
+    text.append('ERROR', 'bold red')
+    text.append(': disk ')
+    text.append('sda', Style.parse('underline'))
+    text.append(' is full')
+    return text
+
+
+def test_plain_text_and_length(report):
+    assert report.plain == 'ERROR: disk sda is full'
+    assert len(report) == len(report.plain)
+
+
+def test_render(report):
+    assert report.render() == (
+        '\x1b[1;31mERROR\x1b[0m: disk \x1b[4msda\x1b[0m is full'
+    )
+    assert report.to_bytes() == report.render().encode()
+
+
+def test_styles_are_interned():
+    text = StyledText()
+
+    for word in ['a', 'b', 'c']:
+        text.append(word, 'red').append(' ')
+
+    assert text.styles == (None, Style.parse('red'))
+
+
+def test_adjacent_spans_are_merged():
+    text = StyledText()
+    text.append('abc', 'red')
+    text.append('def', Style.parse('red'))
+
+    assert text.render() == '\x1b[31mabcdef\x1b[0m'
+    assert len(list(text.spans())) == 1
+
+
+def test_slicing(report):
+    sliced = report[3:14]
+
+    assert sliced.plain == 'OR: disk sd'
+    assert sliced.render() == '\x1b[1;31mOR\x1b[0m: disk \x1b[4msd\x1b[0m'
+    assert report[-4:].render() == 'full'
+    assert report[0].render() == '\x1b[1;31mE\x1b[0m'
+
+
+def test_invalid_slicing(report):
+    with pytest.raises(ValueError):
+        report[::2]
+
+    with pytest.raises(IndexError):
+        report[100]
+
+
+def test_restyle_range(report):
+    report.restyle(3, 14, 'green')
+
+    assert report.render() == (
+        '\x1b[1;31mERR\x1b[0m\x1b[32mOR: disk sd\x1b[0m\x1b[4ma\x1b[0m'
+        ' is full'
+    )
+
+
+def test_restyle_to_unstyled(report):
+    report.restyle(0, len(report), None)
+
+    assert report.render() == report.plain
+
+
+def test_appending_styled_text(report):
+    text = StyledText('>> ', 'blue')
+    text += report
+
+    assert text.render() == (
+        '\x1b[34m>> \x1b[0m\x1b[1;31mERROR\x1b[0m: disk \x1b[4msda\x1b[0m'
+        ' is full'
+    )
+
+
+def test_appending_to_itself(report):
+    expected = report.render()
+    report.append_styled(report)
+
+    assert report.plain == 'ERROR: disk sda is full' * 2
+    assert report.render() == expected * 2
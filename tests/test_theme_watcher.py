@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+
+import pytest
+
+from sroloc.color.ansi import BasicColor
+from sroloc.color.true import TrueColor
+from sroloc.color.utils import RgbColor
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.theme_watcher import (
+    ThemeLoadError, ThemeWatcher, load_theme
+)
+
+
+def _write_theme(path, colors, mtime):
+    path.write_text(json.dumps(colors))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_load_theme(tmp_path):
+    path = tmp_path / 'dracula.json'
+    path.write_text('{"red": "#ff5555", "overlay": "#00000080"}')
+
+    theme = load_theme(str(path))
+
+    assert theme.__name__ == 'DraculaTheme'
+    assert issubclass(theme, TrueColor)
+    assert theme.get_color('red') == RgbColor(0xff, 0x55, 0x55)
+    assert theme.get_color('overlay') == RgbColor(0, 0, 0, 0x80)
+    assert not TrueColor.has_color('overlay')
+
+
+@pytest.mark.parametrize('content', [
+    '{"red": ', '["#ff0000"]', '{"red": "#ff00"}', '{"red": 1}'
+])
+def test_load_invalid_theme(tmp_path, content):
+    path = tmp_path / 'broken.json'
+    path.write_text(content)
+
+    with pytest.raises(ThemeLoadError):
+        load_theme(str(path))
+
+
+def test_set_color_scheme_precompiles_specs():
+    class Theme(TrueColor):
+        _BANK = {'brand': RgbColor(1, 2, 3)}
+
+    ColorSegment.set_color_scheme(Theme, ['b brand', 'no_such_color'])
+
+    assert ColorSegment._spec_table() == {'b brand': '\x1b[1;38;2;1;2;3m'}
+
+
+def test_watcher_reloads_on_change(tmp_path):
+    path = tmp_path / 'theme.json'
+    _write_theme(path, {'accent': '#ff0000'}, 1_000_000_000)
+
+    reloaded = []
+    watcher = ThemeWatcher(str(path), on_reload=reloaded.append)
+
+    assert watcher.check()
+    assert f'{ColorSegment("x"):accent}' == '\x1b[38;2;255;0;0mx\x1b[0m'
+    assert not watcher.check()
+
+    _write_theme(path, {'accent': '#00ff00'}, 2_000_000_000)
+
+    assert watcher.check()
+    assert f'{ColorSegment("x"):accent}' == '\x1b[38;2;0;255;0mx\x1b[0m'
+    assert len(reloaded) == 2 and reloaded[-1] is watcher.theme
+    assert ColorSegment._COLOR_SCHEME is watcher.theme
+
+
+def test_watcher_keeps_theme_when_file_is_broken(tmp_path):
+    path = tmp_path / 'theme.json'
+    _write_theme(path, {'accent': '#ff0000'}, 1_000_000_000)
+
+    errors = []
+    watcher = ThemeWatcher(str(path), on_error=errors.append)
+    watcher.check()
+    theme = watcher.theme
+
+    path.write_text('{"accent": "#00')
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+
+    assert not watcher.check()
+    assert ColorSegment._COLOR_SCHEME is theme
+    assert isinstance(watcher.last_error, ThemeLoadError)
+    assert errors == [watcher.last_error]
+
+
+def test_watcher_ignores_missing_file(tmp_path):
+    watcher = ThemeWatcher(str(tmp_path / 'missing.json'))
+
+    assert not watcher.check()
+    assert ColorSegment._COLOR_SCHEME is BasicColor
+
+
+def test_watcher_thread(tmp_path):
+    path = tmp_path / 'theme.json'
+    _write_theme(path, {'accent': '#ff0000'}, 1_000_000_000)
+
+    reloaded = threading.Event()
+
+    with ThemeWatcher(str(path), interval=0.01) as watcher:
+        watcher.on_reload = lambda theme: reloaded.set()
+        _write_theme(path, {'accent': '#0000ff'}, 2_000_000_000)
+
+        assert reloaded.wait(5)
+
+    assert watcher._thread is None
+    assert ColorSegment._COLOR_SCHEME.get_color('accent') == \
+        RgbColor(0, 0, 255)
+
+
+def test_formatting_never_mixes_themes():
+    class Light(TrueColor):
+        _BANK = {'fg': RgbColor(0, 0, 0), 'bg': RgbColor(255, 255, 255)}
+
+    class Dark(TrueColor):
+        _BANK = {'fg': RgbColor(255, 255, 255), 'bg': RgbColor(0, 0, 0)}
+
+    expected = set()
+    for theme in (Light, Dark):
+        ColorSegment.set_color_scheme(theme)
+        expected.add(f'{ColorSegment("x"):b fg/bg}')
+
+    results = set()
+    done = threading.Event()
+
+    def render():
+        while not done.is_set():
+            results.add(f'{ColorSegment("x"):b fg/bg}')
+
+    threads = [threading.Thread(target=render) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+
+    for i in range(2000):
+        ColorSegment.set_color_scheme((Light, Dark)[i % 2], ['b fg/bg'])
+
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    assert results <= expected
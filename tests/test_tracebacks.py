@@ -0,0 +1,178 @@
+import io
+import logging
+import re
+import sys
+import threading
+import traceback
+
+import pytest
+
+from sroloc.color.true import TrueColor
+from sroloc.printing import tracebacks
+from sroloc.printing.color_segment import ColorSegment
+from sroloc.printing.modifiers import TextModifier
+from sroloc.printing.sgr import strip_escape_sequences
+from sroloc.printing.tracebacks import TracebackFormatter, TracebackRenderer
+
+
+class CountingRenderer(TracebackRenderer):
+    def __init__(self):
+        super().__init__()
+        self.rendered = 0
+
+    def render(self, *args):
+        self.rendered += 1
+        return super().render(*args)
+
+
+def _fail(message='boom'):
+    raise KeyError(message)
+
+
+def _chained():
+    try:
+        _fail()
+    except KeyError as e:
+        try:
+            raise ValueError('bad value') from e
+        except ValueError:
+            raise RuntimeError('while handling')
+
+
+def _caught(function):
+    try:
+        function()
+    except Exception as e:
+        return e
+
+
+def test_render_matches_standard_traceback():
+    exception = _caught(_chained)
+    rendered = TracebackRenderer().render_exception(exception)
+
+    expected = traceback.format_exception(
+        type(exception), exception, exception.__traceback__
+    )
+
+    # Error location markers of newer Pythons aren't rendered
+    expected_lines = [
+        line for line in ''.join(expected).splitlines(keepends=True)
+        if not re.fullmatch(r'\s*[~^]+\s*', line)
+    ]
+
+    assert strip_escape_sequences(rendered) == ''.join(expected_lines)
+
+
+def test_render_styles():
+    rendered = TracebackRenderer().render_exception(_caught(_fail))
+    lines = rendered.splitlines()
+
+    assert lines[0] == '\x1b[1mTraceback (most recent call last):\x1b[0m'
+    assert lines[1].startswith(f'  File "\x1b[36m{__file__}\x1b[0m", line ')
+    assert lines[1].endswith(', in \x1b[35m_caught\x1b[0m')
+    assert lines[2] == '    function()'
+    assert lines[-1] == "\x1b[1;31mKeyError: 'boom'\x1b[0m"
+
+
+def test_frames_are_cached():
+    renderer = TracebackRenderer()
+    frame = renderer.render_frame('app.py', 3, 'main', 'run()')
+
+    assert renderer.render_frame('app.py', 3, 'main', 'run()') is frame
+    assert frame == (
+        '  File "\x1b[36mapp.py\x1b[0m", line \x1b[33m3\x1b[0m, '
+        'in \x1b[35mmain\x1b[0m\n    run()\n'
+    )
+
+    ColorSegment.set_color_scheme(TrueColor)
+
+    # Basic colors missing from the scheme are replaced by their RGB values
+    assert renderer.render_frame('app.py', 3, 'main', 'run()') == (
+        '  File "\x1b[38;2;0;205;205mapp.py\x1b[0m", '
+        'line \x1b[38;2;205;205;0m3\x1b[0m, '
+        'in \x1b[38;2;205;0;205mmain\x1b[0m\n    run()\n'
+    )
+
+
+def test_frames_follow_format_changes(monkeypatch):
+    renderer = TracebackRenderer()
+    keywords = dict(ColorSegment.MODIFIER_KEYWORDS)
+    keywords['b'] = TextModifier.underline
+
+    assert renderer.render_exception(_caught(_fail)).startswith('\x1b[1m')
+
+    monkeypatch.setattr(ColorSegment, 'MODIFIER_KEYWORDS', keywords)
+
+    assert renderer.render_exception(_caught(_fail)).startswith('\x1b[4m')
+
+
+def test_frame_cache_is_bounded():
+    renderer = TracebackRenderer()
+    renderer.FRAME_CACHE_MAX_SIZE = 10
+
+    for lineno in range(25):
+        renderer.render_frame('app.py', lineno, 'main')
+
+    assert len(renderer._tables()[1]) <= 10
+
+
+def test_invalid_custom_style():
+    with pytest.raises(ValueError):
+        TracebackRenderer({'filename': 'no_such_color'})
+
+
+def test_formatter_renders_only_emitted_records():
+    renderer = CountingRenderer()
+    stream = io.StringIO()
+
+    handler = logging.StreamHandler(stream)
+    handler.setLevel(logging.ERROR)
+    handler.setFormatter(TracebackFormatter('%(message)s', renderer=renderer))
+
+    logger = logging.getLogger('sroloc.tests.tracebacks')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+
+    try:
+        exception = _caught(_fail)
+        for _ in range(100):
+            logger.debug('ignored', exc_info=exception)
+
+        logger.error('failed', exc_info=exception)
+    finally:
+        logger.removeHandler(handler)
+
+    assert renderer.rendered == 1
+    assert stream.getvalue().startswith('failed\n\x1b[1mTraceback')
+
+
+def test_lazy_traceback():
+    renderer = CountingRenderer()
+    lazy = renderer.lazy(_caught(_fail))
+
+    assert renderer.rendered == 0
+    assert 'KeyError' in str(lazy)
+    assert renderer.rendered == 1
+
+
+def test_install_hooks():
+    stream = io.StringIO()
+    previous = sys.excepthook, threading.excepthook
+
+    tracebacks.install(stream=stream)
+    try:
+        exception = _caught(_fail)
+        sys.excepthook(type(exception), exception, exception.__traceback__)
+
+        thread = threading.Thread(target=_fail, name='worker')
+        thread.start()
+        thread.join()
+    finally:
+        tracebacks.uninstall()
+
+    assert (sys.excepthook, threading.excepthook) == previous
+
+    output = strip_escape_sequences(stream.getvalue())
+    assert output.count("KeyError: 'boom'") == 2
+    assert 'Exception in thread worker:\nTraceback' in output
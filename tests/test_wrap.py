@@ -0,0 +1,95 @@
+import textwrap
+
+import pytest
+
+from sroloc.printing.sgr import SgrState, strip_escape_sequences
+from sroloc.printing.wrap import fill, truncate, wrap
+
+RED = '\x1b[31m'
+BOLD_BLUE = '\x1b[1;34m'
+RESET = '\x1b[0m'
+
+LOREM = (
+    'Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do '
+    'eiusmod tempor incididunt ut labore et dolore magna aliqua.'
+)
+
+
+def test_sgr_state_canonical_parameters():
+    state = SgrState()
+    state.apply('4;38;2;1;2;3;1;44')
+
+    assert state.sequence() == '\x1b[1;38;2;1;2;3;44;4m'
+
+    state.apply('22;39')
+    assert state.sequence() == '\x1b[44;4m'
+
+    state.apply('')
+    assert state.is_default
+
+
+def test_strip_escape_sequences():
+    assert strip_escape_sequences(f'{RED}a{RESET}b\x1b[2Kc') == 'abc'
+
+
+@pytest.mark.parametrize('width', [10, 20, 33])
+def test_plain_text_matches_textwrap(width):
+    assert wrap(LOREM, width) == textwrap.wrap(LOREM, width)
+
+
+def test_escapes_do_not_count_as_visible():
+    text = f'{RED}aaaa{RESET} {BOLD_BLUE}bbbb{RESET}'
+
+    assert wrap(text, 9) == [text]
+
+
+def test_styles_are_reopened_on_continuation_lines():
+    text = f'one {RED}two three four{RESET} five'
+
+    assert wrap(text, 9) == [
+        f'one {RED}two{RESET}',
+        f'{RED}three{RESET}',
+        f'{RED}four{RESET} five',
+    ]
+
+
+def test_long_words_are_broken():
+    assert wrap(f'{RED}abcdefgh{RESET}', 3) == [
+        f'{RED}abc{RESET}', f'{RED}def{RESET}', f'{RED}gh{RESET}'
+    ]
+
+    assert wrap('abcdefgh ij', 3, break_long_words=False) == [
+        'abcdefgh', 'ij'
+    ]
+
+
+def test_newlines_are_kept():
+    assert fill(f'{RED}a b\nc{RESET}', 80) == \
+        f'{RED}a b{RESET}\n{RED}c{RESET}'
+
+
+def test_wrapped_lines_keep_visible_text():
+    text = ' '.join(f'{RED}word{i}{RESET}' for i in range(50))
+
+    lines = wrap(text, 17)
+
+    assert all(len(strip_escape_sequences(line)) <= 17 for line in lines)
+    assert ' '.join(map(strip_escape_sequences, lines)) == \
+        strip_escape_sequences(text)
+
+
+def test_truncate():
+    assert truncate(f'{RED}hello world{RESET}', 8) == \
+        f'{RED}hello w…{RESET}'
+    assert truncate(f'hello {RED}world{RESET}', 8, '...') == 'hello...'
+
+
+def test_truncate_short_text_is_unchanged():
+    text = f'{RED}hello{RESET}'
+
+    assert truncate(text, 5) is text
+
+
+def test_truncate_invalid_width():
+    with pytest.raises(ValueError):
+        truncate('hello', 2, '...')